@@ -5,17 +5,18 @@ Last updated: 2023 by intern
 Note: Converted from Jupyter notebook benchmark_analysis_FINAL_v2_ACTUALLY_FINAL.ipynb
 """
 
-import pandas as pd
-import numpy as np
 import json
 import time
 import os
 import sys
-from deepgram import DeepgramClient, PrerecordedOptions
-import requests
 from datetime import datetime
 import random
-import copy
+
+# Allow `from brownfield.x import ...` when run as a script
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Heavy dependencies (pandas, numpy, deepgram, matplotlib) are imported inside
+# the functions that need them so `--help` and light subcommands start fast.
 
 # GLOBAL VARIABLES - DO NOT CHANGE
 RESULTS_NOVA2 = None
@@ -29,7 +30,7 @@ RESULTS_TEMP = None
 TEMP_DF = None
 TEMP_DF2 = None
 WORKING_DF = None
-ALL_RESULTS = []
+RESULT_BUFFER = None  # greenfield.result_buffer.ResultBuffer, created on the first result
 ERROR_COUNT = 0
 SUCCESS_COUNT = 0
 TOTAL_COUNT = 0
@@ -37,6 +38,17 @@ WER_SCORES = []
 WER_SCORES_BACKUP = []
 API_KEY = os.getenv("DEEPGRAM_API_KEY", "test_key_123")
 
+# Columns of the results process_audio_file_sync collects
+LEGACY_RESULT_COLUMNS = {
+    'url': 'str',
+    'model': 'str',
+    'transcript': 'str',
+    'latency': 'float',
+    'timestamp': 'time',
+    'retry_count': 'int',
+    'success': 'bool',
+}
+
 # Constants that aren't really constant
 MAX_RETRIES = 3  # but we actually retry 5 times
 TIMEOUT = 30  # seconds but we ignore this
@@ -45,6 +57,7 @@ BATCH_SIZE = 10  # but we process one at a time anyway
 def load_test_data():
     """Load test data from multiple sources with no error handling."""
     global RESULTS_NOVA2, RESULTS_NOVA3, RESULTS_NOVA2_COPY, RESULTS_BACKUP, RESULTS_FINAL
+    import pandas as pd
 
     try:
         # Try to load from files that might not exist
@@ -136,8 +149,10 @@ def calculate_wer_third_version(reference_text, hypothesis_text):
     return len(diff) / len(ref_set) if ref_set else 0
 
 def process_audio_file_sync(audio_url, model="nova-2"):
-    """Process audio file synchronously, blocking everything."""
-    global ERROR_COUNT, SUCCESS_COUNT, TOTAL_COUNT
+    """Process audio file synchronously, blocking everything; returns a ResultRecord."""
+    global ERROR_COUNT, SUCCESS_COUNT, TOTAL_COUNT, RESULT_BUFFER
+    from deepgram import DeepgramClient, PrerecordedOptions
+    from greenfield.result_buffer import ResultBuffer, ResultRecord
 
     TOTAL_COUNT = TOTAL_COUNT + 1
 
@@ -187,23 +202,19 @@ def process_audio_file_sync(audio_url, model="nova-2"):
                 # Calculate metrics
                 latency = end_time - start_time
 
-                # Store in multiple places
-                result = {
-                    "url": audio_url,
-                    "model": model,
-                    "transcript": transcript,
-                    "latency": latency,
-                    "timestamp": datetime.now().isoformat(),
-                    "retry_count": retry,
-                    "success": True
-                }
-
-                ALL_RESULTS.append(result)
+                result = ResultRecord(
+                    url=audio_url,
+                    model=model,
+                    transcript=transcript,
+                    latency=latency,
+                    retry_count=retry,
+                    success=True,
+                )
 
-                # Also store in dataframe (duplicate storage)
-                new_row = pd.DataFrame([result])
-                global RESULTS_FINAL
-                RESULTS_FINAL = pd.concat([RESULTS_FINAL, new_row], ignore_index=True)
+                # Buffered columnar; folded into RESULTS_FINAL by materialize_results()
+                if RESULT_BUFFER is None:
+                    RESULT_BUFFER = ResultBuffer(LEGACY_RESULT_COLUMNS)
+                RESULT_BUFFER.append(result)
 
                 return result
 
@@ -215,13 +226,11 @@ def process_audio_file_sync(audio_url, model="nova-2"):
             ERROR_COUNT = ERROR_COUNT + 1
             time.sleep(retry * 2)  # Exponential backoff but wrong
 
-    # If all retries failed
-    return {"error": "Failed after 5 retries", "url": audio_url}
+    # If all retries failed (not buffered: failures never reached the results)
+    return ResultRecord(url=audio_url, model=model, error="Failed after 5 retries")
 
 def batch_process_files_inefficiently(audio_urls, model="nova-2"):
-    """Process multiple files one by one instead of in parallel."""
-    results = []
-
+    """Process multiple files one by one instead of in parallel; results end up in RESULTS_FINAL."""
     print(f"Starting batch processing of {len(audio_urls)} files...")
     print(f"Estimated time: {len(audio_urls) * 5} seconds")  # Wrong estimate
 
@@ -231,20 +240,18 @@ def batch_process_files_inefficiently(audio_urls, model="nova-2"):
         print(f"Processing {i+1}/{len(audio_urls)}")
         print(f"{'='*50}\n")
 
-        result = process_audio_file_sync(url, model)
-        results.append(result)
+        process_audio_file_sync(url, model)
 
         # Update global dataframes unnecessarily
         update_all_dataframes()
 
-        # Save intermediate results repeatedly
-        save_results_multiple_times()
-
-    return results
+    # Save once per batch: results are buffered until then
+    save_results_multiple_times()
 
 def update_all_dataframes():
     """Update all global dataframes redundantly."""
     global RESULTS_NOVA2, RESULTS_NOVA3, RESULTS_NOVA2_COPY, RESULTS_BACKUP
+    import pandas as pd
 
     # Copy data around for no reason
     RESULTS_NOVA2_COPY = RESULTS_NOVA2.copy()
@@ -255,9 +262,21 @@ def update_all_dataframes():
     RESULTS_NOVA2 = RESULTS_NOVA2.sort_values('model')
     RESULTS_NOVA2 = RESULTS_NOVA2.sort_values('timestamp')  # Sort again?
 
+def materialize_results():
+    """Append buffered results to RESULTS_FINAL in one DataFrame build."""
+    global RESULTS_FINAL, RESULT_BUFFER
+    import pandas as pd
+
+    if RESULT_BUFFER is None or not len(RESULT_BUFFER):
+        return
+    new_rows = RESULT_BUFFER.to_frame()
+    RESULTS_FINAL = new_rows if RESULTS_FINAL is None else pd.concat([RESULTS_FINAL, new_rows], ignore_index=True)
+    RESULT_BUFFER = None
+
 def save_results_multiple_times():
     """Save results to multiple formats redundantly."""
     global RESULTS_FINAL
+    materialize_results()
 
     # Save as JSON
     RESULTS_FINAL.to_json('results_final.json')
@@ -274,42 +293,61 @@ def save_results_multiple_times():
     # Save another backup
     RESULTS_FINAL.to_json('results_final_backup_v2.json')
 
-def calculate_all_wer_scores():
-    """Calculate WER scores using all three broken implementations."""
-    global RESULTS_FINAL, WER_SCORES
-
-    WER_SCORES = []
+LEGACY_WER_METRICS = {
+    'wer_v1': calculate_wer_broken,
+    'wer_v2': calculate_wer_also_broken,
+    'wer_v3': calculate_wer_third_version,
+}
+LEGACY_WER_VERSION = 'legacy-1'  # bump if any of the functions above change
 
-    # Use inefficient iterrows
-    for index, row in RESULTS_FINAL.iterrows():
-        transcript = row['transcript']
-        ground_truth = row.get('ground_truth', transcript)  # Use transcript if no ground truth
 
-        # Calculate WER three different ways
-        wer1 = calculate_wer_broken(ground_truth, transcript)
-        wer2 = calculate_wer_also_broken(ground_truth, transcript)
-        wer3 = calculate_wer_third_version(ground_truth, transcript)
+def calculate_all_wer_scores(cache=None):
+    """
+    Calculate WER scores using all three broken implementations.
 
-        # Average them (why?)
-        avg_wer = (wer1 + wer2 + wer3) / 3
+    Scores are memoized in ``cache`` (a greenfield.wer.WerCache, in-memory if
+    not given) by reference and transcript hash, so with a persistent cache
+    re-scoring only computes rows that are new or changed.
+    """
+    global RESULTS_FINAL, WER_SCORES
+    import numpy as np
+    from greenfield.wer import WerCache
 
-        WER_SCORES.append({
-            'index': index,
-            'wer_v1': wer1,
-            'wer_v2': wer2,
-            'wer_v3': wer3,
-            'wer_avg': avg_wer
-        })
+    materialize_results()
+    cache = cache or WerCache()
+    references = RESULTS_FINAL['ground_truth'] if 'ground_truth' in RESULTS_FINAL.columns else None
+    transcripts = RESULTS_FINAL['transcript']
 
-        # Update the dataframe in place (inefficient)
-        RESULTS_FINAL.at[index, 'wer_v1'] = wer1
-        RESULTS_FINAL.at[index, 'wer_v2'] = wer2
-        RESULTS_FINAL.at[index, 'wer_v3'] = wer3
-        RESULTS_FINAL.at[index, 'wer_avg'] = avg_wer
+    # No reference joined: leave unscored instead of scoring the transcript against itself
+    if references is None:
+        valid = np.zeros(len(RESULTS_FINAL), dtype=bool)
+    else:
+        is_text = lambda column: column.map(lambda value: isinstance(value, str))
+        valid = (is_text(references) & is_text(transcripts)).to_numpy()
+    refs = references[valid].tolist() if references is not None else []
+    hyps = transcripts[valid].tolist()
+
+    columns = {}
+    scores = cache.score_metrics(refs, hyps, LEGACY_WER_METRICS, version=LEGACY_WER_VERSION)
+    for column, values in scores.items():
+        columns[column] = np.full(len(RESULTS_FINAL), np.nan)
+        columns[column][valid] = values
+    # Average them (why?)
+    columns['wer_avg'] = (columns['wer_v1'] + columns['wer_v2'] + columns['wer_v3']) / 3
+
+    for column, values in columns.items():
+        RESULTS_FINAL[column] = values
+    WER_SCORES = RESULTS_FINAL.loc[valid, list(columns)].rename_axis('index').reset_index().to_dict('records')
+
+    unscored = int((~valid).sum())
+    if unscored:
+        print(f"Warning: {unscored} results have no ground truth and were not scored")
 
 def generate_comparison_report():
     """Generate a comparison report with tons of redundant calculations."""
     global RESULTS_NOVA2, RESULTS_NOVA3, RESULTS_FINAL
+    import numpy as np
+    import pandas as pd
 
     print("\n" + "="*100)
     print("DEEPGRAM MODEL COMPARISON REPORT")
@@ -372,38 +410,42 @@ def generate_comparison_report():
     comparison.to_json('comparison.json')
     comparison.to_html('comparison.html')
 
-def visualize_results_badly():
-    """Create visualizations but don't actually show them."""
-    try:
-        import matplotlib.pyplot as plt
-
-        # Create figure but don't show it
-        fig, ax = plt.subplots(2, 2, figsize=(12, 8))
-
-        # Plot 1: WER distribution (but data might not exist)
-        ax[0, 0].hist(RESULTS_NOVA2['wer'], bins=20)
-        ax[0, 0].set_title('Nova-2 WER Distribution')
+def visualize_results_badly(png_path='results_visualization.png', html_path='results_visualization.html'):
+    """
+    Render WER plots from pre-binned aggregates on a background thread.
 
-        # Plot 2: Another histogram
-        ax[0, 1].hist(RESULTS_NOVA3['wer'], bins=20)
-        ax[0, 1].set_title('Nova-3 WER Distribution')
+    Returns:
+        Future resolving to the written paths, or None if there is nothing to plot
+    """
+    try:
+        import numpy as np
+        from brownfield.plotting import PlotAggregates, render_in_background
+    except ImportError:
+        print("NumPy not installed, skipping visualizations")
+        return None
 
-        # Plot 3: Scatter plot that doesn't make sense
-        ax[1, 0].scatter(range(len(RESULTS_NOVA2)), RESULTS_NOVA2['wer'])
-        ax[1, 0].set_title('WER Over Time?')
+    series = {'Nova-2': RESULTS_NOVA2, 'Nova-3': RESULTS_NOVA3}
+    series = {label: df['wer'].to_numpy() for label, df in series.items() if df is not None and len(df)}
+    if not series:
+        print("No results to visualize")
+        return None
 
-        # Plot 4: Bar chart
-        models = ['Nova-2', 'Nova-3']
-        means = [RESULTS_NOVA2['wer'].mean(), RESULTS_NOVA3['wer'].mean()]
-        ax[1, 1].bar(models, means)
-        ax[1, 1].set_title('Average WER by Model')
+    # Failed requests have NaN WER; a series with nothing scored contributes no bound
+    upper = max((float(np.nanmax(values)) for values in series.values() if not np.isnan(values).all()),
+                default=1.0)
+    aggregates = PlotAggregates(value_range=(0.0, upper if upper > 0 else 1.0))
+    for label, values in series.items():
+        aggregates.add(label, values)
 
-        # Save but don't show
-        plt.savefig('results_visualization.png')
-        plt.close()  # Close without showing
+    return render_in_background(aggregates, png_path, html_path)
 
-        print("Visualizations saved to results_visualization.png")
 
+def wait_for_visualizations(job):
+    """Wait for a background render started by visualize_results_badly and report it."""
+    if job is None:
+        return
+    try:
+        print(f"Visualizations saved to {', '.join(job.result())}")
     except ImportError:
         print("Matplotlib not installed, skipping visualizations")
     except Exception as e:
@@ -445,11 +487,11 @@ def run_full_benchmark():
 
     # Process with Nova-2
     print("\nProcessing with Nova-2...")
-    nova2_results = batch_process_files_inefficiently(test_urls, "nova-2")
+    batch_process_files_inefficiently(test_urls, "nova-2")
 
     # Process with Nova-3 (same files)
     print("\nProcessing with Nova-3...")
-    nova3_results = batch_process_files_inefficiently(test_urls, "nova-3")
+    batch_process_files_inefficiently(test_urls, "nova-3")
 
     # Calculate WER scores
     print("\nStep 3: Calculating WER scores...")
@@ -460,12 +502,13 @@ def run_full_benchmark():
     generate_comparison_report()
 
     # Create visualizations
-    print("\nStep 5: Creating visualizations...")
-    visualize_results_badly()
+    print("\nStep 5: Creating visualizations (in background)...")
+    plot_job = visualize_results_badly()
 
     # Save everything multiple times
     print("\nStep 6: Saving results...")
     save_results_multiple_times()
+    wait_for_visualizations(plot_job)
 
     # Print summary
     print("\n" + "="*100)
@@ -485,6 +528,7 @@ def run_full_benchmark():
     print("  - comparison.json")
     print("  - comparison.html")
     print("  - results_visualization.png")
+    print("  - results_visualization.html")
 
 # More helper functions that duplicate functionality
 
@@ -499,16 +543,10 @@ def save_json_file(data, filepath):
         json.dump(data, f)
 
 def calculate_cost(duration, model):
-    """Calculate cost incorrectly."""
-    # Wrong pricing
-    if model == "nova-2":
-        cost = duration * 0.01  # $0.01 per second (way too high)
-    elif model == "nova-3":
-        cost = duration * 0.015
-    else:
-        cost = duration * 0.005
+    """Cost in USD of transcribing ``duration`` seconds of prerecorded audio (None if unpriced)."""
+    from greenfield.pricing import DEFAULT_PRICING
 
-    return cost
+    return DEFAULT_PRICING.price(duration, model)
 
 def format_duration(seconds):
     """Format duration inconsistently."""
@@ -533,16 +571,587 @@ def todo_implement_later():
     """TODO: Implement this later."""
     raise NotImplementedError("Not implemented yet")
 
+# Command line interface: run / score / report / compare / pipeline / gate / merge
+#
+# Results are JSON Lines, one record per (manifest item, model), appended as
+# each item completes so interrupted runs can be resumed and shards merged.
+
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'test_data', 'ground_truth.json')
+DEFAULT_MODELS = ['nova-2', 'nova-3']
+
+
+def parse_shard(value):
+    """Parse a ``--shard i/N`` argument into (index, count), 0 <= i < N."""
+    import argparse
+
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like i/N, got {value!r}")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be in [0, {count}), got {value!r}")
+    return index, count
+
+
+def item_key(item):
+    """Stable identifier for a manifest item (its id, else its audio URL)."""
+    return item.get('id') or item['audio_url']
+
+
+def select_shard(items, index, count):
+    """
+    Return the items belonging to shard ``index`` of ``count``.
+
+    Assignment hashes each item's key, so adding items to the manifest does
+    not move existing items between shards.
+    """
+    import zlib
+
+    return [item for item in items if zlib.crc32(item_key(item).encode()) % count == index]
+
+
+def read_results(paths):
+    """Read result records from one or more JSON Lines files (missing files are skipped)."""
+    records = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r') as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    return records
+
+
+def append_result(path, record):
+    """Append one result record to a JSON Lines file."""
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+
+def write_results(path, records):
+    """Write result records to a JSON Lines file, replacing it."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+
+def aggregate_results(df, tier=None):
+    """Per-model counts, success rate, latency, WER and cost summary."""
+    if 'duration' in df.columns and 'cost' not in df.columns:
+        from greenfield.pricing import DEFAULT_PRICING, DEFAULT_TIER
+
+        df = df.assign(cost=DEFAULT_PRICING.price_frame(df, tier=tier or DEFAULT_TIER))
+    if 'cost' in df.columns and 'success' in df.columns:
+        # Failed requests are not billed
+        df = df.assign(cost=df['cost'].where(df['success'].eq(True)))
+
+    aggregations = {
+        'requests': ('model', 'size'),
+        'successes': ('success', 'sum'),
+        'latency_mean': ('latency', 'mean'),
+        'latency_p95': ('latency', lambda s: s.quantile(0.95)),
+    }
+    if 'wer' in df.columns:
+        aggregations['wer_mean'] = ('wer', 'mean')
+        aggregations['wer_median'] = ('wer', 'median')
+    if 'cost' in df.columns:
+        aggregations['cost_total'] = ('cost', 'sum')
+        aggregations['cost_mean'] = ('cost', 'mean')
+
+    summary = df.groupby('model').agg(**aggregations)
+    summary['success_rate'] = summary['successes'] / summary['requests']
+    return summary
+
+
+def command_run(args):
+    """Transcribe every manifest item in this shard with each model."""
+    items = select_shard(load_json_file(args.manifest), *args.shard)
+    output = args.output or os.path.join('results', f'results-shard-{args.shard[0]}-of-{args.shard[1]}.jsonl')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+
+    completed = set()
+    if args.resume:
+        completed = {(r['id'], r['model']) for r in read_results([output]) if r.get('success')}
+    elif os.path.exists(output):
+        os.remove(output)
+
+    todo = [(item, model) for item in items for model in args.models if (item_key(item), model) not in completed]
+    print(f"Shard {args.shard[0]}/{args.shard[1]}: {len(items)} items x {len(args.models)} models, "
+          f"{len(completed)} already done, {len(todo)} to run")
+
+    for item, model in todo:
+        result = process_audio_file_sync(item['audio_url'], model)
+        append_result(output, {
+            **{column: result[column] for column in LEGACY_RESULT_COLUMNS},
+            'timestamp': result.utc_timestamp().isoformat(),
+            'error': result.error,
+            'id': item_key(item),
+            'ground_truth': item.get('transcript'),
+            'duration': item.get('duration_seconds'),
+        })
+
+    print(f"Results written to {output}")
+
+
+def open_catalog(manifest=None, catalog_path=None):
+    """
+    Ground-truth catalog from a SQLite catalog file and/or a manifest.
+
+    With neither, the default manifest is loaded into an in-memory catalog.
+    """
+    from greenfield.ground_truth import GroundTruthCatalog
+
+    catalog = GroundTruthCatalog(catalog_path or ':memory:')
+    if manifest or not catalog_path:
+        catalog.load_manifest(manifest or DEFAULT_MANIFEST)
+    return catalog
+
+
+def join_ground_truth(df, catalog):
+    """Attach reference transcripts by result id, falling back to the audio URL."""
+    if 'url' in df.columns:
+        df = catalog.join(df, by='audio_url', column='url')
+    if 'id' in df.columns:
+        df = catalog.join(df, by='id')
+    return df
+
+
+def command_score(args):
+    """Score transcripts against ground truth and write scored results."""
+    global RESULTS_FINAL
+    import pandas as pd
+
+    catalog = open_catalog(args.manifest, args.catalog)
+    df = join_ground_truth(pd.DataFrame(read_results(args.inputs)), catalog)
+    catalog.close()
+    scored = df[df['success'].fillna(False).astype(bool)]
+
+    from greenfield.wer import WerCache
+
+    os.makedirs(os.path.dirname(args.cache) or '.', exist_ok=True)
+    cache = WerCache(args.cache)
+    RESULTS_FINAL = scored.reset_index(drop=True)
+    calculate_all_wer_scores(cache)  # legacy wer_v1..v3/wer_avg columns, kept as diagnostics only
+
+    # Reported WER: the same Levenshtein word error rate that gate and pipeline use
+    is_text = lambda column: column.map(lambda value: isinstance(value, str))
+    valid = (is_text(RESULTS_FINAL['ground_truth']) & is_text(RESULTS_FINAL['transcript'])).to_numpy()
+    RESULTS_FINAL['wer'] = float('nan')
+    RESULTS_FINAL.loc[valid, 'wer'] = cache.score_many(RESULTS_FINAL.loc[valid, 'ground_truth'].tolist(),
+                                                       RESULTS_FINAL.loc[valid, 'transcript'].tolist())
+    print(f"WER cache: {cache.hits} reused, {cache.misses} computed ({args.cache})")
+    cache.close()
+
+    combined = pd.concat([RESULTS_FINAL, df[~df.index.isin(scored.index)]], ignore_index=True)
+    write_results(args.output, json.loads(combined.to_json(orient='records')))
+    print(f"Scored {int(RESULTS_FINAL['wer'].notna().sum())} of {len(df)} results -> {args.output}")
+
+
+def command_report(args):
+    """Print per-model aggregates for scored (or unscored) results."""
+    import pandas as pd
+
+    df = pd.DataFrame(read_results(args.inputs))
+    summary = aggregate_results(df, tier=args.tier)
+    print(summary.to_string(float_format=lambda x: f"{x:.4g}"))
+    if args.json:
+        summary.to_json(args.json, orient='index', indent=2)
+        print(f"\nSummary written to {args.json}")
+
+    if args.plot:
+        from brownfield.plotting import PlotAggregates, render_in_background
+
+        if 'wer' not in df.columns:
+            print("Results are not scored yet; run the score command before plotting")
+            return 1
+        upper = float(df['wer'].max())
+        aggregates = PlotAggregates(value_range=(0.0, upper if upper > 0 else 1.0))
+        for model, group in df.groupby('model'):
+            aggregates.add(model, group['wer'].to_numpy())
+        wait_for_visualizations(render_in_background(aggregates, args.plot, args.html))
+
+
+def command_compare(args):
+    """Nova-2 vs Nova-3 comparison report from scored results."""
+    global RESULTS_NOVA2, RESULTS_NOVA3
+    import pandas as pd
+
+    df = pd.DataFrame(read_results(args.inputs))
+    if 'wer' not in df.columns:
+        print("Results are not scored yet; run the score command first")
+        return 1
+
+    RESULTS_NOVA2 = df[(df['model'] == 'nova-2') & df['wer'].notna()].reset_index(drop=True)
+    RESULTS_NOVA3 = df[(df['model'] == 'nova-3') & df['wer'].notna()].reset_index(drop=True)
+    if RESULTS_NOVA2.empty or RESULTS_NOVA3.empty:
+        print("Need scored results for both nova-2 and nova-3 to compare")
+        return 1
+
+    generate_comparison_report()
+
+
+def command_merge(args):
+    """Combine per-shard result files, keeping the latest record per (id, model)."""
+    import pandas as pd
+
+    latest = {}
+    for record in read_results(args.inputs):
+        key = (record['id'], record['model'])
+        # A success always beats a failure; otherwise the later record wins
+        if key not in latest or record.get('success') or not latest[key].get('success'):
+            latest[key] = record
+
+    write_results(args.output, latest.values())
+    print(f"Merged {len(args.inputs)} files into {len(latest)} results -> {args.output}\n")
+    print(aggregate_results(pd.DataFrame(list(latest.values()))).to_string(float_format=lambda x: f"{x:.4g}"))
+
+
+# Streaming pipeline: transcribe -> normalize -> score -> aggregate -> sink
+#
+# Unlike run_full_benchmark, nothing is accumulated in globals: records flow
+# through bounded queues and only per-model running totals are kept, so
+# memory stays flat however large the manifest is.
+
+def iter_manifest(path):
+    """Yield manifest items: streamed from a JSON Lines manifest, or from a JSON list."""
+    if path.endswith('.jsonl'):
+        with open(path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        yield from load_json_file(path)
+
+
+def result_record(item, result):
+    """Benchmark result record for a manifest item and a monitor transcription result."""
+    return {
+        'id': item_key(item),
+        'model': result['model'],
+        'url': item['audio_url'],
+        'transcript': result['transcript'],
+        'ground_truth': item.get('transcript'),
+        'duration': result['duration'] if result['duration'] is not None else item.get('duration_seconds'),
+        'latency': result['latency'],
+        'cost': result['cost'],
+        'timestamp': result['timestamp'],
+        'response_code': result['response_code'],
+        'error': result['error'],
+        'success': result['error'] is None,
+    }
+
+
+def score_record(record):
+    """Add WER to a normalized result record (runs in a worker process)."""
+    from greenfield.wer import word_error_rate
+
+    reference, transcript = record.get('ground_truth'), record.get('transcript')
+    scorable = record['success'] and isinstance(reference, str) and isinstance(transcript, str)
+    record['wer'] = word_error_rate(reference, transcript) if scorable else None
+    return record
+
+
+class RunningAggregates:
+    """Per-model totals updated one record at a time."""
+
+    def __init__(self):
+        self.models = {}
+
+    def add(self, record):
+        totals = self.models.setdefault(record['model'], {
+            'requests': 0, 'successes': 0, 'latency_sum': 0.0, 'latency_max': 0.0,
+            'scored': 0, 'wer_sum': 0.0, 'cost_total': 0.0,
+        })
+        totals['requests'] += 1
+        if record['success']:
+            totals['successes'] += 1
+            totals['latency_sum'] += record['latency']
+            totals['latency_max'] = max(totals['latency_max'], record['latency'])
+        if record.get('wer') is not None:
+            totals['scored'] += 1
+            totals['wer_sum'] += record['wer']
+        totals['cost_total'] += record.get('cost') or 0.0
+
+    def summary(self):
+        return {
+            model: {
+                'requests': t['requests'],
+                'success_rate': t['successes'] / t['requests'],
+                'latency_mean': t['latency_sum'] / t['successes'] if t['successes'] else None,
+                'latency_max': t['latency_max'] if t['successes'] else None,
+                'wer_mean': t['wer_sum'] / t['scored'] if t['scored'] else None,
+                'cost_total': t['cost_total'],
+            }
+            for model, t in sorted(self.models.items())
+        }
+
+
+async def benchmark_pipeline(items, models, output, monitor, concurrency=8, queue_size=64, score_workers=None):
+    """
+    Transcribe, score and store every (item, model) through a bounded pipeline.
+
+    Args:
+        items: Manifest items (any iterable; consumed lazily)
+        models: Models to run each item with
+        output: JSON Lines file for result records (replaced)
+        monitor: DeepgramMonitor used for transcription (requests are not logged to its database)
+        concurrency: Transcription workers
+        queue_size: Capacity of each stage's input queue
+        score_workers: Scoring processes (default: CPU count)
+
+    Returns:
+        (per-model summary, per-stage pipeline metrics)
+    """
+    from greenfield.pipeline import Pipeline
+
+    aggregates = RunningAggregates()
+
+    def jobs():
+        for item in items:
+            for model in models:
+                yield item, model
+
+    async def transcribe(job):
+        item, model = job
+        return item, await monitor.transcribe_url(item['audio_url'], model, log=False)
+
+    def normalize(job):
+        return result_record(*job)
+
+    def aggregate(record):
+        aggregates.add(record)
+        monitor.publish(record)  # scored by now, so live readers get its WER
+        return record
+
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as sink:
+        pipeline = (Pipeline(queue_size, process_workers=score_workers)
+                    .add_stage('transcribe', transcribe, workers=concurrency)
+                    .add_stage('normalize', normalize)
+                    .add_stage('score', score_record, workers=score_workers or os.cpu_count(), mode='process')
+                    .add_stage('aggregate', aggregate)
+                    .add_stage('sink', lambda record: sink.write(json.dumps(record) + '\n')))
+        metrics = await pipeline.run(jobs())
+    return aggregates.summary(), metrics
+
+
+def command_pipeline(args):
+    """Run the manifest through the streaming pipeline and print aggregates and stage metrics."""
+    import asyncio
+    from contextlib import AsyncExitStack
+    from greenfield.deepgram_monitor import DeepgramMonitor
+    from greenfield.live_results import ResultRing
+    from greenfield.replay import ReplayServer, TrafficRecorder
+
+    async def run():
+        async with AsyncExitStack() as stack:
+            base_url = args.base_url
+            if args.replay:
+                replay = await stack.enter_async_context(ReplayServer(args.replay, args.time_scale))
+                base_url = replay.url
+                print(f"Replaying {args.replay} (time scale {args.time_scale})")
+            recorder = TrafficRecorder(args.record) if args.record else None
+            if recorder is not None:
+                stack.callback(recorder.close)
+            live = ResultRing.create(args.live, args.live_capacity) if args.live else None
+            if live is not None:
+                stack.callback(live.close)
+                print(f"Publishing live results to shared memory {live.name!r}")
+
+            monitor = DeepgramMonitor(db_path=':memory:', base_url=base_url, recorder=recorder, live=live,
+                                      max_concurrency=args.concurrency)
+            stack.push_async_callback(monitor.close)
+            return await benchmark_pipeline(
+                iter_manifest(args.manifest), args.models, args.output, monitor,
+                args.concurrency, args.queue_size, args.score_workers,
+            )
+
+    summary, metrics = asyncio.run(run())
+    if args.record:
+        print(f"Traffic recorded to {args.record}")
+    print(f"Results written to {args.output}\n")
+    for model, row in summary.items():
+        print(f"{model}: " + ", ".join(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}" for k, v in row.items()))
+    print("\nStage metrics:")
+    for stage, row in metrics.items():
+        print(f"  {stage:<11} processed={row['processed']:<8} busy={row['busy_seconds']:.2f}s "
+              f"queue mean={row['queue_depth_mean']:.1f} max={row['queue_depth_max']}")
+
+
+def command_gate(args):
+    """Check a model's WER on the ground-truth corpus against expected_wer; exit 1 on regression."""
+    import asyncio
+    from contextlib import AsyncExitStack
+    from greenfield.deepgram_monitor import DeepgramMonitor
+    from greenfield.regression_gate import evaluate_gate
+    from greenfield.replay import ReplayServer
+    from greenfield.wer import WerCache
+
+    samples = [{**item, 'id': item_key(item)} for item in iter_manifest(args.manifest)]
+
+    # Reuse earlier successful responses for this model; only the rest hit the API
+    transcripts = {}
+    if args.responses:
+        for record in read_results([args.responses]):
+            if record.get('success') and record.get('model') == args.model and isinstance(record.get('transcript'), str):
+                transcripts[record['id']] = record['transcript']
+    todo = [sample for sample in samples if sample['id'] not in transcripts]
+
+    async def transcribe():
+        async with AsyncExitStack() as stack:
+            base_url = args.base_url
+            if args.replay:
+                base_url = (await stack.enter_async_context(ReplayServer(args.replay, args.time_scale))).url
+            monitor = DeepgramMonitor(db_path=':memory:', base_url=base_url, max_concurrency=args.concurrency)
+            stack.push_async_callback(monitor.close)
+            # The endpoint semaphore bounds requests in flight
+            return await asyncio.gather(*(
+                monitor.transcribe_url(sample['audio_url'], args.model, log=False) for sample in todo
+            ))
+
+    started = time.perf_counter()
+    fresh = [result_record(sample, result) for sample, result in zip(todo, asyncio.run(transcribe()) if todo else [])]
+    for record in fresh:
+        if record['success']:
+            transcripts[record['id']] = record['transcript']
+            if args.responses:
+                append_result(args.responses, record)
+    transcribed = time.perf_counter()
+
+    scorable = [s for s in samples if s['id'] in transcripts and isinstance(s.get('transcript'), str)]
+    os.makedirs(os.path.dirname(args.cache) or '.', exist_ok=True)
+    cache = WerCache(args.cache)
+    wers = cache.score_many([s['transcript'] for s in scorable], [transcripts[s['id']] for s in scorable])
+    cache.close()
+    observed = dict(zip((s['id'] for s in scorable), wers))
+
+    report = evaluate_gate(samples, observed, args.sample_tolerance, args.bucket_tolerance, args.max_failures)
+    report['model'] = args.model
+    print(f"{args.model}: {len(samples)} samples, {len(samples) - len(todo)} cached responses, "
+          f"{len(todo)} requested ({transcribed - started:.2f}s), scored in {time.perf_counter() - transcribed:.2f}s\n")
+
+    print(f"{'difficulty':<12} {'samples':>7} {'errors':>6} {'expected':>9} {'observed':>9} {'delta':>8}  status")
+    def fmt(value, width):
+        return f"{value:{width}.4f}" if value is not None else f"{'-':>{width}}"
+
+    for row in report['buckets']:
+        print(f"{row['difficulty']:<12} {row['samples']:>7} {row['errors']:>6} {fmt(row['expected_wer_mean'], 9)} "
+              f"{fmt(row['wer_mean'], 9)} {fmt(row['delta'], 8)}  {row['status']}")
+
+    failing = [row for row in report['samples'] if row['status'] in ('regressed', 'error')]
+    if failing:
+        print(f"\nFailing samples ({len(failing)}, {args.max_failures} allowed):")
+        for row in failing[:20]:
+            detail = f"WER {row['wer']:.4f} vs expected {row['expected_wer']:.4f}" if row['wer'] is not None else 'no transcript'
+            print(f"  {row['id']} [{row['difficulty']}] {row['status']}: {detail}")
+        if len(failing) > 20:
+            print(f"  ... and {len(failing) - 20} more")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    print(f"\nGate {'PASSED' if report['passed'] else 'FAILED'}")
+    return 0 if report['passed'] else 1
+
+
+def build_parser():
+    """Argument parser for the benchmark CLI."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Deepgram benchmark tool. With no command, runs the legacy full benchmark.",
+    )
+    commands = parser.add_subparsers(dest='command')
+
+    run = commands.add_parser('run', help='transcribe manifest items')
+    run.add_argument('--manifest', default=DEFAULT_MANIFEST, help='ground-truth style JSON manifest')
+    run.add_argument('--models', type=lambda v: v.split(','), default=DEFAULT_MODELS,
+                     help='comma-separated models (default: nova-2,nova-3)')
+    run.add_argument('--shard', type=parse_shard, default=(0, 1), metavar='i/N',
+                     help='process only shard i of N (0-based)')
+    run.add_argument('--resume', action='store_true', help='skip items already completed in --output')
+    run.add_argument('--output', help='results file (default: results/results-shard-i-of-N.jsonl)')
+    run.set_defaults(handler=command_run)
+
+    score = commands.add_parser('score', help='calculate WER for results')
+    score.add_argument('inputs', nargs='+', help='results files')
+    score.add_argument('--output', default=os.path.join('results', 'scored.jsonl'))
+    score.add_argument('--manifest', help='ground truth manifest (default: test_data/ground_truth.json '
+                                          'unless --catalog is given)')
+    score.add_argument('--catalog', help='SQLite ground-truth catalog to read (and update from --manifest)')
+    score.add_argument('--cache', default=os.path.join('results', 'wer_cache.db'),
+                       help='SQLite WER cache; unchanged rows are not re-scored (default: results/wer_cache.db)')
+    score.set_defaults(handler=command_score)
+
+    report = commands.add_parser('report', help='per-model summary of results')
+    report.add_argument('inputs', nargs='+', help='results files')
+    report.add_argument('--json', help='also write the summary to this JSON file')
+    report.add_argument('--tier', default='payg', help='pricing tier for cost (payg, growth)')
+    report.add_argument('--plot', help='render WER plots to this PNG file')
+    report.add_argument('--html', help='with --plot, also write an interactive HTML version')
+    report.set_defaults(handler=command_report)
+
+    compare = commands.add_parser('compare', help='nova-2 vs nova-3 comparison of scored results')
+    compare.add_argument('inputs', nargs='+', help='scored results files')
+    compare.set_defaults(handler=command_compare)
+
+    pipeline = commands.add_parser('pipeline', help='stream the manifest through transcribe/score/store')
+    pipeline.add_argument('--manifest', default=DEFAULT_MANIFEST, help='JSON or JSON Lines manifest')
+    pipeline.add_argument('--models', type=lambda v: v.split(','), default=DEFAULT_MODELS,
+                          help='comma-separated models (default: nova-2,nova-3)')
+    pipeline.add_argument('--output', default=os.path.join('results', 'pipeline.jsonl'))
+    pipeline.add_argument('--base-url', help='Deepgram API base URL (default: DEEPGRAM_API_URL or cloud)')
+    pipeline.add_argument('--concurrency', type=int, default=8, help='transcription workers (default: 8)')
+    pipeline.add_argument('--queue-size', type=int, default=64, help='per-stage queue capacity (default: 64)')
+    pipeline.add_argument('--score-workers', type=int, help='scoring processes (default: CPU count)')
+    pipeline.add_argument('--record', help='record API traffic to this compressed log (.jsonl.gz)')
+    pipeline.add_argument('--replay', help='serve API responses from this recorded log instead of the API')
+    pipeline.add_argument('--time-scale', type=float, default=1.0,
+                          help='with --replay, multiplier on recorded latencies; 0 for none (default: 1.0)')
+    pipeline.add_argument('--live', help='publish results to a shared-memory ring with this name '
+                                         '(read it with greenfield/live_results.py)')
+    pipeline.add_argument('--live-capacity', type=int, default=65536,
+                          help='records kept in the live ring (default: 65536)')
+    pipeline.set_defaults(handler=command_pipeline)
+
+    from greenfield.regression_gate import DEFAULT_BUCKET_TOLERANCE, DEFAULT_SAMPLE_TOLERANCE
+
+    gate = commands.add_parser('gate', help='fail if WER regresses against expected_wer in the manifest')
+    gate.add_argument('--manifest', default=DEFAULT_MANIFEST, help='JSON or JSON Lines manifest with expected_wer')
+    gate.add_argument('--model', default='nova-3', help='model to check (default: nova-3)')
+    gate.add_argument('--sample-tolerance', type=float, default=DEFAULT_SAMPLE_TOLERANCE,
+                      help=f'allowed WER above a sample\'s expected_wer (default: {DEFAULT_SAMPLE_TOLERANCE})')
+    gate.add_argument('--bucket-tolerance', type=float, default=DEFAULT_BUCKET_TOLERANCE,
+                      help=f'allowed mean WER above a difficulty bucket\'s expected mean '
+                           f'(default: {DEFAULT_BUCKET_TOLERANCE})')
+    gate.add_argument('--max-failures', type=int, default=0, help='failing samples allowed (default: 0)')
+    gate.add_argument('--responses', help='JSON Lines results to reuse as cached responses (new ones are appended)')
+    gate.add_argument('--cache', default=os.path.join('results', 'wer_cache.db'), help='SQLite WER cache')
+    gate.add_argument('--base-url', help='Deepgram API base URL (default: DEEPGRAM_API_URL or cloud)')
+    gate.add_argument('--replay', help='serve API responses from this recorded traffic log')
+    gate.add_argument('--time-scale', type=float, default=0.0,
+                      help='with --replay, multiplier on recorded latencies (default: 0, immediate)')
+    gate.add_argument('--concurrency', type=int, default=16, help='requests in flight (default: 16)')
+    gate.add_argument('--json', help='also write the gate report to this JSON file')
+    gate.set_defaults(handler=command_gate)
+
+    merge = commands.add_parser('merge', help='combine per-shard results and print aggregates')
+    merge.add_argument('inputs', nargs='+', help='per-shard results files')
+    merge.add_argument('--output', default=os.path.join('results', 'merged.jsonl'))
+    merge.set_defaults(handler=command_merge)
+
+    return parser
+
+
+def main(argv=None):
+    """Entry point for the benchmark CLI."""
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        run_full_benchmark()
+        return 0
+    return args.handler(args) or 0
+
+
 # Main execution
 if __name__ == "__main__":
-    # Check if running as script
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--help":
-            print("Usage: python benchmark_nightmare.py")
-            print("No arguments needed, just run it!")
-        elif sys.argv[1] == "--test":
-            print("Test mode not implemented")
-        else:
-            run_full_benchmark()
-    else:
-        run_full_benchmark()
\ No newline at end of file
+    sys.exit(main())
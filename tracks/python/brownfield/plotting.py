@@ -0,0 +1,199 @@
+"""
+Aggregate-first plotting for benchmark results.
+
+WER values are reduced to fixed-size aggregates as they arrive (histogram
+counts over fixed bins, and a min/max/mean decimated series whose bucket
+width doubles whenever it would outgrow its point budget; each incoming
+chunk is reduced once, at that width). Rendering only ever
+sees those aggregates, so a plot of 10M rows costs the same as one of 1k,
+and it runs on a background thread while the benchmark keeps working.
+"""
+
+import copy
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+_executor = None
+
+
+class SeriesDecimator:
+    """Streaming min/max/mean decimation of a series into at most ``max_points`` buckets."""
+
+    def __init__(self, max_points=1000):
+        self.max_points = max_points
+        self.bucket_size = 1
+        self.count = 0
+        self.starts = np.empty(0, dtype=np.int64)
+        self.mins = np.empty(0)
+        self.maxs = np.empty(0)
+        self.sums = np.empty(0)
+        self.sizes = np.empty(0, dtype=np.int64)
+        self._pending = np.empty(0)
+
+    def add(self, values):
+        """Append a chunk of values (any length) to the series."""
+        values = np.asarray(values, dtype=float)
+
+        # Widen the buckets before reducing, so a large chunk is reduced once at its
+        # final width; halving only touches the (at most max_points) stored buckets
+        while len(self.starts) + (len(self._pending) + len(values)) // self.bucket_size > self.max_points:
+            self._halve()
+
+        head = 0
+        if len(self._pending):
+            head = min(self.bucket_size - len(self._pending), len(values))
+            self._pending = np.concatenate([self._pending, values[:head]])
+            if len(self._pending) == self.bucket_size:
+                self._append(self.count - len(self._pending) + head, self._pending.reshape(1, -1))
+                self._pending = np.empty(0)
+
+        body = values[head:]
+        full = len(body) // self.bucket_size * self.bucket_size
+        if full:
+            # A reshaped view of the chunk; only the per-bucket results are stored
+            self._append(self.count + head, body[:full].reshape(-1, self.bucket_size))
+        self._pending = np.concatenate([self._pending, body[full:]])
+        self.count += len(values)
+
+        while len(self.starts) > self.max_points:
+            self._halve()
+
+    def _append(self, first, buckets):
+        """Store full buckets (one per row) whose first value is value number ``first``."""
+        width = buckets.shape[1]
+        self.starts = np.concatenate([self.starts, first + np.arange(len(buckets)) * width])
+        self.mins = np.concatenate([self.mins, buckets.min(axis=1)])
+        self.maxs = np.concatenate([self.maxs, buckets.max(axis=1)])
+        self.sums = np.concatenate([self.sums, buckets.sum(axis=1)])
+        self.sizes = np.concatenate([self.sizes, np.full(len(buckets), width)])
+
+    def _halve(self):
+        """Merge adjacent bucket pairs and double the bucket width."""
+        even = len(self.starts) // 2 * 2
+        tail = slice(even, None)
+        self.starts = np.concatenate([self.starts[:even:2], self.starts[tail]])
+        self.mins = np.concatenate([self.mins[:even].reshape(-1, 2).min(axis=1), self.mins[tail]])
+        self.maxs = np.concatenate([self.maxs[:even].reshape(-1, 2).max(axis=1), self.maxs[tail]])
+        self.sums = np.concatenate([self.sums[:even].reshape(-1, 2).sum(axis=1), self.sums[tail]])
+        self.sizes = np.concatenate([self.sizes[:even].reshape(-1, 2).sum(axis=1), self.sizes[tail]])
+        self.bucket_size *= 2
+
+    def buckets(self):
+        """Return (x, min, max, mean) arrays, including any partially filled bucket."""
+        starts, mins, maxs, sums, sizes = self.starts, self.mins, self.maxs, self.sums, self.sizes
+        if len(self._pending):
+            pending = self._pending
+            starts = np.append(starts, self.count - len(pending))
+            mins = np.append(mins, pending.min())
+            maxs = np.append(maxs, pending.max())
+            sums = np.append(sums, pending.sum())
+            sizes = np.append(sizes, len(pending))
+        return starts, mins, maxs, sums / np.maximum(sizes, 1)
+
+
+class PlotAggregates:
+    """Per-label WER histogram counts, running means and decimated series."""
+
+    def __init__(self, bins=20, value_range=(0.0, 1.0), max_points=1000):
+        self.edges = np.linspace(value_range[0], value_range[1], bins + 1)
+        self.max_points = max_points
+        self.counts = {}
+        self.totals = {}
+        self.series = {}
+
+    def add(self, label, values):
+        """Fold a chunk of WER values for ``label`` into the aggregates."""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if label not in self.counts:
+            self.counts[label] = np.zeros(len(self.edges) - 1, dtype=np.int64)
+            self.totals[label] = [0.0, 0]
+            self.series[label] = SeriesDecimator(self.max_points)
+
+        # Out-of-range values land in the edge bins rather than being dropped
+        clipped = np.clip(values, self.edges[0], self.edges[-1])
+        self.counts[label] += np.histogram(clipped, bins=self.edges)[0]
+        self.totals[label][0] += float(values.sum())
+        self.totals[label][1] += len(values)
+        self.series[label].add(values)
+
+    def mean(self, label):
+        total, count = self.totals[label]
+        return total / count if count else float('nan')
+
+
+def render(aggregates, png_path, html_path=None):
+    """
+    Render aggregates to a PNG (matplotlib) and optionally an HTML page (plotly).
+
+    Returns:
+        List of paths written
+    """
+    from matplotlib.figure import Figure  # no pyplot: safe off the main thread
+
+    labels = list(aggregates.counts)
+    edges = aggregates.edges
+
+    fig = Figure(figsize=(15, 4.5))
+    dist_ax, series_ax, mean_ax = fig.subplots(1, 3)
+    for label in labels:
+        dist_ax.stairs(aggregates.counts[label], edges, label=label)
+        x, lo, hi, mean = aggregates.series[label].buckets()
+        series_ax.fill_between(x, lo, hi, alpha=0.25, step='post')
+        series_ax.plot(x, mean, label=label, drawstyle='steps-post')
+    dist_ax.set_title('WER Distribution')
+    dist_ax.legend()
+    series_ax.set_title('WER by Result Order (min/max/mean)')
+    series_ax.legend()
+    mean_ax.bar(labels, [aggregates.mean(label) for label in labels])
+    mean_ax.set_title('Average WER by Model')
+    fig.tight_layout()
+    fig.savefig(png_path)
+    written = [png_path]
+
+    if html_path:
+        try:
+            written.append(_render_html(aggregates, html_path))
+        except ImportError:
+            pass  # plotly is optional
+
+    return written
+
+
+def _render_html(aggregates, html_path):
+    """Interactive version of the same three panels."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    labels = list(aggregates.counts)
+    centers = (aggregates.edges[:-1] + aggregates.edges[1:]) / 2
+
+    fig = make_subplots(rows=1, cols=3, subplot_titles=(
+        'WER Distribution', 'WER by Result Order (min/max/mean)', 'Average WER by Model'))
+    for label in labels:
+        fig.add_trace(go.Bar(x=centers, y=aggregates.counts[label], name=label), row=1, col=1)
+        x, lo, hi, mean = aggregates.series[label].buckets()
+        fig.add_trace(go.Scatter(x=np.concatenate([x, x[::-1]]), y=np.concatenate([hi, lo[::-1]]),
+                                 fill='toself', opacity=0.25, line_width=0, showlegend=False), row=1, col=2)
+        fig.add_trace(go.Scatter(x=x, y=mean, name=f'{label} mean', mode='lines'), row=1, col=2)
+    fig.add_trace(go.Bar(x=labels, y=[aggregates.mean(label) for label in labels], showlegend=False),
+                  row=1, col=3)
+    fig.write_html(html_path, include_plotlyjs='cdn')
+    return html_path
+
+
+def render_in_background(aggregates, png_path, html_path=None) -> Future:
+    """
+    Render a snapshot of ``aggregates`` on a background thread.
+
+    The snapshot is taken immediately, so callers may keep adding to
+    ``aggregates`` while rendering is in progress.
+
+    Returns:
+        Future resolving to the list of paths written
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='plotting')
+    return _executor.submit(render, copy.deepcopy(aggregates), png_path, html_path)
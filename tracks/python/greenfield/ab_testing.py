@@ -0,0 +1,221 @@
+"""
+A/B testing of Deepgram models with sequential statistics.
+
+Traffic is split deterministically by utterance: a ``traffic_split`` share
+of utterances is routed to the treatment model and mirrored to the control
+model, so every enrolled utterance yields a paired observation (same audio,
+both models). Per-metric differences (treatment - control) are accumulated
+in streaming form (Welford running mean/variance, O(1) memory) and tested
+with a mixture sequential probability ratio test (mSPRT), whose p-values
+stay valid however often they are checked, so a test can stop as soon as
+it is significant instead of after a fixed sample size.
+
+For a normal mixing distribution N(0, tau^2) over the effect and
+difference variance sigma^2, after n pairs with mean difference d:
+
+    Lambda_n = sqrt(sigma^2 / (sigma^2 + n tau^2))
+               * exp(n^2 tau^2 d^2 / (2 sigma^2 (sigma^2 + n tau^2)))
+
+H0 (no difference) is rejected once Lambda_n >= 1 / alpha. sigma^2 is the
+running sample variance; tau defaults to sigma (a scale-free prior).
+"""
+
+import math
+import hashlib
+from typing import Any, Dict, Optional, Sequence
+
+METRICS = ("wer", "latency")  # lower is better for both
+VARIANCE_FLOOR = 1e-12
+
+
+class RunningStats:
+    """Streaming count, mean and variance (Welford)."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float):
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+
+class SequentialTest:
+    """mSPRT for a zero mean on a stream of paired differences."""
+
+    def __init__(self, alpha: float = 0.05, tau: Optional[float] = None, min_samples: int = 10):
+        """
+        Args:
+            alpha: Significance level (false positive rate over the whole test)
+            tau: Standard deviation of the mixing prior over the effect, in
+                the metric's units (default: the running difference std)
+            min_samples: Pairs required before the variance estimate is trusted
+        """
+        self.alpha = alpha
+        self.tau = tau
+        self.min_samples = max(min_samples, 2)
+        self.differences = RunningStats()
+        self.p_value = 1.0
+
+    def _scales(self):
+        sigma2 = max(self.differences.variance, VARIANCE_FLOOR)
+        tau2 = self.tau ** 2 if self.tau else sigma2
+        return sigma2, tau2
+
+    def log_likelihood_ratio(self) -> float:
+        n, mean = self.differences.n, self.differences.mean
+        if n < 2:
+            return 0.0
+        sigma2, tau2 = self._scales()
+        spread = sigma2 + n * tau2
+        return 0.5 * math.log(sigma2 / spread) + (n * n * tau2 * mean * mean) / (2 * sigma2 * spread)
+
+    def add(self, difference: float):
+        """Add one paired difference (treatment - control) and update the always-valid p-value."""
+        self.differences.add(difference)
+        if self.differences.n >= self.min_samples:
+            self.p_value = min(self.p_value, math.exp(min(0.0, -self.log_likelihood_ratio())))
+
+    @property
+    def significant(self) -> bool:
+        return self.p_value <= self.alpha
+
+    def confidence_interval(self) -> Optional[tuple]:
+        """Always-valid (1 - alpha) confidence sequence for the mean difference."""
+        n, mean = self.differences.n, self.differences.mean
+        if n < self.min_samples:
+            return None
+        sigma2, tau2 = self._scales()
+        spread = sigma2 + n * tau2
+        half_width = math.sqrt(sigma2 * spread / (n * n * tau2)
+                               * (math.log(spread / sigma2) - 2 * math.log(self.alpha)))
+        return (mean - half_width, mean + half_width)
+
+
+class ABTest:
+    """Paired A/B test between a control and a treatment model."""
+
+    def __init__(self, control: str, treatment: str, traffic_split: float = 0.5,
+                 alpha: float = 0.05, min_samples: int = 10, max_samples: Optional[int] = None,
+                 stop_on: Sequence[str] = ("wer",), tau: Optional[Dict[str, float]] = None,
+                 name: Optional[str] = None):
+        """
+        Args:
+            control: Current model (e.g. "nova-2")
+            treatment: Candidate model (e.g. "nova-3")
+            traffic_split: Fraction of utterances routed to the treatment (and
+                mirrored to the control for pairing); the rest use control only
+            alpha: Significance level of each sequential test
+            min_samples: Pairs before a test may stop
+            max_samples: Stop (inconclusive) after this many pairs
+            stop_on: Metrics whose significance stops the test
+            tau: Mixing prior std per metric (see SequentialTest)
+            name: Experiment name, salts the traffic assignment
+        """
+        if not 0.0 <= traffic_split <= 1.0:
+            raise ValueError(f"traffic_split must be between 0 and 1, got {traffic_split}")
+        unknown = set(stop_on) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Unknown metric(s) {', '.join(sorted(unknown))}; expected {', '.join(METRICS)}")
+
+        self.control = control
+        self.treatment = treatment
+        self.traffic_split = traffic_split
+        self.max_samples = max_samples
+        self.stop_on = tuple(stop_on)
+        self.name = name or f"{control}-vs-{treatment}"
+        tau = tau or {}
+        self.tests = {metric: SequentialTest(alpha, tau.get(metric), min_samples) for metric in METRICS}
+        self.arms = {arm: {metric: RunningStats() for metric in METRICS} for arm in ("control", "treatment")}
+        self.routed = {"control": 0, "treatment": 0}
+        self.failed_pairs = 0
+
+    def assign(self, key: str) -> str:
+        """
+        Route an utterance: "treatment" (paired with control) or "control".
+
+        Assignment hashes the experiment name and key, so the same utterance
+        always lands in the same arm.
+        """
+        digest = hashlib.sha256(f"{self.name}:{key}".encode()).digest()
+        arm = "treatment" if int.from_bytes(digest[:8], "big") / 2**64 < self.traffic_split else "control"
+        self.routed[arm] += 1
+        return arm
+
+    def record(self, control: Dict[str, Any], treatment: Dict[str, Any]):
+        """
+        Add one paired observation from two transcription results.
+
+        Pairs where either request failed are counted but not scored; WER is
+        only compared when both results carry one.
+        """
+        if control.get("error") or treatment.get("error"):
+            self.failed_pairs += 1
+            return
+        for metric in METRICS:
+            a, b = control.get(metric), treatment.get(metric)
+            if a is None or b is None:
+                continue
+            self.arms["control"][metric].add(a)
+            self.arms["treatment"][metric].add(b)
+            self.tests[metric].add(b - a)
+
+    @property
+    def pairs(self) -> int:
+        return max(test.differences.n for test in self.tests.values())
+
+    @property
+    def stopped(self) -> bool:
+        """True once a stopping metric is significant or max_samples pairs are in."""
+        if any(self.tests[metric].significant for metric in self.stop_on):
+            return True
+        return self.max_samples is not None and self.pairs >= self.max_samples
+
+    def summary(self) -> Dict[str, Any]:
+        """Current per-metric estimates, p-values and the rollout decision."""
+        metrics = {}
+        for metric, test in self.tests.items():
+            diff = test.differences
+            verdict = None
+            if test.significant:
+                verdict = "treatment_better" if diff.mean < 0 else "treatment_worse"
+            metrics[metric] = {
+                "pairs": diff.n,
+                "control_mean": self.arms["control"][metric].mean if diff.n else None,
+                "treatment_mean": self.arms["treatment"][metric].mean if diff.n else None,
+                "mean_difference": diff.mean if diff.n else None,
+                "confidence_interval": test.confidence_interval(),
+                "p_value": test.p_value,
+                "significant": test.significant,
+                "verdict": verdict,
+            }
+
+        verdicts = {metrics[metric]["verdict"] for metric in self.stop_on}
+        if "treatment_worse" in verdicts:
+            decision = "keep_control"
+        elif "treatment_better" in verdicts:
+            decision = "roll_out_treatment"
+        elif self.stopped:
+            decision = "inconclusive"
+        else:
+            decision = "continue"
+
+        return {
+            "name": self.name,
+            "control": self.control,
+            "treatment": self.treatment,
+            "traffic_split": self.traffic_split,
+            "routed": dict(self.routed),
+            "pairs": self.pairs,
+            "failed_pairs": self.failed_pairs,
+            "stopped": self.stopped,
+            "decision": decision,
+            "metrics": metrics,
+        }
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Auto-scaling recommendations for self-hosted Deepgram from engine metrics.
+
+Scrapes a Prometheus text endpoint (``engine_active_requests`` gauge,
+``engine_requests_total`` counter and, when exposed, a request duration
+summary/histogram) on an interval into a fixed-size ring buffer, then
+applies Little's law (L = lambda * W) to size the fleet:
+
+- lambda: completed requests per second, from counter deltas
+- L: mean concurrent (active) requests
+- W: time in system, measured from the duration metric or derived as L / lambda
+- per-replica capacity: the highest per-replica concurrency observed while
+  W stayed within the latency target (or a configured value)
+
+    replicas = ceil(peak lambda * W_base / (capacity * utilization))
+
+Usage:
+    python greenfield/autoscaling.py http://deepgram-engine:9991/metrics --interval 15
+"""
+
+import math
+import time
+import asyncio
+import argparse
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+SAMPLE_DTYPE = np.dtype([
+    ("timestamp", "f8"),
+    ("active", "f8"),            # sum of the active-requests gauge across series
+    ("requests_total", "f8"),    # sum of the requests counter across series
+    ("latency_sum", "f8"),       # duration metric _sum (NaN if not exposed)
+    ("latency_count", "f8"),     # duration metric _count (NaN if not exposed)
+    ("replicas", "i4"),          # distinct instances reporting the gauge
+])
+
+
+class RingBuffer:
+    """Fixed-capacity buffer of metric samples in a NumPy structured array."""
+
+    def __init__(self, capacity: int = 2880):
+        self._data = np.zeros(capacity, dtype=SAMPLE_DTYPE)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, sample: tuple):
+        self._data[self._next] = sample
+        self._next = (self._next + 1) % len(self._data)
+        self._size = min(self._size + 1, len(self._data))
+
+    def view(self) -> np.ndarray:
+        """Samples in chronological order (a copy only once the buffer has wrapped)."""
+        if self._size < len(self._data):
+            return self._data[:self._size]
+        return np.concatenate([self._data[self._next:], self._data[:self._next]])
+
+
+def parse_engine_metrics(text: str, active_metric: str = "engine_active_requests",
+                         requests_metric: str = "engine_requests_total",
+                         latency_metric: str = "engine_request_duration_seconds") -> tuple:
+    """
+    Reduce a Prometheus text exposition to one ring-buffer sample.
+
+    Returns:
+        Tuple matching SAMPLE_DTYPE, timestamped now
+    """
+    from prometheus_client.parser import text_string_to_metric_families
+
+    active = requests_total = 0.0
+    latency_sum = latency_count = math.nan
+    instances = set()
+    for family in text_string_to_metric_families(text):
+        for sample in family.samples:
+            if sample.name == active_metric:
+                active += sample.value
+                instances.add(sample.labels.get("instance") or sample.labels.get("pod") or "")
+            elif sample.name == requests_metric:
+                requests_total += sample.value
+            elif sample.name == f"{latency_metric}_sum":
+                latency_sum = np.nansum([latency_sum, sample.value])
+            elif sample.name == f"{latency_metric}_count":
+                latency_count = np.nansum([latency_count, sample.value])
+
+    return (time.time(), active, requests_total, latency_sum, latency_count, max(len(instances), 1))
+
+
+def _counter_deltas(values: np.ndarray) -> np.ndarray:
+    """Per-interval increases of a counter, treating decreases as resets."""
+    deltas = np.diff(values)
+    return np.where(deltas < 0, values[1:], deltas)
+
+
+class AutoscalingAdvisor:
+    """Scrape engine metrics and recommend replica counts."""
+
+    def __init__(self, metrics_url: Optional[str] = None, interval: float = 15.0, capacity: int = 2880,
+                 latency_target: Optional[float] = None, per_replica_concurrency: Optional[float] = None,
+                 target_utilization: float = 0.8, min_replicas: int = 1, max_replicas: int = 100):
+        """
+        Args:
+            metrics_url: Prometheus text endpoint to scrape
+            interval: Seconds between scrapes
+            capacity: Samples kept in the ring buffer (default: 12h at 15s)
+            latency_target: Max acceptable time in system (default: 1.5x the best observed)
+            per_replica_concurrency: Known per-replica concurrency limit (default: estimated)
+            target_utilization: Fraction of capacity to plan for (headroom for bursts)
+            min_replicas: Lower bound on recommendations
+            max_replicas: Upper bound on recommendations
+        """
+        self.metrics_url = metrics_url
+        self.interval = interval
+        self.samples = RingBuffer(capacity)
+        self.latency_target = latency_target
+        self.per_replica_concurrency = per_replica_concurrency
+        self.target_utilization = target_utilization
+        self.min_replicas = min_replicas
+        self.max_replicas = max_replicas
+
+    def add_sample(self, sample: tuple):
+        self.samples.append(sample)
+
+    async def scrape_once(self, client=None):
+        """Fetch and record one sample from ``metrics_url``."""
+        import httpx
+
+        if client is None:
+            async with httpx.AsyncClient(timeout=self.interval) as client:
+                return await self.scrape_once(client)
+        response = await client.get(self.metrics_url)
+        response.raise_for_status()
+        sample = parse_engine_metrics(response.text)
+        self.add_sample(sample)
+        return sample
+
+    async def run(self, iterations: Optional[int] = None, report_every: Optional[int] = None,
+                  on_report: Optional[Callable[[Dict[str, Any]], Any]] = None):
+        """
+        Scrape every ``interval`` seconds (forever, or ``iterations`` times); errors are skipped.
+
+        Args:
+            iterations: Scrapes before returning (default: run forever)
+            report_every: Call ``on_report`` with recommend() after every this many scrapes
+            on_report: Receives each recommendation; the scrape cadence is unaffected
+        """
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        count = 0
+        async with httpx.AsyncClient(timeout=self.interval) as client:
+            while iterations is None or count < iterations:
+                try:
+                    await self.scrape_once(client)
+                except (httpx.HTTPError, ValueError) as e:
+                    print(f"Scrape failed: {e}")
+                count += 1
+                if on_report is not None and report_every and count % report_every == 0:
+                    on_report(self.recommend())
+                if iterations is None or count < iterations:
+                    await asyncio.sleep(max(0.0, started + count * self.interval - loop.time()))
+
+    def recommend(self) -> Dict[str, Any]:
+        """
+        Recommend a replica count from the buffered samples.
+
+        Returns:
+            Dict with current/recommended replicas and the estimates behind them
+        """
+        data = self.samples.view()
+        if len(data) < 2:
+            return {"recommended_replicas": None, "reason": "need at least two samples"}
+
+        elapsed = np.diff(data["timestamp"])
+        completions = _counter_deltas(data["requests_total"])
+        valid = elapsed > 0
+        arrival_rate = np.where(valid, completions / np.where(valid, elapsed, 1.0), 0.0)
+
+        # Mean concurrency over each interval (trapezoid between scrapes)
+        active = (data["active"][1:] + data["active"][:-1]) / 2
+        replicas = np.maximum(data["replicas"][1:], 1)
+
+        # Time in system: measured when the duration metric's _count grew over the interval
+        # (requests completed and were timed), else Little's law W = L / lambda
+        latency_count = data["latency_count"]
+        timed = _counter_deltas(np.nan_to_num(latency_count))
+        has_measured = ~np.isnan(latency_count[1:]) & ~np.isnan(latency_count[:-1]) & (timed > 0)
+        measured = _counter_deltas(np.nan_to_num(data["latency_sum"])) / np.maximum(timed, 1)
+        derived = np.where(arrival_rate > 0, active / np.maximum(arrival_rate, 1e-12), np.nan)
+        time_in_system = np.where(has_measured, measured, derived)
+
+        busy = (arrival_rate > 0) & ~np.isnan(time_in_system)
+        if not busy.any():
+            return {"recommended_replicas": self.min_replicas, "current_replicas": int(replicas[-1]),
+                    "reason": "no traffic in window"}
+
+        base_latency = float(np.percentile(time_in_system[busy], 10))
+        latency_target = self.latency_target or 1.5 * base_latency
+
+        per_replica_active = active / replicas
+        if self.per_replica_concurrency:
+            capacity = float(self.per_replica_concurrency)
+        else:
+            # Highest per-replica concurrency seen while latency stayed on target;
+            # never below 1 so a lightly loaded fleet does not look saturated
+            healthy = busy & (time_in_system <= latency_target)
+            capacity = float(per_replica_active[healthy].max()) if healthy.any() else float(per_replica_active[busy].min())
+            capacity = max(capacity, 1.0)
+
+        peak_rate = float(np.percentile(arrival_rate[busy], 95))
+        needed_concurrency = peak_rate * base_latency  # Little's law at healthy service time
+        recommended = math.ceil(needed_concurrency / (capacity * self.target_utilization))
+        recommended = int(min(max(recommended, self.min_replicas), self.max_replicas))
+
+        current = int(replicas[-1])
+        return {
+            "current_replicas": current,
+            "recommended_replicas": recommended,
+            "action": "scale_up" if recommended > current else "scale_down" if recommended < current else "hold",
+            "arrival_rate": float(arrival_rate[busy].mean()),
+            "peak_arrival_rate": peak_rate,
+            "mean_active_requests": float(active[busy].mean()),
+            "time_in_system": float(np.nanmean(time_in_system[busy])),
+            "base_latency": base_latency,
+            "latency_target": latency_target,
+            "per_replica_capacity": capacity,
+            "latency_degraded": bool((time_in_system[busy][-3:] > latency_target).any()),
+            "samples": len(data),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recommend Deepgram replica counts from engine metrics.")
+    parser.add_argument("metrics_url", help="Prometheus text endpoint, e.g. http://engine:9991/metrics")
+    parser.add_argument("--interval", type=float, default=15.0, help="seconds between scrapes (default: 15)")
+    parser.add_argument("--latency-target", type=float, help="max acceptable seconds in system")
+    parser.add_argument("--per-replica-concurrency", type=float, help="known per-replica concurrency limit")
+    parser.add_argument("--report-every", type=int, default=4, help="scrapes between recommendations")
+    args = parser.parse_args(argv)
+
+    advisor = AutoscalingAdvisor(args.metrics_url, args.interval, latency_target=args.latency_target,
+                                 per_replica_concurrency=args.per_replica_concurrency)
+
+    try:
+        # One scrape loop for the whole session, so scrapes stay ``interval`` apart
+        asyncio.run(advisor.run(report_every=args.report_every, on_report=print))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -6,72 +6,388 @@ for Deepgram API calls and transcription quality metrics.
 """
 
 import os
+import sys
 import json
+import time
 import sqlite3
 import asyncio
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from deepgram import DeepgramClient, PrerecordedOptions
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Union, Iterable, AsyncIterator
+
 from dotenv import load_dotenv
 
+# Allow running as a script (python greenfield/deepgram_monitor.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from greenfield.ab_testing import ABTest
+from greenfield.endpoints import Endpoint, EndpointRegistry
+from greenfield.http_trace import PHASES, RequestTrace, summarize_phases
+from greenfield.live_results import ResultRing
+from greenfield.pricing import DEFAULT_PRICING, DEFAULT_TIER, PricingTable
+from greenfield.replay import TrafficRecorder
+from greenfield.streaming import AudioFormat, percentile, read_wav_frames, stream_audio
+from greenfield.wer import word_error_rate
+
 # Load environment variables
 load_dotenv()
 
+DEEPGRAM_API_URL = "https://api.deepgram.com"
+
+# Columns of the requests table (besides id), in insert order. New columns
+# are added to existing databases by setup_database.
+REQUEST_COLUMNS = {
+    "timestamp": "TEXT NOT NULL",
+    "mode": "TEXT NOT NULL DEFAULT 'prerecorded'",
+    "project": "TEXT NOT NULL DEFAULT 'default'",
+    "endpoint": "TEXT NOT NULL DEFAULT 'default'",
+    "model": "TEXT NOT NULL",
+    "audio_url": "TEXT",
+    "duration": "REAL",
+    "latency": "REAL",
+    "response_code": "INTEGER",
+    "cost": "REAL",
+    "wer": "REAL",
+    "transcript": "TEXT",
+    "error": "TEXT",
+}
+
 
 class DeepgramMonitor:
     """Monitor and log Deepgram API transcription requests."""
 
-    def __init__(self, api_key: Optional[str] = None, db_path: str = "monitoring.db"):
+    def __init__(self, api_key: Optional[str] = None, db_path: str = "monitoring.db",
+                 base_url: Optional[str] = None, project: str = "default",
+                 tier: str = DEFAULT_TIER, pricing: Optional[PricingTable] = None,
+                 endpoints: Optional[EndpointRegistry] = None,
+                 recorder: Optional[TrafficRecorder] = None,
+                 live: Optional[ResultRing] = None, max_concurrency: int = 8):
         """
         Initialize the Deepgram monitoring system.
 
         Args:
             api_key: Deepgram API key (defaults to env var)
             db_path: Path to SQLite database for logging
+            base_url: API base URL (defaults to DEEPGRAM_API_URL env var, then cloud)
+            project: Default project that requests are billed to
+            tier: Pricing tier used for cost calculation
+            pricing: Pricing table (defaults to Deepgram list prices)
+            endpoints: Deployments to monitor; defaults to a single "default"
+                endpoint built from api_key and base_url
+            recorder: Record mode: capture every prerecorded request, raw
+                response and latency to this traffic log (see greenfield.replay)
+            live: Shared-memory ring that every result is also published to,
+                for readers in other processes (see greenfield.live_results)
+            max_concurrency: Requests in flight to the default endpoint
+                (endpoints passed in carry their own limits)
         """
         self.api_key = api_key or os.getenv("DEEPGRAM_API_KEY")
         self.db_path = db_path
-        self.client = None  # TODO: Initialize Deepgram client
+        self.base_url = (base_url or os.getenv("DEEPGRAM_API_URL") or DEEPGRAM_API_URL).rstrip("/")
+        self.project = project
+        self.tier = tier
+        self.pricing = pricing or DEFAULT_PRICING
+        self.endpoints = endpoints or EndpointRegistry([
+            Endpoint("default", self.base_url, self.api_key, models=("nova-2", "nova-3"),
+                     max_concurrency=max_concurrency),
+        ])
+        self.recorder = recorder
+        self.live = live
 
-        # TODO: Set up database connection and schema
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.setup_database()
 
     def setup_database(self):
         """Create database tables for monitoring."""
-        # TODO: Create schema for tracking:
-        # - timestamp
-        # - model
-        # - duration
-        # - latency
-        # - response_code
-        # - cost
-        # - wer (when ground truth available)
-        pass
-
-    async def transcribe_url(self, audio_url: str, model: str = "nova-2") -> Dict[str, Any]:
+        columns = ",\n".join(f"{name} {definition}" for name, definition in REQUEST_COLUMNS.items())
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS requests (id INTEGER PRIMARY KEY AUTOINCREMENT, {columns})"
+        )
+        existing = {row["name"] for row in self.conn.execute("PRAGMA table_info(requests)")}
+        for name, definition in REQUEST_COLUMNS.items():
+            if name not in existing:
+                self.conn.execute(f"ALTER TABLE requests ADD COLUMN {name} {definition}")
+
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS stream_sessions (
+                request_id INTEGER PRIMARY KEY REFERENCES requests(id),
+                audio_seconds REAL,
+                time_to_first_transcript REAL,
+                interim_count INTEGER,
+                interim_latency_mean REAL,
+                interim_latency_p95 REAL,
+                final_count INTEGER,
+                finalization_lag REAL,
+                finalization_lag_p95 REAL,
+                drain_time REAL
+            );
+
+            -- Latency breakdown of prerecorded requests (see greenfield.http_trace)
+            CREATE TABLE IF NOT EXISTS request_phases (
+                request_id INTEGER PRIMARY KEY REFERENCES requests(id),
+                http_version TEXT,
+                connection_reused INTEGER,
+                connect REAL,
+                tls REAL,
+                upload REAL,
+                ttfb REAL,
+                download REAL,
+                other REAL
+            );
+
+            -- Running cost totals, updated as each request is logged
+            CREATE TABLE IF NOT EXISTS cost_rollups (
+                project TEXT NOT NULL,
+                model TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                day TEXT NOT NULL,
+                requests INTEGER NOT NULL DEFAULT 0,
+                audio_seconds REAL NOT NULL DEFAULT 0,
+                cost REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (project, model, mode, day)
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_requests_model_time ON requests(model, timestamp);
+        """)
+        self.conn.commit()
+
+    def log_request(self, record: Dict[str, Any]) -> int:
+        """
+        Insert one request record, update cost rollups and return its row id.
+
+        Cost is calculated from the pricing table when the record has a
+        duration but no cost.
+
+        Args:
+            record: Dict with any of the ``requests`` table columns, plus an
+                optional ``features`` list of billable features
+
+        Returns:
+            The new row's id
+        """
+        row = {column: record.get(column) for column in REQUEST_COLUMNS}
+        row["timestamp"] = row["timestamp"] or datetime.now().isoformat()
+        row["mode"] = row["mode"] or "prerecorded"
+        row["project"] = row["project"] or self.project
+        row["endpoint"] = row["endpoint"] or self.endpoints.get().name
+        if row["cost"] is None:
+            row["cost"] = self.pricing.price(
+                row["duration"], row["model"], row["mode"], self.tier, record.get("features", ())
+            )
+
+        cursor = self.conn.execute(
+            f"INSERT INTO requests ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+            list(row.values()),
+        )
+        if row["cost"] is not None:
+            self.conn.execute("""
+                INSERT INTO cost_rollups (project, model, mode, day, requests, audio_seconds, cost)
+                VALUES (?, ?, ?, ?, 1, ?, ?)
+                ON CONFLICT (project, model, mode, day) DO UPDATE SET
+                    requests = requests + 1,
+                    audio_seconds = audio_seconds + excluded.audio_seconds,
+                    cost = cost + excluded.cost
+            """, (row["project"], row["model"], row["mode"], row["timestamp"][:10],
+                  row["duration"] or 0.0, row["cost"]))
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def _log_details(self, table: str, request_id: int, values: Dict[str, Any]):
+        """Insert a row of per-request details keyed by the request's id."""
+        columns = list(values)
+        self.conn.execute(
+            f"INSERT INTO {table} (request_id, {', '.join(columns)}) VALUES (?, {', '.join('?' * len(columns))})",
+            [request_id, *values.values()],
+        )
+        self.conn.commit()
+
+    def publish(self, result: Dict[str, Any]):
+        """Append a transcription result to the live ring, if there is one."""
+        if self.live is not None:
+            self.live.write(result["model"], result["latency"], result.get("wer"), result["cost"],
+                            result.get("response_code"), result["error"] is None)
+
+    def cost_summary(self, period: str = "month", project: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Cost totals per project, model and period, read from the rollups.
+
+        Args:
+            period: "day" or "month"
+            project: Only include this project
+
+        Returns:
+            List of dicts with project, model, mode, period, requests,
+            audio_seconds and cost
+        """
+        period_expr = {"day": "day", "month": "substr(day, 1, 7)"}[period]
+        where, params = ("WHERE project = ?", [project]) if project else ("", [])
+        rows = self.conn.execute(f"""
+            SELECT project, model, mode, {period_expr} AS period,
+                   SUM(requests) AS requests, SUM(audio_seconds) AS audio_seconds, SUM(cost) AS cost
+            FROM cost_rollups {where}
+            GROUP BY project, model, mode, period
+            ORDER BY period, project, model, mode
+        """, params)
+        return [dict(row) for row in rows]
+
+    async def close(self):
+        """Close endpoint HTTP clients, the traffic recorder, the live ring and the database connection."""
+        await self.endpoints.aclose()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.live is not None:
+            self.live.close()
+        self.conn.close()
+
+    async def transcribe_url(self, audio_url: str, model: str = "nova-2",
+                             project: Optional[str] = None,
+                             endpoint: Optional[str] = None,
+                             reference: Optional[str] = None,
+                             log: bool = True) -> Dict[str, Any]:
         """
         Transcribe audio from URL and log metrics.
 
         Args:
             audio_url: URL of audio file to transcribe
             model: Deepgram model to use
+            project: Project to bill the request to (defaults to the monitor's)
+            endpoint: Registered endpoint to send the request to (defaults to the first)
+            reference: Ground truth transcript; if given, WER is scored and logged
+            log: Record the request in the database and publish it to the live
+                ring (callers that store results themselves, like batch
+                pipelines, can skip it and publish once they have scored it)
 
         Returns:
             Transcription result with metrics
         """
-        # TODO: Implement transcription with monitoring
-        # 1. Start timer
-        # 2. Call Deepgram API
-        # 3. Calculate metrics
-        # 4. Log to database
-        # 5. Return results
+        import httpx
+
+        target = self.endpoints.get(endpoint)
+        result = {
+            "transcript": None,
+            "model": model,
+            "project": project or self.project,
+            "endpoint": target.name,
+            "url": audio_url,
+            "timestamp": datetime.now().isoformat(),
+            "response_code": None,
+            "duration": None,
+            "error": None,
+        }
+
+        params, payload, response = {"model": model, "smart_format": "true"}, {"url": audio_url}, None
+        trace = RequestTrace()
+        async with target.semaphore:
+            start = time.perf_counter()
+            try:
+                response = await target.client.post("/v1/listen", params=params, json=payload,
+                                                    extensions={"trace": trace})
+                result["response_code"] = response.status_code
+                response.raise_for_status()
+                body = response.json()
+                result["transcript"] = body["results"]["channels"][0]["alternatives"][0]["transcript"]
+                result["duration"] = body.get("metadata", {}).get("duration")
+            except (httpx.HTTPError, KeyError, IndexError, ValueError) as e:
+                result["error"] = str(e) or type(e).__name__
+            result["latency"] = time.perf_counter() - start
+        result["phases"] = trace.phases(result["latency"])
+        target.health.record(result["error"] is None, result["latency"], result["error"])
+        result["cost"] = self.pricing.price(result["duration"], model, "prerecorded", self.tier)
+        if self.recorder is not None:
+            self.recorder.record(
+                "POST", "/v1/listen", params, payload,
+                status=response.status_code if response is not None else None,
+                response=response.text if response is not None else None,
+                latency=result["latency"], endpoint=target.name,
+                error=result["error"] if response is None else None,
+            )
+        result["wer"] = None
+        if reference is not None and result["transcript"] is not None:
+            result["wer"] = self.calculate_wer(reference, result["transcript"])
+
+        if log:
+            self.publish(result)
+        result["id"] = self.log_request({**result, "audio_url": audio_url}) if log else None
+        if result["id"] is not None:
+            self._log_details("request_phases", result["id"], result["phases"])
+        return result
+
+    async def transcribe_stream(
+        self,
+        source: Union[str, Path, Iterable[bytes], AsyncIterator[bytes]],
+        model: str = "nova-2",
+        speed: float = 1.0,
+        audio_format: Optional[AudioFormat] = None,
+        frame_ms: int = 20,
+        project: Optional[str] = None,
+        endpoint: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Stream audio over the live websocket API and log latency metrics.
+
+        Args:
+            source: WAV file path, or a (sync or async) iterable of PCM frames
+            model: Deepgram model to use
+            speed: Pace multiplier; 1.0 is real time, 2.0 twice as fast, 0 unthrottled
+            audio_format: Format of raw frames (ignored for WAV files, which carry their own)
+            frame_ms: Frame size when reading from a WAV file
+            project: Project to bill the session to (defaults to the monitor's)
+            endpoint: Registered endpoint to stream to (defaults to the first)
+
+        Returns:
+            Transcription result with streaming metrics
+        """
+        from websockets.exceptions import WebSocketException
 
+        if isinstance(source, (str, Path)):
+            audio_format, frames = read_wav_frames(source, frame_ms)
+            audio_url = str(source)
+        else:
+            audio_format, frames = audio_format or AudioFormat(), source
+            audio_url = None
+
+        target = self.endpoints.get(endpoint)
         result = {
-            "transcript": "Not yet implemented",
+            "transcript": None,
             "model": model,
+            "project": project or self.project,
+            "endpoint": target.name,
             "url": audio_url,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now().isoformat(),
+            "mode": "streaming",
+            "metrics": {},
+            "error": None,
         }
 
+        async with target.semaphore:
+            start = time.perf_counter()
+            try:
+                streamed = await stream_audio(
+                    target.ws_url + "/v1/listen", frames, audio_format, api_key=target.api_key,
+                    params={"model": model}, speed=speed,
+                )
+                result["transcript"] = streamed["transcript"]
+                result["metrics"] = streamed["metrics"]
+                result["response_code"] = 101  # Switching Protocols: websocket accepted
+            except (OSError, ValueError, asyncio.TimeoutError, WebSocketException) as e:
+                result["error"] = str(e) or type(e).__name__
+                result["response_code"] = getattr(getattr(e, "response", None), "status_code", None)
+            session_time = time.perf_counter() - start
+
+        metrics = result["metrics"]
+        result["duration"] = metrics.get("audio_seconds")
+        # For streams, "latency" is the mean finalization lag rather than the
+        # session wall time (which is dominated by audio length and pace)
+        lag = metrics.get("finalization_lag")
+        result["latency"] = lag if lag is not None else session_time
+        result["cost"] = self.pricing.price(result["duration"], model, "streaming", self.tier)
+        target.health.record(result["error"] is None, result["latency"], result["error"])
+
+        self.publish(result)
+        result["id"] = self.log_request({**result, "audio_url": audio_url})
+        if metrics:
+            self._log_details("stream_sessions", result["id"], metrics)
         return result
 
     def calculate_wer(self, reference: str, hypothesis: str) -> float:
@@ -83,47 +399,178 @@ class DeepgramMonitor:
             hypothesis: Model-generated transcript
 
         Returns:
-            WER score (0.0 = perfect, 1.0 = completely wrong)
+            WER score (0.0 = perfect, 1.0 = completely wrong; insertions can push it higher)
         """
-        # TODO: Implement proper WER calculation
-        # - Handle text normalization
-        # - Use Levenshtein distance
-        # - Return (insertions + deletions + substitutions) / total_words
+        return word_error_rate(reference, hypothesis)
 
-        return 0.0
-
-    async def compare_models(self, audio_url: str, models: List[str] = None) -> Dict[str, Any]:
+    async def compare_models(self, audio_url: str, models: List[str] = None,
+                             reference: Optional[str] = None,
+                             endpoint: Optional[str] = None) -> Dict[str, Any]:
         """
         Compare multiple models on the same audio.
 
         Args:
             audio_url: Audio file to test
-            models: List of models to compare
+            models: List of models to compare (defaults to the endpoint's models)
+            reference: Ground truth transcript for WER scoring
+            endpoint: Registered endpoint to use (defaults to the first)
+
+        Returns:
+            Comparison results with metrics for each model, plus the best
+            model by latency, cost and WER among successful requests
+        """
+        models = models or list(self.endpoints.get(endpoint).models)
+        results = await asyncio.gather(*(
+            self.transcribe_url(audio_url, model, endpoint=endpoint, reference=reference) for model in models
+        ))
+        by_model = dict(zip(models, results))
+        succeeded = [result for result in results if result["error"] is None]
+
+        def best(metric):
+            scored = [result for result in succeeded if result.get(metric) is not None]
+            return min(scored, key=lambda result: result[metric])["model"] if scored else None
+
+        return {
+            "audio_url": audio_url,
+            "results": by_model,
+            "fastest": best("latency"),
+            "cheapest": best("cost"),
+            "most_accurate": best("wer"),
+        }
+
+    async def transcribe_ab(self, ab_test: ABTest, audio_url: str, reference: Optional[str] = None,
+                            key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Transcribe one utterance under an A/B test.
+
+        Utterances routed to the treatment are also sent to the control model
+        and the pair is recorded in the test; the rest use the control only.
+
+        Args:
+            ab_test: Test that routes the request and accumulates results
+            audio_url: Audio to transcribe
+            reference: Ground truth transcript for WER scoring
+            key: Routing key (defaults to audio_url)
 
         Returns:
-            Comparison results with metrics for each model
+            Result of the model that served the request, with its ``arm``
         """
-        # TODO: Run parallel transcriptions with different models
-        # - Use asyncio.gather for parallel execution
-        # - Compare latency, cost, WER
-        # - Return structured comparison
+        arm = ab_test.assign(key or audio_url)
+        if arm == "control":
+            result = await self.transcribe_url(audio_url, ab_test.control, reference=reference)
+        else:
+            comparison = await self.compare_models(audio_url, [ab_test.control, ab_test.treatment], reference)
+            control, result = comparison["results"][ab_test.control], comparison["results"][ab_test.treatment]
+            ab_test.record(control, result)
+        return {**result, "arm": arm}
 
-        return {"status": "not_implemented"}
+    async def run_ab_test(self, ab_test: ABTest, samples: Iterable[Dict[str, Any]],
+                          concurrency: int = 4) -> Dict[str, Any]:
+        """
+        Feed ground-truth samples through an A/B test until it stops.
+
+        No new utterances are started once the test is significant (or hits
+        max_samples); requests already in flight finish and are recorded.
+
+        Args:
+            ab_test: Test to run
+            samples: ground_truth.json-style dicts with ``audio_url``,
+                ``transcript`` and optionally ``id``
+            concurrency: Utterances in flight at once
+
+        Returns:
+            The test summary
+        """
+        pending = set()
+        for sample in samples:
+            if ab_test.stopped:
+                break
+            if len(pending) >= concurrency:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if ab_test.stopped:
+                    break
+            pending.add(asyncio.ensure_future(self.transcribe_ab(
+                ab_test, sample["audio_url"], sample.get("transcript"), sample.get("id"),
+            )))
+        if pending:
+            await asyncio.wait(pending)
+        return ab_test.summary()
+
+    async def probe_endpoints(self, audio_url: str, models: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Probe every registered endpoint concurrently.
+
+        Args:
+            audio_url: Audio to transcribe on each endpoint
+            models: Models to probe (defaults to each endpoint's own model set)
+
+        Returns:
+            One transcription result per (endpoint, model)
+        """
+        probes = [
+            self.transcribe_url(audio_url, model, endpoint=endpoint.name)
+            for endpoint in self.endpoints
+            for model in (models or endpoint.models)
+        ]
+        return list(await asyncio.gather(*probes))
+
+    async def monitor_endpoints(self, audio_url: str, interval: float = 60.0,
+                                iterations: Optional[int] = None):
+        """
+        Probe all endpoints every ``interval`` seconds (forever, or ``iterations`` times).
+
+        Probes are scheduled on a fixed cadence from the start time, so a
+        slow round does not push later rounds back.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        round_number = 0
+        while iterations is None or round_number < iterations:
+            await self.probe_endpoints(audio_url)
+            round_number += 1
+            if iterations is not None and round_number >= iterations:
+                break
+            await asyncio.sleep(max(0.0, started + round_number * interval - loop.time()))
 
     def generate_report(self) -> Dict[str, Any]:
         """
         Generate summary report from monitoring database.
 
         Returns:
-            Summary statistics and insights
+            Per (endpoint, model) request counts, error rate, latency
+            percentiles, average WER, total cost and the latency breakdown of
+            successful prerecorded requests (see summarize_phases), plus
+            endpoint health
         """
-        # TODO: Query database for:
-        # - Average WER by model
-        # - Latency percentiles
-        # - Total cost
-        # - Error rates
+        rows = self.conn.execute(f"""
+            SELECT r.endpoint, r.model, r.latency, r.cost, r.wer, r.error IS NOT NULL AS failed,
+                   p.connection_reused, {', '.join(f'p.{phase}' for phase in PHASES)}
+            FROM requests r LEFT JOIN request_phases p ON p.request_id = r.id
+            ORDER BY r.endpoint, r.model
+        """).fetchall()
+
+        groups: Dict[tuple, List[sqlite3.Row]] = {}
+        for row in rows:
+            groups.setdefault((row["endpoint"], row["model"]), []).append(row)
+
+        summary = []
+        for (endpoint, model), group in groups.items():
+            latencies = sorted(row["latency"] for row in group if not row["failed"] and row["latency"] is not None)
+            wers = [row["wer"] for row in group if row["wer"] is not None]
+            summary.append({
+                "endpoint": endpoint,
+                "model": model,
+                "requests": len(group),
+                "error_rate": sum(row["failed"] for row in group) / len(group),
+                "latency_p50": percentile(latencies, 50),
+                "latency_p95": percentile(latencies, 95),
+                "latency_p99": percentile(latencies, 99),
+                "wer_mean": sum(wers) / len(wers) if wers else None,
+                "cost_total": sum(row["cost"] or 0.0 for row in group),
+                "phases": summarize_phases(dict(row) for row in group if not row["failed"]),
+            })
 
-        return {"status": "not_implemented"}
+        return {"models": summary, "endpoints": self.endpoints.health()}
 
 
 # Example usage (for testing)
@@ -137,6 +584,7 @@ if __name__ == "__main__":
         print(f"Testing with: {test_url}")
         result = await monitor.transcribe_url(test_url)
         print(f"Result: {json.dumps(result, indent=2)}")
+        await monitor.close()
 
     # Run the async main function
     asyncio.run(main())
\ No newline at end of file
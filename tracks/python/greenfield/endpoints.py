@@ -0,0 +1,175 @@
+"""
+Registry of Deepgram deployments (cloud and self-hosted) to monitor together.
+
+Each named endpoint has its own base URL, API key and model set, plus a
+pooled HTTP/2 client, a concurrency limit and health state, all created
+lazily inside the running event loop.
+
+Endpoints can be loaded from a JSON config:
+
+    [
+      {"name": "cloud", "base_url": "https://api.deepgram.com", "api_key_env": "DEEPGRAM_API_KEY",
+       "models": ["nova-2", "nova-3"]},
+      {"name": "onprem", "base_url": "http://deepgram.internal:8080", "models": ["nova-2"],
+       "max_concurrency": 4}
+    ]
+"""
+
+import os
+import json
+import time
+import asyncio
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    import httpx
+
+REQUEST_TIMEOUT = 30.0  # seconds
+DOWN_AFTER_FAILURES = 3  # consecutive failures before an endpoint is marked down
+
+
+@dataclass
+class EndpointHealth:
+    """Rolling health state for one endpoint."""
+
+    status: str = "unknown"  # unknown | healthy | degraded | down
+    consecutive_failures: int = 0
+    last_latency: Optional[float] = None
+    last_checked: Optional[float] = None
+    last_error: Optional[str] = None
+
+    def record(self, ok: bool, latency: Optional[float] = None, error: Optional[str] = None):
+        """Update health from one request outcome."""
+        self.last_checked = time.time()
+        self.last_latency = latency
+        if ok:
+            self.consecutive_failures = 0
+            self.last_error = None
+            self.status = "healthy"
+        else:
+            self.consecutive_failures += 1
+            self.last_error = error
+            self.status = "down" if self.consecutive_failures >= DOWN_AFTER_FAILURES else "degraded"
+
+
+@dataclass
+class Endpoint:
+    """One Deepgram deployment."""
+
+    name: str
+    base_url: str
+    api_key: Optional[str] = None
+    models: Tuple[str, ...] = ("nova-2",)
+    max_concurrency: int = 8
+    http2: bool = True
+    health: EndpointHealth = field(default_factory=EndpointHealth)
+    _client: Optional["httpx.AsyncClient"] = field(default=None, repr=False)
+    _semaphore: Optional[asyncio.Semaphore] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        self.base_url = self.base_url.rstrip("/")
+        self.models = tuple(self.models)
+
+    @property
+    def ws_url(self) -> str:
+        """Websocket base URL (http -> ws, https -> wss)."""
+        return "ws" + self.base_url[len("http"):]
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        """Pooled HTTP client for this endpoint, created on first use."""
+        import httpx
+
+        if self._client is None:
+            headers = {"Authorization": f"Token {self.api_key}"} if self.api_key else {}
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=REQUEST_TIMEOUT,
+                headers=headers,
+                http2=self.http2 and _h2_available(),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+        return self._client
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limit for in-flight requests to this endpoint."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def _h2_available() -> bool:
+    """HTTP/2 needs the optional ``h2`` package (``pip install httpx[http2]``)."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class EndpointRegistry:
+    """Named endpoints, iterated in registration order."""
+
+    def __init__(self, endpoints: Optional[List[Endpoint]] = None):
+        self._endpoints: Dict[str, Endpoint] = {}
+        for endpoint in endpoints or []:
+            self.add(endpoint)
+
+    @classmethod
+    def from_config(cls, path: Union[str, Path]) -> "EndpointRegistry":
+        """
+        Load endpoints from a JSON config file.
+
+        Each entry takes Endpoint's fields; ``api_key_env`` names an
+        environment variable to read the key from instead of ``api_key``.
+        """
+        with open(path, "r") as f:
+            entries = json.load(f)
+
+        endpoints = []
+        for entry in entries:
+            entry = dict(entry)
+            key_env = entry.pop("api_key_env", None)
+            if key_env:
+                entry["api_key"] = os.getenv(key_env)
+            endpoints.append(Endpoint(**entry))
+        return cls(endpoints)
+
+    def add(self, endpoint: Endpoint) -> Endpoint:
+        if endpoint.name in self._endpoints:
+            raise ValueError(f"Endpoint {endpoint.name!r} is already registered")
+        self._endpoints[endpoint.name] = endpoint
+        return endpoint
+
+    def get(self, name: Optional[str] = None) -> Endpoint:
+        """Look up an endpoint by name (the first registered one if name is None)."""
+        if name is None:
+            return next(iter(self._endpoints.values()))
+        try:
+            return self._endpoints[name]
+        except KeyError:
+            raise KeyError(f"Unknown endpoint {name!r}; registered: {', '.join(self._endpoints)}")
+
+    def __iter__(self) -> Iterator[Endpoint]:
+        return iter(self._endpoints.values())
+
+    def __len__(self) -> int:
+        return len(self._endpoints)
+
+    def health(self) -> Dict[str, Dict[str, Any]]:
+        """Current health state of every endpoint."""
+        return {endpoint.name: vars(endpoint.health).copy() for endpoint in self}
+
+    async def aclose(self):
+        await asyncio.gather(*(endpoint.aclose() for endpoint in self))
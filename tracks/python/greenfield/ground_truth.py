@@ -0,0 +1,252 @@
+"""
+Ground-truth catalog: reference transcripts indexed by id, audio URL and audio hash.
+
+Entries are stored in SQLite (on disk, or ``:memory:``) and mirrored into
+in-memory hash maps, so single lookups are O(1) dict hits. Joins onto
+result tables are vectorized: the catalog keeps a pandas frame plus a
+hash index per key column, built once and reused until the catalog
+changes, so each join costs O(result rows) whatever the catalog size.
+
+Usage:
+    catalog = GroundTruthCatalog.from_manifest("test_data/ground_truth.json", "ground_truth.db")
+    catalog.get("bueller_001")["transcript"]
+    scored = catalog.join(results_df, by="id")   # adds a ground_truth column
+"""
+
+import json
+import sqlite3
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+from urllib.parse import unquote, urlparse
+
+# Catalog columns (besides the JSON ``extra`` blob with any other manifest fields)
+COLUMNS = ("id", "audio_url", "audio_hash", "transcript", "duration_seconds", "difficulty", "expected_wer")
+KEYS = ("id", "audio_url", "audio_hash")
+
+
+def hash_audio(source: Union[str, Path, bytes], chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of audio content, from bytes or a file read in chunks."""
+    if isinstance(source, bytes):
+        return hashlib.sha256(source).hexdigest()
+    digest = hashlib.sha256()
+    with open(source, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _local_audio_path(entry: Dict[str, Any], base_dir: Path) -> Optional[Path]:
+    """Local file for a manifest entry (``audio_path`` or a file:// URL), if any."""
+    if entry.get("audio_path"):
+        return base_dir / entry["audio_path"]
+    url = entry.get("audio_url") or ""
+    if url.startswith("file://"):
+        return Path(unquote(urlparse(url).path))
+    return None
+
+
+class GroundTruthCatalog:
+    """Reference transcripts with indexed lookup and vectorized joins."""
+
+    def __init__(self, db_path: str = ":memory:"):
+        """
+        Args:
+            db_path: SQLite database holding the catalog (created if needed)
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS ground_truth (
+                id TEXT PRIMARY KEY,
+                audio_url TEXT,
+                audio_hash TEXT,
+                transcript TEXT,
+                duration_seconds REAL,
+                difficulty TEXT,
+                expected_wer REAL,
+                extra TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_ground_truth_url ON ground_truth(audio_url);
+            CREATE INDEX IF NOT EXISTS idx_ground_truth_hash ON ground_truth(audio_hash);
+        """)
+
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_url: Dict[str, str] = {}
+        self._by_hash: Dict[str, str] = {}
+        for row in self.conn.execute("SELECT * FROM ground_truth"):
+            self._index(self._entry_from_row(row))
+        self._frame = None
+        self._indexes: Dict[str, Any] = {}
+
+    @classmethod
+    def from_manifest(cls, manifest_path: Union[str, Path], db_path: str = ":memory:",
+                      hash_local_audio: bool = False) -> "GroundTruthCatalog":
+        """Open (or create) a catalog and load a ground_truth.json-style manifest into it."""
+        catalog = cls(db_path)
+        catalog.load_manifest(manifest_path, hash_local_audio)
+        return catalog
+
+    @staticmethod
+    def _entry_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        entry = json.loads(row["extra"] or "{}")
+        entry.update({column: row[column] for column in COLUMNS})
+        return entry
+
+    def _index(self, entry: Dict[str, Any]):
+        previous = self._by_id.get(entry["id"])
+        if previous is not None:
+            for keys, key in ((self._by_url, previous["audio_url"]), (self._by_hash, previous["audio_hash"])):
+                if keys.get(key) == entry["id"]:
+                    del keys[key]
+        self._by_id[entry["id"]] = entry
+        if entry.get("audio_url"):
+            self._by_url[entry["audio_url"]] = entry["id"]
+        if entry.get("audio_hash"):
+            self._by_hash[entry["audio_hash"]] = entry["id"]
+
+    def add_many(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert or replace entries (keyed by ``id``) in one transaction.
+
+        Returns:
+            Number of entries written
+        """
+        rows = []
+        for entry in entries:
+            if not entry.get("id"):
+                raise ValueError(f"Ground truth entry has no id: {entry!r}")
+            entry = {**dict.fromkeys(COLUMNS), **entry}
+            rows.append([entry[column] for column in COLUMNS]
+                        + [json.dumps({k: v for k, v in entry.items() if k not in COLUMNS})])
+            self._index(entry)
+
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO ground_truth ({', '.join(COLUMNS)}, extra) "
+                f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))})",
+                rows,
+            )
+        self._frame = None
+        self._indexes = {}
+        return len(rows)
+
+    def add(self, entry: Dict[str, Any]):
+        self.add_many([entry])
+
+    def load_manifest(self, manifest_path: Union[str, Path], hash_local_audio: bool = False) -> int:
+        """
+        Load entries from a ground_truth.json-style list.
+
+        Args:
+            manifest_path: JSON file with id, audio_url, transcript, ... entries
+            hash_local_audio: Compute ``audio_hash`` for entries with local audio
+                (``audio_path`` or file:// URLs) that do not already have one
+
+        Returns:
+            Number of entries loaded
+        """
+        manifest_path = Path(manifest_path)
+        with open(manifest_path, "r") as f:
+            entries = json.load(f)
+
+        if hash_local_audio:
+            for entry in entries:
+                path = _local_audio_path(entry, manifest_path.parent)
+                if not entry.get("audio_hash") and path is not None and path.exists():
+                    entry["audio_hash"] = hash_audio(path)
+        return self.add_many(entries)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._by_id.values())
+
+    def __contains__(self, entry_id: str) -> bool:
+        return entry_id in self._by_id
+
+    def get(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        """Entry by id, or None."""
+        return self._by_id.get(entry_id)
+
+    def by_url(self, audio_url: str) -> Optional[Dict[str, Any]]:
+        """Entry by audio URL, or None."""
+        return self._by_id.get(self._by_url.get(audio_url))
+
+    def by_hash(self, audio_hash: str) -> Optional[Dict[str, Any]]:
+        """Entry by audio content hash (see hash_audio), or None."""
+        return self._by_id.get(self._by_hash.get(audio_hash))
+
+    def lookup(self, entry_id: Optional[str] = None, audio_url: Optional[str] = None,
+               audio_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """First match by id, then audio URL, then audio hash."""
+        return ((entry_id and self.get(entry_id))
+                or (audio_url and self.by_url(audio_url))
+                or (audio_hash and self.by_hash(audio_hash))
+                or None)
+
+    def frame(self):
+        """All entries as a DataFrame (cached until the catalog changes)."""
+        import pandas as pd
+
+        if self._frame is None:
+            self._frame = pd.DataFrame(
+                [[entry.get(column) for column in COLUMNS] for entry in self._by_id.values()],
+                columns=list(COLUMNS),
+            )
+        return self._frame
+
+    def _key_index(self, by: str):
+        """Hash index from key values to frame rows; later entries win on duplicate keys."""
+        import pandas as pd
+
+        if by not in self._indexes:
+            keys = self.frame()[by]
+            keys = keys[keys.notna() & ~keys.duplicated(keep="last")]
+            index = pd.Index(keys.to_numpy(), dtype=object)
+            index.get_indexer([])  # build the hash table once, not per join
+            self._indexes[by] = (index, keys.index.to_numpy())
+        return self._indexes[by]
+
+    def join(self, df, by: str = "id", column: Optional[str] = None,
+             fields: Optional[Dict[str, str]] = None):
+        """
+        Add catalog fields to a results table, matching rows by key.
+
+        Catalog values replace existing ones where a row matches; unmatched
+        rows keep their current value (or get NaN if the column is new).
+
+        Args:
+            df: Results DataFrame
+            by: Catalog key to match on: "id", "audio_url" or "audio_hash"
+            column: Column of ``df`` holding the key (default: same as ``by``)
+            fields: Catalog column -> output column (default: transcript -> ground_truth)
+
+        Returns:
+            A new DataFrame with the joined columns
+        """
+        import numpy as np
+
+        if by not in KEYS:
+            raise ValueError(f"Cannot join on {by!r}; expected one of {', '.join(KEYS)}")
+        fields = fields or {"transcript": "ground_truth"}
+        index, rows = self._key_index(by)
+        positions = index.get_indexer(df[column or by].to_numpy(dtype=object))
+        matched = positions >= 0
+        source_rows = rows[positions[matched]]
+
+        catalog = self.frame()
+        out = df.copy()
+        for field, name in fields.items():
+            if name in out.columns:
+                values = out[name].to_numpy(dtype=object, copy=True)
+            else:
+                values = np.full(len(out), None, dtype=object)
+            values[matched] = catalog[field].to_numpy(dtype=object)[source_rows]
+            out[name] = values
+        return out
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,133 @@
+"""
+Per-request latency breakdown from the HTTP client's trace hooks.
+
+httpx passes an ``extensions={"trace": callback}`` request extension down
+to httpcore, which reports the start and end of each step of the exchange
+(opening the TCP connection, TLS handshake, sending headers and body,
+receiving headers and body). RequestTrace timestamps those events and
+turns them into phases:
+
+    connect    TCP connect, including DNS (new connections only)
+    tls        TLS handshake (new connections only)
+    upload     sending request headers and body
+    ttfb       request sent -> response headers received: API processing
+               plus one network round trip
+    download   reading the response body
+    other      the rest of the measured latency: waiting for a pooled
+               connection and client-side overhead
+
+A phase is None when its events did not happen (reused connections have
+no connect or TLS phase; failed requests stop part way). Connection reuse
+is only reported once a request has been handed a connection; it is None
+when that never happened or the transport emitted no trace events.
+
+Usage:
+    trace = RequestTrace()
+    response = await client.post(url, json=body, extensions={"trace": trace})
+    trace.phases(latency)   # {"connection_reused": True, "ttfb": 0.41, ...}
+"""
+
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from greenfield.streaming import percentile
+
+PHASES = ("connect", "tls", "upload", "ttfb", "download", "other")
+
+# Phase -> (starting event, ending event), event names without the connection/http11/http2 prefix
+_SPANS = {
+    "connect": ("connect_tcp.started", "connect_tcp.complete"),
+    "tls": ("start_tls.started", "start_tls.complete"),
+    "upload": ("send_request_headers.started", "send_request_body.complete"),
+    "ttfb": ("send_request_body.complete", "receive_response_headers.complete"),
+    "download": ("receive_response_body.started", "receive_response_body.complete"),
+}
+
+# Events of opening a new connection
+_CONNECT_EVENTS = ("connect_tcp.started", "connect_unix_socket.started", "start_tls.started")
+
+
+class RequestTrace:
+    """Async trace callback that timestamps one request's httpcore events."""
+
+    def __init__(self):
+        self.events: Dict[str, float] = {}
+        self.http_version: Optional[str] = None
+
+    async def __call__(self, name: str, info: Dict[str, Any]):
+        prefix, event = name.split(".", 1)
+        if prefix in ("http11", "http2"):
+            self.http_version = "HTTP/2" if prefix == "http2" else "HTTP/1.1"
+        # Keep the first occurrence (httpcore retries repeat connect events)
+        self.events.setdefault(event, time.perf_counter())
+
+    @property
+    def connection_reused(self) -> Optional[bool]:
+        """True if the request went out on a pooled connection, None if unknown."""
+        if any(event in self.events for event in _CONNECT_EVENTS):
+            return False
+        if "send_request_headers.started" in self.events:  # a connection was acquired without connecting
+            return True
+        return None
+
+    def phases(self, latency: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Phase durations in seconds.
+
+        Args:
+            latency: Total latency measured around the request; the
+                remainder after the traced phases is reported as ``other``
+
+        Returns:
+            Dict with http_version, connection_reused and one entry per PHASES
+        """
+        phases: Dict[str, Any] = {"http_version": self.http_version, "connection_reused": self.connection_reused}
+        for phase, (start, end) in _SPANS.items():
+            if start in self.events and end in self.events:
+                phases[phase] = self.events[end] - self.events[start]
+            else:
+                phases[phase] = None
+        traced = [phases[phase] for phase in _SPANS if phases[phase] is not None]
+        phases["other"] = max(latency - sum(traced), 0.0) if latency is not None and traced else None
+        return phases
+
+
+def summarize_phases(records: Iterable[Dict[str, Any]], tail_percentile: float = 95) -> Dict[str, Any]:
+    """
+    Summarize phase timings over a set of requests.
+
+    Args:
+        records: Dicts with ``latency``, ``connection_reused`` and PHASES values
+        tail_percentile: Requests at or above this latency percentile form the tail
+
+    Returns:
+        Dict with connection_reuse_rate, p50/p95 per phase, and ``tail``: the
+        mean of each phase over the tail requests, showing which phase makes
+        them slow
+    """
+    records = [r for r in records if r.get("connection_reused") is not None]
+    if not records:
+        return {}
+
+    summary: Dict[str, Any] = {
+        "requests": len(records),
+        "connection_reuse_rate": sum(bool(r["connection_reused"]) for r in records) / len(records),
+    }
+    for phase in PHASES:
+        values = [r[phase] for r in records if r.get(phase) is not None]
+        summary[f"{phase}_p50"] = percentile(values, 50)
+        summary[f"{phase}_p95"] = percentile(values, 95)
+
+    threshold = percentile([r["latency"] for r in records if r.get("latency") is not None], tail_percentile)
+    tail: List[Dict[str, Any]] = [r for r in records if threshold is not None and (r.get("latency") or 0) >= threshold]
+    summary["tail"] = {
+        "latency_threshold": threshold,
+        "requests": len(tail),
+        **{phase: _mean(r.get(phase) or 0.0 for r in tail) for phase in PHASES},
+    }
+    return summary
+
+
+def _mean(values: Iterable[float]) -> Optional[float]:
+    values = list(values)
+    return sum(values) / len(values) if values else None
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Shared-memory ring buffer of recent results.
+
+The monitor (the single writer) appends a fixed-width record per request:
+timestamp, model id, latency, WER, cost, HTTP status and success flag.
+Reports, alerting and dashboards in other processes attach to the segment
+by name and decode the newest records straight out of shared memory, with
+no database queries or file reloads.
+
+Each slot carries a seqlock sequence number. The writer makes it odd while
+a slot is being rewritten and sets it to ``2 * n + 2`` once record ``n`` is
+complete, so a reader that sees the same even value before and after
+decoding a slot knows it read record ``n`` whole. Records overwritten
+mid-read (the oldest ones, once the writer laps the reader) are skipped.
+
+Layout: a 64-byte header (magic, capacity, record size, records written,
+model count), a table of model names indexed by model id, then the slots.
+
+Usage:
+    ring = ResultRing.create("deepgram-live", capacity=65536)
+    monitor = DeepgramMonitor(live=ring)
+
+    reader = ResultRing.attach("deepgram-live")
+    recent = reader.records(since=300)          # last five minutes
+    python greenfield/live_results.py deepgram-live --minutes 5
+"""
+
+import sys
+import json
+import math
+import time
+import struct
+import argparse
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+# Allow running as a script (python greenfield/live_results.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from greenfield.streaming import percentile
+
+MAGIC = b"DGLIVE01"
+HEADER = struct.Struct("<8sQQQQ")  # magic, capacity, record size, written, model count
+HEADER_SIZE = 64
+WRITTEN_OFFSET = 24
+MODEL_COUNT_OFFSET = 32
+
+MAX_MODELS = 256
+MODEL_NAME_BYTES = 32
+MODELS_SIZE = MAX_MODELS * MODEL_NAME_BYTES
+
+SEQ = struct.Struct("<Q")
+RECORD = struct.Struct("<QddddHHB3x")  # seq, timestamp, latency, wer, cost, model id, status, ok
+BODY = struct.Struct("<ddddHHB")
+BODY_OFFSET = SEQ.size
+
+NAN = float("nan")
+
+
+class LiveResult(NamedTuple):
+    """One decoded result record."""
+
+    timestamp: float
+    model: str
+    latency: Optional[float]
+    wer: Optional[float]
+    cost: Optional[float]
+    status: Optional[int]
+    ok: bool
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+class ResultRing:
+    """Fixed-capacity ring of result records in named shared memory."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        """Use ResultRing.create (writer) or ResultRing.attach (readers)."""
+        self.shm = shm
+        self.owner = owner
+        self.buf = shm.buf
+        magic, self.capacity, record_size, _, _ = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or record_size != RECORD.size:
+            raise ValueError(f"Shared memory segment {shm.name!r} is not a result ring")
+        self._models: List[str] = []
+        self._model_ids: Dict[str, int] = {}
+
+    @classmethod
+    def create(cls, name: Optional[str] = None, capacity: int = 65536) -> "ResultRing":
+        """
+        Create a ring for the (single) writer.
+
+        Args:
+            name: Shared memory name readers attach to (default: a random one)
+            capacity: Records kept before the oldest are overwritten
+
+        Returns:
+            The ring; closing it also removes the segment
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        shm = shared_memory.SharedMemory(name, create=True,
+                                         size=HEADER_SIZE + MODELS_SIZE + capacity * RECORD.size)
+        HEADER.pack_into(shm.buf, 0, MAGIC, capacity, RECORD.size, 0, 0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "ResultRing":
+        """Attach to an existing ring to read it."""
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name, track=False)
+        else:
+            from multiprocessing import resource_tracker
+
+            shm = shared_memory.SharedMemory(name)
+            # Readers must not remove the writer's segment when they exit
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def written(self) -> int:
+        """Records written since the ring was created."""
+        return SEQ.unpack_from(self.buf, WRITTEN_OFFSET)[0]
+
+    def _slot(self, n: int) -> int:
+        return HEADER_SIZE + MODELS_SIZE + (n % self.capacity) * RECORD.size
+
+    def _model_id(self, model: str) -> int:
+        model_id = self._model_ids.get(model)
+        if model_id is None:
+            count = len(self._models)
+            if count >= MAX_MODELS:
+                raise ValueError(f"Result ring holds at most {MAX_MODELS} model names")
+            encoded = model.encode("utf-8")[:MODEL_NAME_BYTES]
+            offset = HEADER_SIZE + count * MODEL_NAME_BYTES
+            self.buf[offset:offset + len(encoded)] = encoded
+            SEQ.pack_into(self.buf, MODEL_COUNT_OFFSET, count + 1)  # publish after the name is in place
+            self._models.append(model)
+            self._model_ids[model] = model_id = count
+        return model_id
+
+    def _model_name(self, model_id: int) -> str:
+        while len(self._models) <= model_id:
+            offset = HEADER_SIZE + len(self._models) * MODEL_NAME_BYTES
+            name = bytes(self.buf[offset:offset + MODEL_NAME_BYTES]).rstrip(b"\0")
+            self._models.append(name.decode("utf-8", "replace"))
+        return self._models[model_id]
+
+    def write(self, model: str, latency: Optional[float], wer: Optional[float] = None,
+              cost: Optional[float] = None, status: Optional[int] = None, ok: bool = True,
+              timestamp: Optional[float] = None):
+        """
+        Append one record, overwriting the oldest once the ring is full.
+
+        Only one process (and one thread) may write to a ring.
+
+        Args:
+            model: Model name (interned into the ring's model table)
+            latency: Request latency in seconds
+            wer: Word error rate, if scored
+            cost: Request cost
+            status: HTTP status code (None if no response was received)
+            ok: Whether the request succeeded
+            timestamp: Unix time (default: now)
+        """
+        if not self.owner:
+            raise ValueError("Only the ring's creator may write to it")
+        model_id = self._model_id(model)
+        n = self.written
+        offset = self._slot(n)
+        SEQ.pack_into(self.buf, offset, 2 * n + 1)
+        BODY.pack_into(
+            self.buf, offset + BODY_OFFSET,
+            time.time() if timestamp is None else timestamp,
+            NAN if latency is None else latency,
+            NAN if wer is None else wer,
+            NAN if cost is None else cost,
+            model_id, status or 0, ok,
+        )
+        SEQ.pack_into(self.buf, offset, 2 * n + 2)
+        SEQ.pack_into(self.buf, WRITTEN_OFFSET, n + 1)
+
+    def _read(self, n: int) -> Optional[LiveResult]:
+        """Record ``n``, or None if it was overwritten before or while reading it."""
+        offset = self._slot(n)
+        expected = 2 * n + 2
+        if SEQ.unpack_from(self.buf, offset)[0] != expected:
+            return None
+        timestamp, latency, wer, cost, model_id, status, ok = BODY.unpack_from(self.buf, offset + BODY_OFFSET)
+        if SEQ.unpack_from(self.buf, offset)[0] != expected:
+            return None
+        return LiveResult(timestamp, self._model_name(model_id), _optional(latency), _optional(wer),
+                          _optional(cost), status or None, bool(ok))
+
+    def records(self, last: Optional[int] = None, since: Optional[float] = None) -> List[LiveResult]:
+        """
+        Read the newest records, oldest first.
+
+        Args:
+            last: At most this many records
+            since: Only records from the last ``since`` seconds
+
+        Returns:
+            Decoded records; any overwritten while being read are left out
+        """
+        written = self.written
+        oldest = max(0, written - self.capacity)
+        if last is not None:
+            oldest = max(oldest, written - last)
+        cutoff = time.time() - since if since is not None else None
+
+        # Walk back from the newest record so a time window costs only what it returns
+        records = []
+        for n in range(written - 1, oldest - 1, -1):
+            record = self._read(n)
+            if record is None:
+                break  # lapped by the writer; every older record is overwritten too
+            if cutoff is not None and record.timestamp < cutoff:
+                break
+            records.append(record)
+        records.reverse()
+        return records
+
+    def close(self):
+        """Detach; the creator also removes the segment (attached readers keep their mapping)."""
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+            self.owner = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def summarize(records: List[LiveResult]) -> List[Dict[str, Any]]:
+    """Per-model request count, error rate, latency percentiles, mean WER and cost."""
+    groups: Dict[str, List[LiveResult]] = {}
+    for record in records:
+        groups.setdefault(record.model, []).append(record)
+
+    summary = []
+    for model, group in sorted(groups.items()):
+        latencies = [r.latency for r in group if r.ok and r.latency is not None]
+        wers = [r.wer for r in group if r.wer is not None]
+        summary.append({
+            "model": model,
+            "requests": len(group),
+            "error_rate": sum(not r.ok for r in group) / len(group),
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "wer_mean": sum(wers) / len(wers) if wers else None,
+            "cost_total": sum(r.cost or 0.0 for r in group),
+        })
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize recent results from a live result ring.")
+    parser.add_argument("name", help="shared memory name of the ring")
+    parser.add_argument("--minutes", type=float, default=5.0, help="window to summarize (default: 5)")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    ring = ResultRing.attach(args.name)
+    try:
+        summary = summarize(ring.records(since=args.minutes * 60))
+    finally:
+        ring.close()
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    if not summary:
+        print(f"No results in the last {args.minutes:g} minutes")
+    def fmt(value):
+        return f"{value:.3f}" if value is not None else "-"
+
+    for row in summary:
+        print(f"{row['model']}: {row['requests']} requests, {row['error_rate']:.1%} errors, "
+              f"p50 {fmt(row['latency_p50'])}s, p95 {fmt(row['latency_p95'])}s, "
+              f"WER {fmt(row['wer_mean'])}, cost ${row['cost_total']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
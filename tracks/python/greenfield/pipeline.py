@@ -0,0 +1,210 @@
+"""
+Bounded-memory staged pipelines on asyncio.
+
+Items flow from a source through named stages connected by bounded
+queues. When a stage falls behind, its input queue fills and upstream
+``put`` calls wait (back-pressure), so memory is bounded by queue sizes
+and worker counts rather than by the number of items.
+
+Each stage runs its function as a coroutine on the event loop, inline
+(cheap sync functions), on a thread, or in a shared process pool for
+CPU-bound work. A stage returning None drops the item. The last stage is
+the sink; its return values are discarded.
+
+Usage:
+    pipeline = (Pipeline(queue_size=64)
+                .add_stage("transcribe", transcribe, workers=8)
+                .add_stage("score", score, workers=2, mode="process")
+                .add_stage("sink", write))
+    metrics = await pipeline.run(items)
+"""
+
+import time
+import asyncio
+import inspect
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, List, Optional, Union
+
+MODES = ("async", "inline", "thread", "process")
+
+_DONE = object()  # end-of-stream marker, one per downstream worker
+
+
+@dataclass
+class StageMetrics:
+    """Throughput and input-queue depth of one stage."""
+
+    processed: int = 0
+    dropped: int = 0
+    busy_seconds: float = 0.0
+    depth: int = 0
+    depth_max: int = 0
+    depth_samples: int = 0
+    depth_total: int = 0
+
+    def sample(self, depth: int):
+        self.depth = depth
+        self.depth_max = max(self.depth_max, depth)
+        self.depth_samples += 1
+        self.depth_total += depth
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "busy_seconds": self.busy_seconds,
+            "queue_depth": self.depth,
+            "queue_depth_max": self.depth_max,
+            "queue_depth_mean": self.depth_total / self.depth_samples if self.depth_samples else 0.0,
+        }
+
+
+@dataclass
+class Stage:
+    """One named processing step."""
+
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+    mode: str = "inline"
+    metrics: StageMetrics = field(default_factory=StageMetrics)
+
+
+class Pipeline:
+    """Stages connected by bounded asyncio queues."""
+
+    def __init__(self, queue_size: int = 64, sample_interval: float = 0.1,
+                 process_workers: Optional[int] = None):
+        """
+        Args:
+            queue_size: Capacity of each stage's input queue
+            sample_interval: Seconds between queue-depth samples
+            process_workers: Size of the process pool for "process" stages
+                (default: CPU count)
+        """
+        self.queue_size = queue_size
+        self.sample_interval = sample_interval
+        self.process_workers = process_workers
+        self.stages: List[Stage] = []
+        self.elapsed = 0.0
+
+    def add_stage(self, name: str, func: Callable[[Any], Any], workers: int = 1,
+                  mode: Optional[str] = None) -> "Pipeline":
+        """
+        Append a stage.
+
+        Args:
+            name: Stage name used in metrics
+            func: Called with each item; returns the item for the next stage (None drops it)
+            workers: Concurrent workers pulling from the stage's queue
+            mode: "async", "inline", "thread" or "process" (default: async for
+                coroutine functions, else inline). Process stages need a
+                picklable (module-level) function and picklable items.
+
+        Returns:
+            The pipeline, for chaining
+        """
+        mode = mode or ("async" if inspect.iscoroutinefunction(func) else "inline")
+        if mode not in MODES:
+            raise ValueError(f"Unknown stage mode {mode!r}; expected one of {', '.join(MODES)}")
+        if any(stage.name == name for stage in self.stages):
+            raise ValueError(f"Stage {name!r} already exists")
+        self.stages.append(Stage(name, func, max(workers, 1), mode))
+        return self
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage metrics; safe to call while the pipeline runs."""
+        return {stage.name: stage.metrics.snapshot() for stage in self.stages}
+
+    async def run(self, source: Union[Iterable[Any], AsyncIterable[Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Push every source item through the stages and wait for the sink to finish.
+
+        The source is consumed lazily, only as fast as the first queue drains.
+        An exception in any stage cancels the pipeline and is re-raised.
+
+        Returns:
+            Per-stage metrics (see metrics())
+        """
+        if not self.stages:
+            raise ValueError("Pipeline has no stages")
+
+        loop = asyncio.get_running_loop()
+        queues = [asyncio.Queue(self.queue_size) for _ in self.stages]
+        pool = None
+        if any(stage.mode == "process" for stage in self.stages):
+            pool = ProcessPoolExecutor(self.process_workers)
+
+        async def put(index: int, item: Any):
+            await queues[index].put(item)
+            metrics = self.stages[index].metrics
+            metrics.depth_max = max(metrics.depth_max, queues[index].qsize())
+
+        async def finish(index: int):
+            for _ in range(self.stages[index].workers):
+                await queues[index].put(_DONE)
+
+        async def feed():
+            if hasattr(source, "__aiter__"):
+                async for item in source:
+                    await put(0, item)
+            else:
+                for item in source:
+                    await put(0, item)
+            await finish(0)
+
+        async def call(stage: Stage, item: Any) -> Any:
+            if stage.mode == "async":
+                return await stage.func(item)
+            if stage.mode == "thread":
+                return await asyncio.to_thread(stage.func, item)
+            if stage.mode == "process":
+                return await loop.run_in_executor(pool, stage.func, item)
+            return stage.func(item)
+
+        async def work(index: int):
+            stage = self.stages[index]
+            last = index == len(self.stages) - 1
+            while True:
+                item = await queues[index].get()
+                if item is _DONE:
+                    return
+                started = time.perf_counter()
+                result = await call(stage, item)
+                stage.metrics.busy_seconds += time.perf_counter() - started
+                stage.metrics.processed += 1
+                if result is None:
+                    stage.metrics.dropped += 1
+                elif not last:
+                    await put(index + 1, result)
+
+        async def run_stage(index: int):
+            await asyncio.gather(*(work(index) for _ in range(self.stages[index].workers)))
+            if index + 1 < len(self.stages):
+                await finish(index + 1)
+
+        async def sample():
+            while True:
+                for stage, queue in zip(self.stages, queues):
+                    stage.metrics.sample(queue.qsize())
+                await asyncio.sleep(self.sample_interval)
+
+        started = time.perf_counter()
+        sampler = asyncio.create_task(sample())
+        tasks = [asyncio.create_task(feed())]
+        tasks += [asyncio.create_task(run_stage(index)) for index in range(len(self.stages))]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            sampler.cancel()
+            await asyncio.gather(sampler, return_exceptions=True)
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            self.elapsed = time.perf_counter() - started
+        return self.metrics()
@@ -0,0 +1,130 @@
+"""
+Deepgram pricing tables and cost calculation.
+
+Rates are USD per minute of audio, keyed by (model, mode, tier), plus
+per-minute add-ons for billable features. Costs can be computed for a
+single request or, via a vectorized join against the rate table, for a
+whole results DataFrame at once.
+
+List prices change; update RATES/FEATURE_RATES from https://deepgram.com/pricing.
+"""
+
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+DEFAULT_TIER = "payg"
+
+# (model, mode, tier) -> USD per audio minute
+RATES: Dict[Tuple[str, str, str], float] = {
+    ("nova-3", "prerecorded", "payg"): 0.0043,
+    ("nova-3", "prerecorded", "growth"): 0.0036,
+    ("nova-3", "streaming", "payg"): 0.0077,
+    ("nova-3", "streaming", "growth"): 0.0065,
+    ("nova-2", "prerecorded", "payg"): 0.0043,
+    ("nova-2", "prerecorded", "growth"): 0.0036,
+    ("nova-2", "streaming", "payg"): 0.0058,
+    ("nova-2", "streaming", "growth"): 0.0047,
+    ("enhanced", "prerecorded", "payg"): 0.0145,
+    ("enhanced", "prerecorded", "growth"): 0.0115,
+    ("enhanced", "streaming", "payg"): 0.0165,
+    ("enhanced", "streaming", "growth"): 0.0136,
+    ("base", "prerecorded", "payg"): 0.0125,
+    ("base", "prerecorded", "growth"): 0.0105,
+    ("base", "streaming", "payg"): 0.0145,
+    ("base", "streaming", "growth"): 0.0115,
+}
+
+# (feature, tier) -> USD per audio minute on top of the model rate
+FEATURE_RATES: Dict[Tuple[str, str], float] = {
+    ("diarize", "payg"): 0.0020,
+    ("diarize", "growth"): 0.0017,
+    ("redact", "payg"): 0.0020,
+    ("redact", "growth"): 0.0017,
+}
+
+
+class PricingTable:
+    """Look up per-minute rates and price requests."""
+
+    def __init__(self, rates: Optional[Dict[Tuple[str, str, str], float]] = None,
+                 feature_rates: Optional[Dict[Tuple[str, str], float]] = None):
+        self.rates = dict(RATES if rates is None else rates)
+        self.feature_rates = dict(FEATURE_RATES if feature_rates is None else feature_rates)
+        self.features = sorted({feature for feature, _ in self.feature_rates})
+
+    def rate(self, model: str, mode: str = "prerecorded", tier: str = DEFAULT_TIER,
+             features: Iterable[str] = ()) -> Optional[float]:
+        """USD per audio minute, or None if the model/mode/tier is not priced."""
+        base = self.rates.get((model, mode, tier))
+        if base is None:
+            return None
+        return base + sum(self.feature_rates.get((feature, tier), 0.0) for feature in features)
+
+    def price(self, duration: Optional[float], model: str, mode: str = "prerecorded",
+              tier: str = DEFAULT_TIER, features: Iterable[str] = ()) -> Optional[float]:
+        """
+        Cost of one request.
+
+        Args:
+            duration: Audio duration in seconds
+            model: Deepgram model
+            mode: "prerecorded" or "streaming"
+            tier: Pricing tier ("payg", "growth")
+            features: Billable features enabled on the request
+
+        Returns:
+            Cost in USD, or None if duration is unknown or the model is not priced
+        """
+        rate = self.rate(model, mode, tier, features)
+        if duration is None or rate is None:
+            return None
+        return duration / 60.0 * rate
+
+    def price_frame(self, df: Any, tier: str = DEFAULT_TIER, duration: str = "duration") -> Any:
+        """
+        Price every row of a results DataFrame in one vectorized pass.
+
+        Uses the ``model`` column, plus ``mode``/``tier`` columns when present
+        (defaulting to prerecorded and ``tier``), and adds feature surcharges
+        for any boolean feature columns (``diarize``, ``redact``). Unpriced
+        models and rows without a duration get NaN.
+
+        Returns:
+            Series of USD costs aligned with ``df.index``
+        """
+        import numpy as np
+        import pandas as pd
+
+        # Join on factorized keys: each key column becomes integer codes, the
+        # rate table becomes a small dense (model x mode x tier) cube, and the
+        # per-row lookup is a single fancy-indexing operation.
+        codes, labels = [], []
+        for column, default in (("model", None), ("mode", "prerecorded"), ("tier", tier)):
+            if column in df:
+                values = df[column] if default is None else df[column].fillna(default)
+                column_codes, uniques = pd.factorize(values)
+            else:
+                column_codes, uniques = np.zeros(len(df), dtype=np.intp), [default]
+            codes.append(column_codes)
+            labels.append(list(uniques))
+
+        # One extra NaN slot per axis: missing values factorize to -1 and land there
+        cube = np.full([len(values) + 1 for values in labels], np.nan)
+        for i, model in enumerate(labels[0]):
+            for j, mode in enumerate(labels[1]):
+                for k, row_tier in enumerate(labels[2]):
+                    cube[i, j, k] = self.rates.get((model, mode, row_tier), np.nan)
+        rate = cube[tuple(codes)]
+
+        for feature in self.features:
+            if feature not in df:
+                continue
+            surcharges = [self.feature_rates.get((feature, row_tier), 0.0) for row_tier in labels[2]]
+            surcharge = np.append(surcharges, 0.0)[codes[2]]
+            enabled = df[feature].fillna(False).astype(bool).to_numpy()
+            rate = rate + np.where(enabled, surcharge, 0.0)
+
+        seconds = pd.to_numeric(df[duration], errors="coerce").to_numpy(dtype=float)
+        return pd.Series(seconds / 60.0 * rate, index=df.index, name="cost")
+
+
+DEFAULT_PRICING = PricingTable()
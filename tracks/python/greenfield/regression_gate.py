@@ -0,0 +1,85 @@
+"""
+WER regression gate over a ground-truth corpus.
+
+Each sample's observed WER is compared with its ``expected_wer`` plus a
+per-sample tolerance, and each ``difficulty`` bucket's mean observed WER
+with its mean expected WER plus a bucket tolerance. Samples that could
+not be transcribed count as failures. The gate passes when no bucket
+regressed and failing samples stay within ``max_failures``.
+"""
+
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+DEFAULT_SAMPLE_TOLERANCE = 0.05  # absolute WER above a sample's expected_wer
+DEFAULT_BUCKET_TOLERANCE = 0.02  # absolute mean WER above a bucket's expected mean
+
+
+def evaluate_gate(samples: Iterable[Dict[str, Any]], observed: Mapping[str, Optional[float]],
+                  sample_tolerance: float = DEFAULT_SAMPLE_TOLERANCE,
+                  bucket_tolerance: float = DEFAULT_BUCKET_TOLERANCE,
+                  max_failures: int = 0) -> Dict[str, Any]:
+    """
+    Compare observed WER with expectations.
+
+    Args:
+        samples: ground_truth.json-style entries with id, expected_wer and difficulty
+        observed: Sample id -> observed WER (None if the sample failed to transcribe)
+        sample_tolerance: Allowed excess over a sample's expected_wer
+        bucket_tolerance: Allowed excess of a difficulty bucket's mean WER
+        max_failures: Failing samples (regressed or errored) allowed before the gate fails
+
+    Returns:
+        Dict with ``passed``, per-sample rows, per-bucket rows and failure count.
+        Sample status is pass, regressed, error, or unchecked (no expected_wer).
+    """
+    rows, buckets = [], {}
+    for sample in samples:
+        expected, wer = sample.get("expected_wer"), observed.get(sample["id"])
+        if wer is None:
+            status = "error"
+        elif expected is None:
+            status = "unchecked"
+        else:
+            status = "regressed" if wer > expected + sample_tolerance else "pass"
+        rows.append({
+            "id": sample["id"],
+            "difficulty": sample.get("difficulty", "unknown"),
+            "expected_wer": expected,
+            "wer": wer,
+            "delta": wer - expected if wer is not None and expected is not None else None,
+            "status": status,
+        })
+
+        bucket = buckets.setdefault(rows[-1]["difficulty"], {"samples": 0, "errors": 0, "scored": 0,
+                                                             "expected_sum": 0.0, "wer_sum": 0.0})
+        bucket["samples"] += 1
+        bucket["errors"] += status == "error"
+        if status in ("pass", "regressed"):
+            bucket["scored"] += 1
+            bucket["expected_sum"] += expected
+            bucket["wer_sum"] += wer
+
+    bucket_rows = []
+    for difficulty, bucket in sorted(buckets.items()):
+        scored = bucket["scored"]
+        expected_mean = bucket["expected_sum"] / scored if scored else None
+        wer_mean = bucket["wer_sum"] / scored if scored else None
+        regressed = scored > 0 and wer_mean > expected_mean + bucket_tolerance
+        bucket_rows.append({
+            "difficulty": difficulty,
+            "samples": bucket["samples"],
+            "errors": bucket["errors"],
+            "expected_wer_mean": expected_mean,
+            "wer_mean": wer_mean,
+            "delta": wer_mean - expected_mean if scored else None,
+            "status": "regressed" if regressed else "pass" if scored else "unchecked",
+        })
+
+    failures = sum(row["status"] in ("regressed", "error") for row in rows)
+    return {
+        "passed": failures <= max_failures and all(row["status"] != "regressed" for row in bucket_rows),
+        "failures": failures,
+        "samples": rows,
+        "buckets": bucket_rows,
+        "tolerances": {"sample": sample_tolerance, "bucket": bucket_tolerance, "max_failures": max_failures},
+    }
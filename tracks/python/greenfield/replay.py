@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Record and replay Deepgram API traffic.
+
+A TrafficRecorder captures each request (endpoint, method, path, query
+parameters, JSON body), the raw response body, status and observed
+latency to a gzip-compressed JSON Lines log. ReplayServer serves a log
+back on a local port, matching requests by method, path, parameters and
+body and waiting the recorded latency (optionally scaled) before
+answering, so whole benchmark runs can be repeated offline with the
+API held constant.
+
+Usage:
+    monitor = DeepgramMonitor(recorder=TrafficRecorder("traffic.jsonl.gz"))
+    python greenfield/replay.py traffic.jsonl.gz --port 8080 --time-scale 0.5
+    DEEPGRAM_API_URL=http://127.0.0.1:8080 python greenfield/deepgram_monitor.py
+"""
+
+import json
+import gzip
+import asyncio
+import argparse
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def request_key(method: str, path: str, params: Dict[str, Any], body: Any) -> Tuple[str, str, str, str]:
+    """Match key for a request: method, path, sorted params and canonical JSON body."""
+    return (method.upper(), path, json.dumps(params, sort_keys=True), json.dumps(body, sort_keys=True))
+
+
+class TrafficRecorder:
+    """Append-only, gzip-compressed JSON Lines log of API exchanges."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Log file; new records are appended (as a new gzip member)
+        """
+        self.path = path
+        self.count = 0
+        self._file = gzip.open(path, "at", encoding="utf-8")
+
+    def record(self, method: str, path: str, params: Dict[str, Any], body: Any,
+               status: Optional[int], response: Optional[str], latency: float,
+               endpoint: Optional[str] = None, error: Optional[str] = None):
+        """
+        Append one exchange.
+
+        Args:
+            method: HTTP method
+            path: Request path, e.g. "/v1/listen"
+            params: Query parameters
+            body: JSON request body
+            status: HTTP status (None if no response was received)
+            response: Raw response body text
+            latency: Seconds from sending the request to reading the response
+            endpoint: Registered endpoint name
+            error: Transport error, when there was no response
+        """
+        self._file.write(json.dumps({
+            "timestamp": datetime.now().isoformat(),
+            "endpoint": endpoint,
+            "method": method,
+            "path": path,
+            "params": params,
+            "body": body,
+            "status": status,
+            "response": response,
+            "latency": latency,
+            "error": error,
+        }, separators=(",", ":")) + "\n")
+        self.count += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_traffic(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield recorded exchanges in order."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class ReplayServer:
+    """Local HTTP stand-in that answers requests from a traffic log."""
+
+    def __init__(self, log_path: str, time_scale: float = 1.0, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            log_path: Log written by TrafficRecorder
+            time_scale: Multiplier on recorded latencies (1.0 original, 0 immediate)
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+        """
+        self.time_scale = time_scale
+        self.host = host
+        self.port = port
+        # Repeated identical requests are answered with their recordings in order, cycling
+        self.exchanges: Dict[Tuple[str, str, str, str], List[Dict[str, Any]]] = {}
+        for exchange in read_traffic(log_path):
+            key = request_key(exchange["method"], exchange["path"], exchange["params"], exchange["body"])
+            self.exchanges.setdefault(key, []).append(exchange)
+        self._cursor: Dict[Tuple[str, str, str, str], int] = {}
+        self.served = 0
+        self.misses = 0
+        self.url = None
+        self._runner = None
+
+    async def __aenter__(self):
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        self.url = f"http://{self.host}:{self.port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._runner.cleanup()
+
+    async def _handle(self, request):
+        from aiohttp import web
+
+        body = await request.json() if request.can_read_body else None
+        key = request_key(request.method, request.path, dict(request.query), body)
+        recorded = self.exchanges.get(key)
+        if not recorded:
+            self.misses += 1
+            return web.json_response({"err_code": "REPLAY_MISS", "err_msg": "No recorded response"}, status=404)
+
+        index = self._cursor.get(key, 0)
+        self._cursor[key] = (index + 1) % len(recorded)
+        exchange = recorded[index]
+        if self.time_scale:
+            await asyncio.sleep(exchange["latency"] * self.time_scale)
+        self.served += 1
+
+        if exchange["status"] is None:
+            # The original request failed in transport; surface it as a gateway error
+            return web.json_response({"err_code": "REPLAY_TRANSPORT_ERROR", "err_msg": exchange["error"]},
+                                     status=502)
+        return web.Response(text=exchange["response"] or "", status=exchange["status"],
+                            content_type="application/json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve recorded Deepgram traffic on a local port.")
+    parser.add_argument("log", help="traffic log written in record mode (.jsonl.gz)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="multiplier on recorded latencies; 0 answers immediately (default: 1.0)")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        async with ReplayServer(args.log, args.time_scale, args.host, args.port) as server:
+            total = sum(len(exchanges) for exchanges in server.exchanges.values())
+            print(f"Replaying {total} exchanges on {server.url} (time scale {args.time_scale}; Ctrl+C to stop)")
+            await asyncio.Future()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
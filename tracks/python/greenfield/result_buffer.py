@@ -0,0 +1,210 @@
+"""
+Compact storage for large numbers of benchmark results.
+
+ResultRecord is a slotted result object (no per-instance ``__dict__``).
+ResultBuffer stores results column by column: rows are staged in small
+chunks and flushed into NumPy arrays that grow by doubling. String columns
+are interned into integer codes with one copy of each distinct value, and
+timestamps are stored as int64 microseconds. Appending is amortized O(1),
+unlike concatenating a one-row DataFrame per result, and to_frame() builds
+the DataFrame once. Numeric columns are passed to pandas as views of the
+buffer's arrays, without copying.
+
+Usage:
+    buffer = ResultBuffer()
+    buffer.append(ResultRecord(url=url, model="nova-3", latency=0.42, success=True))
+    df = buffer.to_frame()
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Column kinds: float (None -> NaN), int, bool, str (interned codes; None allowed),
+# time (Unix seconds -> datetime64[us], UTC; None -> NaT)
+RESULT_COLUMNS = {
+    "id": "str",
+    "url": "str",
+    "model": "str",
+    "transcript": "str",
+    "duration": "float",
+    "latency": "float",
+    "cost": "float",
+    "wer": "float",
+    "timestamp": "time",
+    "response_code": "int",
+    "retry_count": "int",
+    "success": "bool",
+    "error": "str",
+}
+
+_DTYPES = {"float": np.float64, "int": np.int64, "bool": np.bool_, "str": np.int32, "time": np.int64}
+_NAT = np.iinfo(np.int64).min  # NaT in datetime64 terms
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class ResultRecord:
+    """One benchmark result, with one slot per RESULT_COLUMNS entry."""
+
+    __slots__ = tuple(RESULT_COLUMNS)
+
+    def __init__(self, id: Optional[str] = None, url: Optional[str] = None, model: Optional[str] = None,
+                 transcript: Optional[str] = None, duration: Optional[float] = None,
+                 latency: Optional[float] = None, cost: Optional[float] = None, wer: Optional[float] = None,
+                 timestamp: Optional[float] = None, response_code: int = 0, retry_count: int = 0,
+                 success: bool = False, error: Optional[str] = None):
+        self.id = id
+        self.url = url
+        self.model = model
+        self.transcript = transcript
+        self.duration = duration
+        self.latency = latency
+        self.cost = cost
+        self.wer = wer
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.response_code = response_code
+        self.retry_count = retry_count
+        self.success = success
+        self.error = error
+
+    def __getitem__(self, key: str) -> Any:
+        # Read access like the result dicts this replaces
+        return getattr(self, key)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def utc_timestamp(self) -> datetime:
+        """The timestamp as a tz-aware UTC datetime, rounded to microseconds as the buffer stores it."""
+        return _EPOCH + timedelta(microseconds=round(self.timestamp * 1e6))
+
+    def __repr__(self) -> str:
+        return f"ResultRecord({', '.join(f'{k}={v!r}' for k, v in self.as_dict().items() if v is not None)})"
+
+
+class ResultBuffer:
+    """Growable columnar buffer of results."""
+
+    def __init__(self, columns: Optional[Dict[str, str]] = None, chunk_size: int = 8192,
+                 capacity: int = 1024):
+        """
+        Args:
+            columns: Column name -> kind (default: RESULT_COLUMNS); appended
+                objects must have an attribute per column
+            chunk_size: Rows staged before they are flushed into the arrays
+            capacity: Initial rows allocated per column
+        """
+        self.columns = dict(columns or RESULT_COLUMNS)
+        unknown = set(self.columns.values()) - set(_DTYPES)
+        if unknown:
+            raise ValueError(f"Unknown column kinds: {', '.join(sorted(unknown))}")
+        self.chunk_size = chunk_size
+        self._get = attrgetter(*self.columns)
+        self._rows: List[tuple] = []
+        self._size = 0
+        self._arrays = {name: np.empty(capacity, _DTYPES[kind]) for name, kind in self.columns.items()}
+        # Distinct values of each string column -> code, in first-seen order (None is -1)
+        self._strings: Dict[str, Dict[Optional[str], int]] = {
+            name: {None: -1} for name, kind in self.columns.items() if kind == "str"
+        }
+
+    def __len__(self) -> int:
+        return self._size + len(self._rows)
+
+    def append(self, record: Any):
+        """Add one result (a ResultRecord or any object with the column attributes)."""
+        row = self._get(record)
+        self._rows.append(row if isinstance(row, tuple) else (row,))
+        if len(self._rows) >= self.chunk_size:
+            self._flush()
+
+    def extend(self, records: Iterable[Any]):
+        for record in records:
+            self.append(record)
+
+    def _encode(self, name: str, values: tuple) -> np.ndarray:
+        codes = self._strings[name]
+        found = list(map(codes.get, values))
+        if None in found:  # values not seen before get the next codes
+            for i, value in enumerate(values):
+                if found[i] is None:
+                    found[i] = codes.setdefault(value, len(codes) - 1)
+        return np.array(found, np.int32)
+
+    def _categories(self, name: str) -> List[str]:
+        return list(self._strings[name])[1:]
+
+    def _flush(self):
+        if not self._rows:
+            return
+        start, count = self._size, len(self._rows)
+        needed = start + count
+        capacity = len(next(iter(self._arrays.values())))
+        if needed > capacity:
+            capacity = max(needed, capacity * 2)
+            for name, array in self._arrays.items():
+                grown = np.empty(capacity, array.dtype)
+                grown[:start] = array[:start]
+                self._arrays[name] = grown
+
+        for (name, kind), values in zip(self.columns.items(), zip(*self._rows)):
+            target = self._arrays[name][start:needed]
+            if kind == "str":
+                target[:] = self._encode(name, values)
+            elif kind == "time":
+                seconds = np.array(values, dtype=np.float64)
+                target[:] = np.where(np.isnan(seconds), _NAT, np.round(np.nan_to_num(seconds) * 1e6))
+            elif kind == "float":
+                target[:] = np.array(values, dtype=np.float64)  # None -> NaN
+            else:
+                target[:] = values
+        self._size = needed
+        self._rows = []
+
+    def column(self, name: str):
+        """One column as a NumPy array (a view of the buffer for numeric kinds)."""
+        self._flush()
+        kind, data = self.columns[name], self._arrays[name][:self._size]
+        if kind == "str":
+            # One trailing None so code -1 (missing) indexes it
+            values = np.array([*self._categories(name), None], dtype=object)
+            return values.take(data)
+        if kind == "time":
+            return data.view("datetime64[us]")  # UTC
+        return data
+
+    def to_frame(self, categorical: bool = False):
+        """
+        Build a DataFrame of every result.
+
+        Args:
+            categorical: Return string columns as pandas Categoricals over the
+                interned codes (no per-row objects) instead of object columns
+
+        Returns:
+            DataFrame with one column per buffer column, in order (time
+            columns as tz-aware UTC)
+        """
+        import pandas as pd
+
+        self._flush()
+        data = {}
+        for name, kind in self.columns.items():
+            if kind == "str" and categorical:
+                data[name] = pd.Categorical.from_codes(self._arrays[name][:self._size],
+                                                       categories=self._categories(name))
+            elif kind == "time":
+                data[name] = pd.DatetimeIndex(self.column(name)).tz_localize("UTC")
+            else:
+                data[name] = self.column(name)
+        return pd.DataFrame(data, copy=False)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held: column arrays plus distinct strings."""
+        self._flush()
+        strings = sum(len(value) for name in self._strings for value in self._categories(name))
+        return sum(array.nbytes for array in self._arrays.values()) + strings
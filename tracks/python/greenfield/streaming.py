@@ -0,0 +1,265 @@
+"""
+Live (websocket) streaming support for the Deepgram Observatory.
+
+Feeds audio frames to Deepgram's live endpoint at real-time (or accelerated)
+pace and measures how quickly transcripts come back:
+
+- time-to-first-transcript: first audio frame sent -> first non-empty result
+- interim latency: interim result received -> its audio end was sent
+- finalization lag: final result received -> its audio end was sent
+"""
+
+import json
+import math
+import time
+import wave
+import asyncio
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlencode
+
+@dataclass
+class AudioFormat:
+    """Raw PCM format of the frames being streamed."""
+
+    sample_rate: int = 16000
+    channels: int = 1
+    sample_width: int = 2  # bytes per sample (linear16)
+
+    @property
+    def bytes_per_second(self) -> int:
+        return self.sample_rate * self.channels * self.sample_width
+
+    @property
+    def encoding(self) -> str:
+        return "linear16" if self.sample_width == 2 else f"linear{self.sample_width * 8}"
+
+
+def read_wav_frames(path: Union[str, Path], frame_ms: int = 20) -> Tuple[AudioFormat, Iterator[bytes]]:
+    """
+    Open a WAV file and return its format plus an iterator of PCM frames.
+
+    Args:
+        path: WAV file to stream
+        frame_ms: Frame size in milliseconds of audio
+
+    Returns:
+        (format, frames) tuple; frames are read lazily from disk
+    """
+    wav = wave.open(str(path), "rb")
+    fmt = AudioFormat(
+        sample_rate=wav.getframerate(),
+        channels=wav.getnchannels(),
+        sample_width=wav.getsampwidth(),
+    )
+    samples_per_frame = max(1, wav.getframerate() * frame_ms // 1000)
+
+    def frames() -> Iterator[bytes]:
+        with wav:
+            while True:
+                chunk = wav.readframes(samples_per_frame)
+                if not chunk:
+                    break
+                yield chunk
+
+    return fmt, frames()
+
+
+async def _aiter_frames(frames: Union[Iterable[bytes], AsyncIterator[bytes]]) -> AsyncIterator[bytes]:
+    """Iterate sync or async frame sources uniformly."""
+    if hasattr(frames, "__aiter__"):
+        async for frame in frames:
+            yield frame
+    else:
+        for frame in frames:
+            yield frame
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile (no numpy needed for a handful of results)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class StreamMetrics:
+    """Timing bookkeeping for one streaming session."""
+
+    first_frame_at: Optional[float] = None
+    close_sent_at: Optional[float] = None
+    closed_at: Optional[float] = None
+    time_to_first_transcript: Optional[float] = None
+    interim_latencies: List[float] = field(default_factory=list)
+    final_latencies: List[float] = field(default_factory=list)
+    audio_seconds: float = 0.0
+    # Parallel arrays: audio end offset of each sent frame and when it went out
+    _sent_audio_end: List[float] = field(default_factory=list, repr=False)
+    _sent_at: List[float] = field(default_factory=list, repr=False)
+
+    def frame_sent(self, audio_end: float, sent_at: float):
+        """Record that audio up to ``audio_end`` seconds was sent at ``sent_at``."""
+        if self.first_frame_at is None:
+            self.first_frame_at = sent_at
+        self._sent_audio_end.append(audio_end)
+        self._sent_at.append(sent_at)
+        self.audio_seconds = audio_end
+
+    def sent_time_of(self, audio_offset: float) -> Optional[float]:
+        """Wall time at which the frame containing ``audio_offset`` was sent."""
+        if not self._sent_at:
+            return None
+        # Small tolerance: servers round start/duration to a few decimals
+        index = bisect_left(self._sent_audio_end, audio_offset - 1e-3)
+        return self._sent_at[min(index, len(self._sent_at) - 1)]
+
+    def result_received(self, message: Dict[str, Any], received_at: float) -> Optional[float]:
+        """
+        Record a ``Results`` message and return its latency in seconds.
+
+        Latency is measured from when the last audio the result covers was
+        sent, so it is independent of streaming pace.
+        """
+        transcript = _transcript_of(message)
+        if transcript and self.time_to_first_transcript is None and self.first_frame_at is not None:
+            self.time_to_first_transcript = received_at - self.first_frame_at
+
+        audio_end = float(message.get("start", 0.0)) + float(message.get("duration", 0.0))
+        sent_at = self.sent_time_of(audio_end)
+        if sent_at is None:
+            return None
+
+        latency = max(0.0, received_at - sent_at)
+        if message.get("is_final"):
+            self.final_latencies.append(latency)
+        else:
+            self.interim_latencies.append(latency)
+        return latency
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate metrics suitable for logging."""
+        finalization_lag = (
+            sum(self.final_latencies) / len(self.final_latencies) if self.final_latencies else None
+        )
+        drain_time = (
+            self.closed_at - self.close_sent_at
+            if self.closed_at is not None and self.close_sent_at is not None
+            else None
+        )
+        return {
+            "audio_seconds": self.audio_seconds,
+            "time_to_first_transcript": self.time_to_first_transcript,
+            "interim_count": len(self.interim_latencies),
+            "interim_latency_mean": (
+                sum(self.interim_latencies) / len(self.interim_latencies) if self.interim_latencies else None
+            ),
+            "interim_latency_p95": percentile(self.interim_latencies, 95),
+            "final_count": len(self.final_latencies),
+            "finalization_lag": finalization_lag,
+            "finalization_lag_p95": percentile(self.final_latencies, 95),
+            "drain_time": drain_time,
+        }
+
+
+def _transcript_of(message: Dict[str, Any]) -> str:
+    """Extract the top alternative's transcript from a live ``Results`` message."""
+    try:
+        return message["channel"]["alternatives"][0]["transcript"]
+    except (KeyError, IndexError, TypeError):
+        return ""
+
+
+async def stream_audio(
+    url: str,
+    frames: Union[Iterable[bytes], AsyncIterator[bytes]],
+    audio_format: AudioFormat,
+    api_key: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+    speed: float = 1.0,
+    drain_timeout: float = 10.0,
+) -> Dict[str, Any]:
+    """
+    Stream PCM frames over a live-transcription websocket and time the results.
+
+    Args:
+        url: Websocket endpoint, e.g. ``wss://api.deepgram.com/v1/listen``
+        frames: Sync or async iterable of raw PCM chunks
+        audio_format: Format of ``frames``
+        api_key: Deepgram API key (sent as a ``Token`` authorization header)
+        params: Extra query parameters (model, interim_results, ...)
+        speed: Pace multiplier; 1.0 is real time, 0 sends as fast as possible
+        drain_timeout: Seconds to wait for the server to close the stream
+            after ``CloseStream`` is sent
+
+    Returns:
+        Dict with ``transcript``, ``metrics`` (see ``StreamMetrics.summary``)
+        and the raw ``results`` list of (received_at, latency, message)
+
+    Raises:
+        asyncio.TimeoutError: The server did not close within ``drain_timeout``
+    """
+    from websockets.asyncio.client import connect
+
+    query = {
+        "encoding": audio_format.encoding,
+        "sample_rate": audio_format.sample_rate,
+        "channels": audio_format.channels,
+        "interim_results": "true",
+    }
+    query.update(params or {})
+    query_string = urlencode({
+        key: str(value).lower() if isinstance(value, bool) else value for key, value in query.items()
+    })
+    headers = {"Authorization": f"Token {api_key}"} if api_key else None
+
+    metrics = StreamMetrics()
+    results: List[Tuple[float, Optional[float], Dict[str, Any]]] = []
+    finals: List[str] = []
+
+    async with connect(f"{url}?{query_string}", additional_headers=headers) as ws:
+
+        async def send():
+            sent_bytes = 0
+            started = time.perf_counter()
+            async for frame in _aiter_frames(frames):
+                audio_start = sent_bytes / audio_format.bytes_per_second
+                if speed > 0:
+                    delay = started + audio_start / speed - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                await ws.send(frame)
+                sent_bytes += len(frame)
+                metrics.frame_sent(sent_bytes / audio_format.bytes_per_second, time.perf_counter())
+            await ws.send(json.dumps({"type": "CloseStream"}))
+            metrics.close_sent_at = time.perf_counter()
+
+        async def receive():
+            async for raw in ws:
+                received_at = time.perf_counter()
+                message = json.loads(raw)
+                if message.get("type") != "Results":
+                    continue
+                latency = metrics.result_received(message, received_at)
+                results.append((received_at, latency, message))
+                if message.get("is_final") and _transcript_of(message):
+                    finals.append(_transcript_of(message))
+            metrics.closed_at = time.perf_counter()
+
+        receiver = asyncio.create_task(receive())
+        try:
+            await send()
+            await asyncio.wait_for(receiver, drain_timeout)
+        finally:
+            if not receiver.done():
+                receiver.cancel()
+            await asyncio.gather(receiver, return_exceptions=True)
+
+    return {
+        "transcript": " ".join(finals),
+        "metrics": metrics.summary(),
+        "results": results,
+    }
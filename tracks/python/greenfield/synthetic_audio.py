@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Synthetic audio generator for edge-case and load testing without network audio.
+
+Generates WAV corpora (tones, chirps, noise, silence gaps, clipping, pure
+silence) at varied sample rates and durations. Every file is derived from
+its own seed, so a corpus is reproducible regardless of worker count or
+write order, and a manifest in the ground_truth.json format is written
+alongside the audio.
+
+Usage:
+    python greenfield/synthetic_audio.py test_data/audio/synthetic --count 10000 --seed 42
+"""
+
+import os
+import json
+import wave
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+KINDS = ("tone", "chirp", "noise", "silence_gaps", "clipping", "silence")
+SAMPLE_RATES = (8000, 16000, 22050, 44100, 48000)
+
+
+@dataclass
+class SyntheticSpec:
+    """Everything needed to regenerate one file."""
+
+    id: str
+    kind: str
+    sample_rate: int
+    duration: float
+    seed: int
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+def plan_corpus(count: int, seed: int = 0, kinds: Sequence[str] = KINDS,
+                sample_rates: Sequence[int] = SAMPLE_RATES,
+                duration_range: Tuple[float, float] = (0.5, 5.0)) -> List[SyntheticSpec]:
+    """
+    Choose kind, sample rate, duration and per-file seed for ``count`` files.
+
+    Returns:
+        Specs in id order; the same arguments always give the same plan
+    """
+    rng = np.random.default_rng(seed)
+    kind_choices = rng.choice(len(kinds), size=count)
+    rate_choices = rng.choice(len(sample_rates), size=count)
+    durations = np.round(rng.uniform(*duration_range, size=count), 3)
+    seeds = rng.integers(0, 2**32, size=count, dtype=np.uint64)
+
+    width = len(str(max(count - 1, 0)))
+    return [
+        SyntheticSpec(
+            id=f"synthetic_{i:0{width}d}",
+            kind=kinds[kind_choices[i]],
+            sample_rate=int(sample_rates[rate_choices[i]]),
+            duration=float(durations[i]),
+            seed=int(seeds[i]),
+        )
+        for i in range(count)
+    ]
+
+
+def synthesize(spec: SyntheticSpec) -> np.ndarray:
+    """
+    Render one spec to 16-bit PCM samples.
+
+    Also fills ``spec.params`` with the randomly chosen parameters (frequencies,
+    levels, gap lengths) so the manifest documents what is in each file.
+    """
+    rng = np.random.default_rng(spec.seed)
+    n = int(round(spec.duration * spec.sample_rate))
+    t = np.arange(n) / spec.sample_rate
+    nyquist = spec.sample_rate / 2
+
+    if spec.kind == "tone":
+        freqs = rng.uniform(100.0, min(4000.0, nyquist * 0.9), size=rng.integers(1, 4))
+        amplitude = rng.uniform(0.1, 0.8)
+        signal = np.sin(2 * np.pi * np.outer(freqs, t) + rng.uniform(0, 2 * np.pi, size=(len(freqs), 1))).sum(axis=0)
+        signal *= amplitude / len(freqs)
+        spec.params = {"frequencies": np.round(freqs, 1).tolist(), "amplitude": round(amplitude, 3)}
+
+    elif spec.kind == "chirp":
+        f0, f1 = 50.0, min(8000.0, nyquist * 0.9)
+        amplitude = rng.uniform(0.1, 0.8)
+        # Linear sweep: phase is the integral of the instantaneous frequency
+        phase = 2 * np.pi * (f0 * t + (f1 - f0) * t ** 2 / (2 * max(spec.duration, 1e-9)))
+        signal = amplitude * np.sin(phase)
+        spec.params = {"start_hz": f0, "end_hz": round(f1, 1), "amplitude": round(amplitude, 3)}
+
+    elif spec.kind == "noise":
+        level = rng.uniform(0.01, 0.5)
+        signal = rng.standard_normal(n) * level
+        spec.params = {"level": round(level, 3)}
+
+    elif spec.kind == "silence_gaps":
+        freq = rng.uniform(200.0, min(2000.0, nyquist * 0.9))
+        burst, gap = rng.uniform(0.1, 0.8), rng.uniform(0.2, 2.0)
+        # Bursts of tone alternating with silence, built as a periodic mask
+        position = np.mod(t, burst + gap)
+        signal = 0.5 * np.sin(2 * np.pi * freq * t) * (position < burst)
+        spec.params = {"frequency": round(freq, 1), "burst_seconds": round(burst, 3), "gap_seconds": round(gap, 3)}
+
+    elif spec.kind == "clipping":
+        freq = rng.uniform(100.0, min(1000.0, nyquist * 0.9))
+        gain = rng.uniform(2.0, 8.0)
+        signal = gain * np.sin(2 * np.pi * freq * t)
+        spec.params = {"frequency": round(freq, 1), "gain": round(gain, 2),
+                       "clipped_fraction": round(float(np.mean(np.abs(signal) >= 1.0)), 3)}
+
+    elif spec.kind == "silence":
+        signal = np.zeros(n)
+        spec.params = {}
+
+    else:
+        raise ValueError(f"Unknown synthetic audio kind {spec.kind!r}; expected one of {', '.join(KINDS)}")
+
+    return (np.clip(signal, -1.0, 1.0) * 32767).astype("<i2")
+
+
+def write_wav(path: Path, samples: np.ndarray, sample_rate: int):
+    """Write mono 16-bit PCM samples to a WAV file."""
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+
+
+def manifest_entry(spec: SyntheticSpec, path: Path, out_dir: Path) -> Dict[str, Any]:
+    """ground_truth.json-style entry; synthetic audio contains no speech."""
+    return {
+        "id": spec.id,
+        "audio_url": path.resolve().as_uri(),
+        "audio_path": str(path.relative_to(out_dir)),
+        "transcript": "",
+        "duration_seconds": spec.duration,
+        "difficulty": "synthetic",
+        "synthetic": asdict(spec),
+    }
+
+
+def generate_corpus(out_dir, count: int, seed: int = 0, workers: Optional[int] = None,
+                    **plan_options) -> List[Dict[str, Any]]:
+    """
+    Generate ``count`` WAV files plus ``manifest.json`` in ``out_dir``.
+
+    Files are synthesized and written on a thread pool (NumPy and file I/O
+    release the GIL for the heavy parts).
+
+    Args:
+        out_dir: Output directory (created if needed)
+        count: Number of files
+        seed: Corpus seed
+        workers: Writer threads (default: CPU count)
+        **plan_options: Passed to ``plan_corpus`` (kinds, sample_rates, duration_range)
+
+    Returns:
+        Manifest entries in id order
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    specs = plan_corpus(count, seed, **plan_options)
+
+    def render(spec: SyntheticSpec) -> Dict[str, Any]:
+        path = out_dir / f"{spec.id}.wav"
+        write_wav(path, synthesize(spec), spec.sample_rate)
+        return manifest_entry(spec, path, out_dir)
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        manifest = list(pool.map(render, specs, chunksize=64))
+
+    with open(out_dir / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic WAV corpus and manifest.")
+    parser.add_argument("out_dir", help="output directory")
+    parser.add_argument("--count", type=int, default=100, help="number of files (default: 100)")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed (default: 0)")
+    parser.add_argument("--workers", type=int, help="writer threads (default: CPU count)")
+    parser.add_argument("--kinds", type=lambda v: v.split(","), default=list(KINDS),
+                        help=f"comma-separated kinds (default: {','.join(KINDS)})")
+    parser.add_argument("--sample-rates", type=lambda v: [int(r) for r in v.split(",")],
+                        default=list(SAMPLE_RATES), help="comma-separated sample rates")
+    parser.add_argument("--min-duration", type=float, default=0.5, help="seconds (default: 0.5)")
+    parser.add_argument("--max-duration", type=float, default=5.0, help="seconds (default: 5.0)")
+    args = parser.parse_args(argv)
+
+    manifest = generate_corpus(
+        args.out_dir, args.count, args.seed, args.workers,
+        kinds=args.kinds, sample_rates=args.sample_rates,
+        duration_range=(args.min_duration, args.max_duration),
+    )
+    total = sum(entry["duration_seconds"] for entry in manifest)
+    print(f"Wrote {len(manifest)} files ({total / 3600:.2f} hours of audio) to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
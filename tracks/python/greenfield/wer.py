@@ -0,0 +1,152 @@
+"""
+Word Error Rate calculation.
+
+WER = (substitutions + deletions + insertions) / reference words, computed
+as the Levenshtein distance between normalized word sequences (the
+python-Levenshtein C implementation accepts lists of words).
+
+WerCache memoizes scores in SQLite by (metric, scorer version, reference
+hash, hypothesis hash), so re-scoring a growing result history only
+computes pairs it has not seen before.
+"""
+
+import re
+import sqlite3
+import hashlib
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# Bump whenever normalize() changes so cached scores are recomputed
+NORMALIZER_VERSION = 1
+
+_PUNCTUATION = re.compile(r"[^\w\s']|(?<!\w)'|'(?!\w)")
+
+
+def normalize(text: str) -> List[str]:
+    """
+    Normalize a transcript into words for scoring.
+
+    Lowercases, strips punctuation (keeping in-word apostrophes such as
+    "don't") and splits on whitespace.
+    """
+    return _PUNCTUATION.sub(" ", (text or "").lower()).split()
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Calculate Word Error Rate between reference and hypothesis.
+
+    Args:
+        reference: Ground truth transcript
+        hypothesis: Model-generated transcript
+
+    Returns:
+        WER as a fraction (0.0 = perfect; can exceed 1.0 with many insertions).
+        An empty reference scores 0.0 against an empty hypothesis and the
+        number of inserted words otherwise.
+    """
+    import Levenshtein
+
+    ref_words = normalize(reference)
+    hyp_words = normalize(hypothesis)
+    return Levenshtein.distance(ref_words, hyp_words) / max(len(ref_words), 1)
+
+
+def text_hash(text: str) -> str:
+    """Short stable hash of a transcript, used as a cache key."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class WerCache:
+    """Persistent memo of transcript scores."""
+
+    def __init__(self, db_path: str = ":memory:"):
+        """
+        Args:
+            db_path: SQLite database holding cached scores (created if needed)
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS wer_cache (
+                reference_hash TEXT NOT NULL,
+                hypothesis_hash TEXT NOT NULL,
+                version TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                value REAL NOT NULL,
+                PRIMARY KEY (reference_hash, hypothesis_hash, version, metric)
+            ) WITHOUT ROWID;
+
+            CREATE TEMP TABLE IF NOT EXISTS lookup_keys (
+                reference_hash TEXT NOT NULL,
+                hypothesis_hash TEXT NOT NULL,
+                PRIMARY KEY (reference_hash, hypothesis_hash)
+            ) WITHOUT ROWID;
+        """)
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, keys: List[Tuple[str, str]], version: str,
+                metrics: Sequence[str]) -> Dict[Tuple[str, str], List[Optional[float]]]:
+        # Stage the keys in a temp table so the lookup is one primary-key join,
+        # pivoted to one row per pair with a value (or NULL) per metric
+        self.conn.execute("DELETE FROM lookup_keys")
+        self.conn.executemany("INSERT INTO lookup_keys VALUES (?, ?)", keys)
+        pivot = ", ".join("MAX(CASE WHEN c.metric = ? THEN c.value END)" for _ in metrics)
+        rows = self.conn.execute(f"""
+            SELECT k.reference_hash, k.hypothesis_hash, {pivot}
+            FROM lookup_keys k JOIN wer_cache c
+              ON c.reference_hash = k.reference_hash AND c.hypothesis_hash = k.hypothesis_hash
+            WHERE c.version = ?
+            GROUP BY k.reference_hash, k.hypothesis_hash
+        """, (*metrics, version))
+        return {(row[0], row[1]): list(row[2:]) for row in rows}
+
+    def score_metrics(self, references: Sequence[str], hypotheses: Sequence[str],
+                      scorers: Dict[str, Callable[[str, str], float]],
+                      version: Union[int, str] = NORMALIZER_VERSION) -> Dict[str, List[float]]:
+        """
+        Score reference/hypothesis pairs with several metrics, computing only
+        (pair, metric) combinations not cached yet.
+
+        Args:
+            references: Ground truth transcripts
+            hypotheses: Model transcripts, aligned with references
+            scorers: Metric name -> function computing one score from (reference, hypothesis)
+            version: Scorer/normalizer version; bump it to invalidate old scores
+
+        Returns:
+            Metric name -> scores in input order
+        """
+        version = str(version)
+        metrics = list(scorers)
+        keys = [(text_hash(ref), text_hash(hyp)) for ref, hyp in zip(references, hypotheses)]
+        texts = dict(zip(keys, zip(references, hypotheses)))  # one text pair per unique key
+        scores = self._lookup(list(texts), version, metrics)
+
+        computed = []
+        for key, (ref, hyp) in texts.items():
+            values = scores.setdefault(key, [None] * len(metrics))
+            for i, metric in enumerate(metrics):
+                if values[i] is None:
+                    values[i] = scorers[metric](ref, hyp)
+                    computed.append((*key, version, metric, values[i]))
+        if computed:
+            with self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO wer_cache VALUES (?, ?, ?, ?, ?)", computed)
+
+        self.misses += len(computed)
+        self.hits += len(texts) * len(metrics) - len(computed)
+        return {metric: [scores[key][i] for key in keys] for i, metric in enumerate(metrics)}
+
+    def score_many(self, references: Sequence[str], hypotheses: Sequence[str], metric: str = "wer",
+                   version: Union[int, str] = NORMALIZER_VERSION,
+                   scorer: Callable[[str, str], float] = word_error_rate) -> List[float]:
+        """Score pairs with one metric (see score_metrics)."""
+        return self.score_metrics(references, hypotheses, {metric: scorer}, version)[metric]
+
+    def score(self, reference: str, hypothesis: str, **options) -> float:
+        """Score one pair (see score_metrics)."""
+        return self.score_many([reference], [hypothesis], **options)[0]
+
+    def close(self):
+        self.conn.close()
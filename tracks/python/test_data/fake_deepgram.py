@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the Deepgram API, for offline tests and demos.
+
+FakeDeepgramServer serves ``/v1/listen`` on a local port:
+
+- POST (prerecorded): returns a Deepgram-shaped transcription response
+- websocket (live): counts incoming PCM bytes, emits interim and final
+  ``Results`` messages as audio accumulates, and flushes on ``CloseStream``
+
+plus ``/metrics`` in Prometheus text format, like a self-hosted engine.
+
+Usage:
+    async with FakeDeepgramServer() as server:
+        monitor = DeepgramMonitor(api_key="test", base_url=server.url)
+"""
+
+import json
+import uuid
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from aiohttp import WSMsgType, web
+
+SCRIPT = "life moves pretty fast if you don't stop and look around once in a while you could miss it".split()
+
+
+class FakeDeepgramServer:
+    """HTTP + websocket stand-in for ``/v1/listen``."""
+
+    def __init__(self, interim_every: float = 0.25, final_every: float = 1.0,
+                 words_per_second: float = 3.0, delay: float = 0.0,
+                 api_key: Optional[str] = None, status: int = 200,
+                 transcripts: Optional[Dict[str, str]] = None, audio_duration: float = 6.5,
+                 close_stream: bool = True):
+        """
+        Args:
+            interim_every: Seconds of audio between live interim results
+            final_every: Seconds of audio between live final results
+            words_per_second: Transcript words emitted per second of audio
+            delay: Simulated processing delay before each response/result
+            api_key: If set, reject requests without ``Authorization: Token <api_key>``
+            status: HTTP status for prerecorded requests (non-200 simulates an outage)
+            transcripts: Prerecorded transcript per audio URL, or per (model, audio URL)
+                to make models disagree (default: SCRIPT)
+            audio_duration: Duration reported for prerecorded audio
+            close_stream: Close live connections after flushing on ``CloseStream``
+                (False leaves them open until the client disconnects)
+        """
+        self.interim_every = interim_every
+        self.final_every = final_every
+        self.words_per_second = words_per_second
+        self.delay = delay
+        self.api_key = api_key
+        self.status = status
+        self.transcripts = transcripts or {}
+        self.audio_duration = audio_duration
+        self.close_stream = close_stream
+        self.connections: List[Dict[str, Any]] = []
+        self.requests: List[Dict[str, Any]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+        self.duration_sum = 0.0
+        self.url = None
+        self._runner = None
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/v1/listen", self._handle_live)
+        app.router.add_post("/v1/listen", self._handle_prerecorded)
+        app.router.add_get("/metrics", self._handle_metrics)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._runner.cleanup()
+
+    def _authorized(self, request) -> bool:
+        return self.api_key is None or request.headers.get("Authorization") == f"Token {self.api_key}"
+
+    async def _handle_prerecorded(self, request):
+        body = await request.json()
+        self.requests.append({"query": dict(request.query), "body": body,
+                              "authorization": request.headers.get("Authorization")})
+        if not self._authorized(request):
+            return web.json_response({"err_code": "INVALID_AUTH"}, status=401)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        started = asyncio.get_running_loop().time()
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self.duration_sum += asyncio.get_running_loop().time() - started
+
+        if self.status != 200:
+            return web.json_response({"err_code": "UNAVAILABLE"}, status=self.status)
+
+        model = request.query.get("model", "nova-2")
+        transcript = self.transcripts.get((model, body.get("url")),
+                                          self.transcripts.get(body.get("url"), " ".join(SCRIPT)))
+        words = [{"word": w, "start": i / self.words_per_second, "end": (i + 1) / self.words_per_second,
+                  "confidence": 0.9} for i, w in enumerate(transcript.split())]
+        return web.json_response({
+            "metadata": {
+                "request_id": str(uuid.uuid4()),
+                "duration": self.audio_duration,
+                "channels": 1,
+                "models": [model],
+            },
+            "results": {"channels": [{"alternatives": [
+                {"transcript": transcript, "confidence": 0.9, "words": words},
+            ]}]},
+        })
+
+    async def _handle_metrics(self, request):
+        return web.Response(text="\n".join([
+            "# TYPE engine_active_requests gauge",
+            f'engine_active_requests{{kind="batch"}} {self.in_flight}',
+            "# TYPE engine_requests_total counter",
+            f'engine_requests_total{{kind="batch"}} {self.completed}',
+            "# TYPE engine_request_duration_seconds summary",
+            f"engine_request_duration_seconds_sum {self.duration_sum}",
+            f"engine_request_duration_seconds_count {self.completed}",
+            "",
+        ]))
+
+    def _words(self, start: float, end: float) -> str:
+        first = int(start * self.words_per_second)
+        last = int(end * self.words_per_second)
+        return " ".join(SCRIPT[i % len(SCRIPT)] for i in range(first, last))
+
+    def _result(self, start: float, end: float, is_final: bool) -> str:
+        return json.dumps({
+            "type": "Results",
+            "start": round(start, 3),
+            "duration": round(end - start, 3),
+            "is_final": is_final,
+            "speech_final": is_final,
+            "channel": {"alternatives": [{"transcript": self._words(start, end), "confidence": 0.9}]},
+        })
+
+    async def _handle_live(self, request):
+        if not self._authorized(request):
+            return web.Response(status=401)
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        query = dict(request.query)
+        self.connections.append({
+            "path": request.path,
+            "query": query,
+            "authorization": request.headers.get("Authorization"),
+            "bytes": 0,
+        })
+        connection = self.connections[-1]
+        bytes_per_second = int(query.get("sample_rate", 16000)) * int(query.get("channels", 1)) * 2
+
+        pending = []
+
+        def send_later(message: str):
+            async def send():
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                await ws.send_str(message)
+            pending.append(asyncio.create_task(send()))
+
+        segment_start = 0.0
+        last_interim = 0.0
+        async for message in ws:
+            if message.type == WSMsgType.TEXT:
+                if json.loads(message.data).get("type") == "CloseStream":
+                    break
+                continue
+            if message.type != WSMsgType.BINARY:
+                continue
+
+            connection["bytes"] += len(message.data)
+            audio_end = connection["bytes"] / bytes_per_second
+            if audio_end - segment_start >= self.final_every:
+                send_later(self._result(segment_start, audio_end, True))
+                segment_start = last_interim = audio_end
+            elif audio_end - last_interim >= self.interim_every:
+                send_later(self._result(segment_start, audio_end, False))
+                last_interim = audio_end
+
+        audio_end = connection["bytes"] / bytes_per_second
+        if audio_end > segment_start:
+            send_later(self._result(segment_start, audio_end, True))
+        await asyncio.gather(*pending)
+        await ws.send_str(json.dumps({"type": "Metadata", "duration": audio_end, "channels": 1}))
+        if not self.close_stream:
+            async for _ in ws:
+                pass
+        await ws.close()
+        return ws
+
+
+if __name__ == "__main__":
+    async def main():
+        async with FakeDeepgramServer() as server:
+            print(f"Fake Deepgram listening on {server.url} (Ctrl+C to stop)")
+            await asyncio.Future()
+
+    asyncio.run(main())
@@ -15,6 +15,7 @@ This will test:
 import os
 import json
 import asyncio
+import subprocess
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
@@ -26,6 +27,15 @@ sys.path.insert(0, str(Path(__file__).parent))
 load_dotenv()
 
 
+def report_checks(checks):
+    """Print each (ok, description) check and assert that all of them passed."""
+    for ok, description in checks:
+        print(f"{'✅' if ok else '❌'} {description}")
+    failed = [description for ok, description in checks if not ok]
+    assert not failed, f"Failed checks: {'; '.join(failed)}"
+    return True
+
+
 def test_environment():
     """Test that environment variables are properly configured."""
     print("Testing environment setup...")
@@ -188,32 +198,717 @@ def test_wer_calculation():
 
 
 async def test_monitor_class():
-    """Test the DeepgramMonitor class."""
+    """Test the DeepgramMonitor class against a local stand-in."""
     print("\nTesting DeepgramMonitor class...")
 
     try:
         from greenfield.deepgram_monitor import DeepgramMonitor
+        from test_data.fake_deepgram import FakeDeepgramServer, SCRIPT
+
+        async with FakeDeepgramServer(api_key="test") as server:
+            monitor = DeepgramMonitor(api_key="test", db_path=":memory:", base_url=server.url)
+            print("✅ DeepgramMonitor instantiated")
+
+            # transcribe_url logs the request whether or not the API call succeeds
+            result = await monitor.transcribe_url("https://static.deepgram.com/examples/test.wav")
+            logged = monitor.conn.execute("SELECT COUNT(*) FROM requests").fetchone()[0]
+            await monitor.close()
+
+        checks = [
+            (result is not None and result["error"] is None, "transcribe_url method works"),
+            (result is not None and result["transcript"] == " ".join(SCRIPT), "transcript returned"),
+            (server.requests[0]["authorization"] == "Token test", "API key sent"),
+            (logged == 1, "request logged to database"),
+        ]
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing DeepgramMonitor: {e}")
+        raise
 
-        # Create monitor instance
-        monitor = DeepgramMonitor(db_path=":memory:")  # Use in-memory DB for testing
 
-        print("✅ DeepgramMonitor instantiated")
+def test_cost_accounting():
+    """Test pricing and incremental cost rollups in the monitor."""
+    print("\nTesting cost accounting...")
 
-        # Test transcribe_url (will return placeholder)
-        result = await monitor.transcribe_url(
-            "https://static.deepgram.com/examples/test.wav"
-        )
+    try:
+        from greenfield.deepgram_monitor import DeepgramMonitor
+        from greenfield.pricing import DEFAULT_PRICING
 
-        if result:
-            print("✅ transcribe_url method works (returns placeholder)")
-        else:
-            print("❌ transcribe_url method failed")
+        monitor = DeepgramMonitor(api_key="test", db_path=":memory:", project="support")
+        for _ in range(3):
+            monitor.log_request({"model": "nova-2", "duration": 60.0, "timestamp": "2026-01-15T10:00:00"})
+        monitor.log_request({"model": "nova-3", "duration": 30.0, "mode": "streaming", "project": "sales",
+                             "timestamp": "2026-02-01T10:00:00"})
+        monitor.log_request({"model": "nova-2", "error": "timeout", "timestamp": "2026-01-15T11:00:00"})
 
-        return True
+        summary = {(row["project"], row["period"]): row for row in monitor.cost_summary("month")}
+        monitor.conn.close()
+
+        # The vectorized pricer agrees with the scalar one, defaults included
+        import pandas as pd
+        import brownfield.benchmark_nightmare as benchmark
+
+        frame = pd.DataFrame({
+            "model": ["nova-2", "nova-3", "base", "unknown", "nova-3", "nova-2"],
+            "mode": ["prerecorded", "streaming", None, "prerecorded", "streaming", None],
+            "tier": ["growth", None, "payg", "payg", "growth", None],
+            "diarize": [True, False, True, False, None, False],
+            "duration": [60.0, 30.0, 90.0, 60.0, None, 45.0],
+        })
+        vectorized = DEFAULT_PRICING.price_frame(frame).tolist()
+        given = lambda value, default: default if pd.isna(value) else value
+        scalar = [
+            DEFAULT_PRICING.price(given(row.duration, None), row.model, given(row.mode, "prerecorded"),
+                                  given(row.tier, "payg"), ["diarize"] if given(row.diarize, False) else [])
+            for row in frame.itertuples()
+        ]
+        matches = all((s is None and pd.isna(v)) or (s is not None and abs(s - v) < 1e-12)
+                      for s, v in zip(scalar, vectorized))
+
+        billed = benchmark.aggregate_results(pd.DataFrame({
+            "model": ["nova-2", "nova-2"], "success": [True, False], "latency": [1.0, None],
+            "duration": [60.0, 600.0],
+        }))
+
+        support = summary[("support", "2026-01")]
+        expected = 3 * DEFAULT_PRICING.price(60.0, "nova-2")
+        checks = [
+            (support["requests"] == 3, "failed requests are not billed"),
+            (abs(support["cost"] - expected) < 1e-12, f"support January cost ${support['cost']:.4f}"),
+            (("sales", "2026-02") in summary, "streaming cost rolled up per project"),
+            (matches, "vectorized pricing matches per-request pricing"),
+            (abs(billed.loc["nova-2", "cost_total"] - DEFAULT_PRICING.price(60.0, "nova-2")) < 1e-12,
+             "failed benchmark results are not billed"),
+        ]
+
+        return report_checks(checks)
 
     except Exception as e:
-        print(f"❌ Error testing DeepgramMonitor: {e}")
-        return False
+        print(f"❌ Error testing cost accounting: {e}")
+        raise
+
+
+async def test_multi_endpoint_monitoring():
+    """Test concurrent probing of several deployments against local stand-ins."""
+    print("\nTesting multi-endpoint monitoring...")
+
+    try:
+        from greenfield.deepgram_monitor import DeepgramMonitor
+        from greenfield.endpoints import Endpoint, EndpointRegistry
+        from test_data.fake_deepgram import FakeDeepgramServer
+
+        async with FakeDeepgramServer(api_key="cloud-key", delay=0.05) as cloud, \
+                FakeDeepgramServer(delay=0.05) as onprem, \
+                FakeDeepgramServer(status=503) as broken:
+            registry = EndpointRegistry([
+                Endpoint("cloud", cloud.url, "cloud-key", models=("nova-2", "nova-3")),
+                Endpoint("onprem", onprem.url, models=("nova-2",), max_concurrency=2),
+                Endpoint("broken", broken.url, models=("nova-2",)),
+            ])
+            monitor = DeepgramMonitor(db_path=":memory:", endpoints=registry)
+
+            await monitor.monitor_endpoints("https://example.com/a.wav", interval=0.01, iterations=3)
+            await asyncio.gather(*(
+                monitor.transcribe_url(f"https://example.com/{i}.wav", endpoint="onprem") for i in range(6)
+            ))
+            report = monitor.generate_report()
+            await monitor.close()
+
+        by_endpoint = {}
+        for row in report["models"]:
+            by_endpoint[row["endpoint"]] = by_endpoint.get(row["endpoint"], 0) + row["requests"]
+
+        checks = [
+            (by_endpoint == {"cloud": 6, "onprem": 9, "broken": 3}, f"results tagged by endpoint {by_endpoint}"),
+            (report["endpoints"]["cloud"]["status"] == "healthy", "cloud endpoint healthy"),
+            (report["endpoints"]["broken"]["status"] == "down", "broken endpoint marked down"),
+            (onprem.max_in_flight <= 2, f"onprem concurrency limited ({onprem.max_in_flight} in flight)"),
+        ]
+
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing multi-endpoint monitoring: {e}")
+        raise
+
+
+async def test_ab_testing():
+    """Test paired A/B routing and sequential stopping against a local stand-in."""
+    print("\nTesting A/B testing...")
+
+    try:
+        from greenfield.ab_testing import ABTest
+        from greenfield.deepgram_monitor import DeepgramMonitor
+        from test_data.fake_deepgram import FakeDeepgramServer, SCRIPT
+
+        reference = " ".join(SCRIPT)
+        samples = [{"id": f"utt_{i}", "audio_url": f"https://example.com/{i}.wav", "transcript": reference}
+                   for i in range(100)]
+        # nova-2 drops 1-4 words per utterance, nova-3 is exact
+        transcripts = {("nova-2", s["audio_url"]): " ".join(SCRIPT[i % 4 + 1:]) for i, s in enumerate(samples)}
+
+        async with FakeDeepgramServer(transcripts=transcripts) as server:
+            monitor = DeepgramMonitor(api_key="test", db_path=":memory:", base_url=server.url)
+            wer = monitor.calculate_wer("Hello, world!", "hello earth")
+            ab_test = ABTest("nova-2", "nova-3", traffic_split=0.5, min_samples=10)
+            summary = await monitor.run_ab_test(ab_test, samples, concurrency=4)
+            logged = monitor.conn.execute("SELECT COUNT(*) FROM requests WHERE wer IS NOT NULL").fetchone()[0]
+            await monitor.close()
+
+        split = ABTest("nova-2", "nova-3", traffic_split=0.3)
+        assigned = [split.assign(f"utt_{i}") for i in range(2000)]
+        wer_stats = summary["metrics"]["wer"]
+        checks = [
+            (abs(wer - 0.5) < 1e-9, "WER normalizes case and punctuation"),
+            (assigned == [split.assign(f"utt_{i}") for i in range(2000)], "routing is deterministic per utterance"),
+            (abs(assigned.count("treatment") / 2000 - 0.3) < 0.05, "traffic split respected"),
+            (summary["decision"] == "roll_out_treatment", f"decision: {summary['decision']}"),
+            (summary["pairs"] < 40, f"stopped early after {summary['pairs']} pairs (p={wer_stats['p_value']:.4f})"),
+            (wer_stats["confidence_interval"][1] < 0, "WER difference confidence sequence excludes zero"),
+            (logged == sum(summary["routed"].values()) + summary["pairs"], "every request logged with WER"),
+        ]
+
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing A/B testing: {e}")
+        raise
+
+
+async def test_autoscaling_advisor():
+    """Test Little's-law replica recommendations and scraping a metrics stand-in."""
+    print("\nTesting autoscaling advisor...")
+
+    try:
+        import numpy as np
+        from greenfield.autoscaling import AutoscalingAdvisor
+        from test_data.fake_deepgram import FakeDeepgramServer
+
+        # Steady 100 req/s at 0.1s each on 2 replicas: L = 10 concurrent requests
+        advisor = AutoscalingAdvisor(capacity=16, per_replica_concurrency=10)
+        for i in range(40):  # wraps the ring buffer
+            advisor.add_sample((i * 15.0, 10.0, i * 1500.0, i * 150.0, i * 1500.0, 2))
+        known = advisor.recommend()
+        advisor.per_replica_concurrency = None
+        estimated = advisor.recommend()
+
+        # A duration metric that stopped advancing is not a measurement of W;
+        # fall back to Little's law (L = 10 at 100 req/s -> W = 0.1s)
+        stale = AutoscalingAdvisor(capacity=16, per_replica_concurrency=10)
+        for i in range(8):
+            stale.add_sample((i * 15.0, 10.0, i * 1500.0, 150.0, 1500.0, 2))
+        stale_report = stale.recommend()
+
+        # No completions at all: nothing to size from
+        idle = AutoscalingAdvisor(capacity=16)
+        for i in range(8):
+            idle.add_sample((i * 15.0, 3.0, 1500.0, 150.0, 1500.0, 2))
+        idle_report = idle.recommend()
+
+        async with FakeDeepgramServer() as server:
+            sample = await AutoscalingAdvisor(f"{server.url}/metrics").scrape_once()
+
+            # Periodic reports must not add back-to-back scrapes
+            paced = AutoscalingAdvisor(f"{server.url}/metrics", interval=0.1)
+            reports = []
+            await paced.run(iterations=6, report_every=2, on_report=reports.append)
+            gaps = np.diff(paced.samples.view()["timestamp"])
+
+        checks = [
+            (len(advisor.samples) == 16, "ring buffer keeps a fixed window"),
+            (abs(known["time_in_system"] - 0.1) < 1e-9, "time in system from duration metric"),
+            (known["recommended_replicas"] == 2, f"known capacity: {known['recommended_replicas']} replicas"),
+            (estimated["recommended_replicas"] == 3, f"estimated capacity: {estimated['recommended_replicas']} replicas"),
+            (abs(stale_report["time_in_system"] - 0.1) < 1e-9, "stale duration metric falls back to Little's law"),
+            (idle_report.get("reason") == "no traffic in window", "no recommendation without completed requests"),
+            (sample[2] == 0 and sample[5] == 1, "engine metrics scraped from stand-in"),
+            (len(reports) == 3 and len(gaps) == 5 and gaps.min() > 0.025,
+             f"reports between evenly paced scrapes (min gap {gaps.min():.3f}s)"),
+        ]
+
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing autoscaling advisor: {e}")
+        raise
+
+
+async def test_streaming_monitor():
+    """Test live streaming metrics against a local websocket stand-in."""
+    print("\nTesting streaming monitor...")
+
+    try:
+        import time
+        from greenfield.deepgram_monitor import DeepgramMonitor
+        from greenfield.streaming import AudioFormat, stream_audio
+        from test_data.fake_deepgram import FakeDeepgramServer
+
+        async with FakeDeepgramServer(delay=0.01) as server:
+            monitor = DeepgramMonitor(api_key="test", db_path=":memory:", base_url=server.url)
+
+            # 2 seconds of 16kHz silence in 20ms frames, streamed at 10x real time
+            frames = (b"\x00\x00" * 320 for _ in range(100))
+            result = await monitor.transcribe_stream(frames, model="nova-2", speed=10.0)
+
+            metrics = result["metrics"]
+            row = monitor.conn.execute(
+                "SELECT r.mode, s.final_count FROM requests r "
+                "JOIN stream_sessions s ON s.request_id = r.id WHERE r.id = ?", (result["id"],)
+            ).fetchone()
+            await monitor.close()
+
+        # A server that never closes after CloseStream must not hang the stream
+        async with FakeDeepgramServer(close_stream=False) as stuck:
+            started = time.perf_counter()
+            try:
+                await stream_audio(stuck.url.replace("http", "ws") + "/v1/listen", [b"\x00\x00" * 320],
+                                   AudioFormat(), speed=0, drain_timeout=0.2)
+                timed_out = False
+            except asyncio.TimeoutError:
+                timed_out = True
+            waited = time.perf_counter() - started
+
+        checks = [
+            (result["error"] is None, f"stream completed ({result['error']})"),
+            (server.connections[0]["query"].get("model") == "nova-2", "model passed in query"),
+            (metrics["time_to_first_transcript"] is not None, "time-to-first-transcript measured"),
+            (metrics["interim_count"] > 0 and metrics["final_count"] == 2, "interim and final results timed"),
+            (metrics["finalization_lag"] >= 0.01, "finalization lag includes server delay"),
+            (row is not None and row["mode"] == "streaming", "session logged to database"),
+            (timed_out and waited < 2.0, f"drain bounded by timeout ({waited:.2f}s)"),
+        ]
+
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing streaming monitor: {e}")
+        raise
+
+
+# Modules that must not load just to start an entry point or print --help
+HEAVY_MODULES = ("pandas", "numpy", "deepgram", "matplotlib", "httpx", "websockets")
+STARTUP_BUDGET_SECONDS = 0.3
+
+
+def _import_profile(args):
+    """Run python -X importtime and return (modules imported, top-level import seconds)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True, text=True, cwd=Path(__file__).parent,
+    )
+    if proc.returncode != 0:
+        errors = "\n".join(line for line in proc.stderr.splitlines() if not line.startswith("import time:"))
+        raise AssertionError(f"python {' '.join(args)} exited with {proc.returncode}:\n{errors}")
+    modules = set()
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        modules.add(name.strip().split(".")[0])
+        if len(name) - len(name.lstrip()) == 1:  # top-level import, not a nested one
+            total_us += int(cumulative_us)
+    return modules, total_us / 1e6
+
+
+async def test_streaming_pipeline():
+    """Test the bounded benchmark pipeline end to end against a local stand-in."""
+    print("\nTesting streaming pipeline...")
+
+    try:
+        import tempfile
+        import brownfield.benchmark_nightmare as benchmark
+        from greenfield.deepgram_monitor import DeepgramMonitor
+        from greenfield.live_results import ResultRing
+        from test_data.fake_deepgram import FakeDeepgramServer, SCRIPT
+
+        queue_size, concurrency = 4, 4
+        reference = " ".join(SCRIPT)
+        lead = []
+
+        async with FakeDeepgramServer(delay=0.002) as server:
+            def items():
+                for i in range(150):
+                    # Jobs handed to the pipeline but not yet answered by the server
+                    lead.append(i * 2 - server.completed)
+                    yield {"id": f"utt_{i}", "audio_url": f"https://example.com/{i}.wav", "transcript": reference}
+
+            monitor = DeepgramMonitor(api_key="test", db_path=":memory:", base_url=server.url,
+                                      live=ResultRing.create(capacity=512), max_concurrency=2)
+            with tempfile.TemporaryDirectory() as tmp:
+                output = os.path.join(tmp, "pipeline.jsonl")
+                summary, metrics = await benchmark.benchmark_pipeline(
+                    items(), ["nova-2", "nova-3"], output, monitor,
+                    concurrency=concurrency, queue_size=queue_size, score_workers=2,
+                )
+                records = benchmark.read_results([output])
+            logged = monitor.conn.execute("SELECT COUNT(*) FROM requests").fetchone()[0]
+            live = monitor.live.records()
+            await monitor.close()
+
+        # Queues (each also briefly holds end-of-stream markers) plus in-flight workers
+        bound = 6 * (queue_size + concurrency)
+        checks = [
+            (len(records) == 300 and all(r["success"] for r in records), f"{len(records)} records stored"),
+            (all(r["wer"] == 0.0 for r in records), "records scored in worker processes"),
+            (summary["nova-3"]["requests"] == 150 and summary["nova-2"]["wer_mean"] == 0.0, "running aggregates"),
+            (all(m["queue_depth_max"] <= queue_size for m in metrics.values()), "queues stay bounded"),
+            (max(lead) <= bound, f"source consumed lazily (at most {max(lead)} jobs ahead)"),
+            (metrics["sink"]["processed"] == 300 and logged == 0, "per-stage metrics; monitor database untouched"),
+            (len(live) == 300 and all(r.wer == 0.0 and r.ok for r in live), "scored results published live"),
+            (server.max_in_flight <= 2, f"endpoint concurrency limit applied ({server.max_in_flight} in flight)"),
+        ]
+
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing streaming pipeline: {e}")
+        raise
+
+
+async def test_traffic_replay():
+    """Test recording API traffic and replaying it through a local stand-in."""
+    print("\nTesting traffic record/replay...")
+
+    try:
+        import tempfile
+        from greenfield.deepgram_monitor import DeepgramMonitor
+        from greenfield.replay import ReplayServer, TrafficRecorder, read_traffic
+        from test_data.fake_deepgram import FakeDeepgramServer
+
+        urls = [f"https://example.com/{i}.wav" for i in range(5)]
+        transcripts = {url: f"utterance number {i}" for i, url in enumerate(urls)}
+
+        async def transcribe_all(base_url, recorder=None):
+            monitor = DeepgramMonitor(api_key="test", db_path=":memory:", base_url=base_url, recorder=recorder)
+            results = await asyncio.gather(*(monitor.transcribe_url(url, model)
+                                             for url in urls for model in ("nova-2", "nova-3")))
+            await monitor.close()
+            return results
+
+        with tempfile.TemporaryDirectory() as tmp:
+            log = os.path.join(tmp, "traffic.jsonl.gz")
+            async with FakeDeepgramServer(delay=0.1, transcripts=transcripts) as server:
+                recorded = await transcribe_all(server.url, TrafficRecorder(log))
+
+            async with ReplayServer(log, time_scale=1.0) as replay:
+                original = await transcribe_all(replay.url)
+            async with ReplayServer(log, time_scale=0.0) as replay:
+                fast = await transcribe_all(replay.url)
+                monitor = DeepgramMonitor(api_key="test", db_path=":memory:", base_url=replay.url)
+                miss = await monitor.transcribe_url("https://example.com/unknown.wav")
+                await monitor.close()
+
+            exchanges = list(read_traffic(log))
+            with open(log, "rb") as f:
+                compressed = f.read(2) == b"\x1f\x8b"  # gzip magic
+
+        def mean_latency(results):
+            return sum(r["latency"] for r in results) / len(results)
+
+        checks = [
+            (len(exchanges) == 10 and compressed, f"{len(exchanges)} exchanges in compressed log"),
+            (all(e["status"] == 200 and e["latency"] >= 0.1 and e["params"]["model"] for e in exchanges),
+             "request metadata, responses and latencies captured"),
+            ([r["transcript"] for r in original] == [r["transcript"] for r in recorded], "replay returns recorded bodies"),
+            (mean_latency(original) >= 0.1, f"original timings replayed ({mean_latency(original):.3f}s)"),
+            (mean_latency(fast) < 0.1, f"scaled timings replayed ({mean_latency(fast):.3f}s)"),
+            (miss["response_code"] == 404, "unrecorded requests miss"),
+        ]
+
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing traffic replay: {e}")
+        raise
+
+
+async def test_regression_gate():
+    """Test the WER regression gate against expected_wer per sample and difficulty bucket."""
+    print("\nTesting WER regression gate...")
+
+    try:
+        import tempfile
+        import brownfield.benchmark_nightmare as benchmark
+        from test_data.fake_deepgram import FakeDeepgramServer
+
+        samples = [
+            {"id": f"gate_{i:03d}", "audio_url": f"https://example.com/gate_{i}.wav",
+             "transcript": f"the quick brown fox number {i} jumps over the lazy dog",
+             "difficulty": "easy" if i < 4 else "hard", "expected_wer": 0.0 if i < 4 else 0.1}
+            for i in range(8)
+        ]
+        exact = {s["audio_url"]: s["transcript"] for s in samples}
+        degraded = {**exact, samples[0]["audio_url"]: "the quick brown cat number 0 jumps over a lazy dog"}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = os.path.join(tmp, "manifest.json")
+            with open(manifest, "w") as f:
+                json.dump(samples, f)
+            responses = os.path.join(tmp, "responses.jsonl")
+            report = os.path.join(tmp, "gate.json")
+
+            async def gate(transcripts, *extra):
+                async with FakeDeepgramServer(transcripts=transcripts, delay=0.01) as server:
+                    code = await asyncio.to_thread(benchmark.main, [
+                        "gate", "--manifest", manifest, "--base-url", server.url,
+                        "--cache", os.path.join(tmp, "wer_cache.db"), "--json", report, *extra,
+                    ])
+                    return code, server.completed, server.max_in_flight
+
+            passed, first_requests, first_in_flight = await gate(exact, "--responses", responses, "--concurrency", "2")
+            cached, cached_requests, _ = await gate(degraded, "--responses", responses)
+            failed, _, _ = await gate(degraded)
+            with open(report) as f:
+                failed_report = json.load(f)
+            tolerated, _, _ = await gate(degraded, "--max-failures", "1", "--bucket-tolerance", "0.1")
+
+        statuses = {row["id"]: row["status"] for row in failed_report["samples"]}
+        buckets = {row["difficulty"]: row["status"] for row in failed_report["buckets"]}
+
+        checks = [
+            (passed == 0 and first_requests == 8, "matching corpus passes"),
+            (first_in_flight == 2, f"--concurrency limits requests in flight ({first_in_flight})"),
+            (cached == 0 and cached_requests == 0, "cached responses reused without requests"),
+            (failed == 1, "regression exits non-zero"),
+            (statuses["gate_000"] == "regressed" and list(statuses.values()).count("pass") == 7,
+             "regressed sample identified"),
+            (buckets == {"easy": "regressed", "hard": "pass"}, "regressed difficulty bucket identified"),
+            (tolerated == 0, "tolerances and allowed failures respected"),
+        ]
+
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing regression gate: {e}")
+        raise
+
+
+async def test_live_results():
+    """Test the shared-memory result ring with a writer and a reader in another process."""
+    print("\nTesting live result ring...")
+
+    try:
+        import time
+        import threading
+        from greenfield.deepgram_monitor import DeepgramMonitor
+        from greenfield.live_results import RECORD, ResultRing
+        from test_data.fake_deepgram import SCRIPT, FakeDeepgramServer
+
+        ring = ResultRing.create(capacity=64)
+        async with FakeDeepgramServer() as server:
+            monitor = DeepgramMonitor(api_key="test", db_path=":memory:", base_url=server.url, live=ring)
+            await asyncio.gather(*(monitor.transcribe_url(f"https://example.com/{i}.wav", model, reference=" ".join(SCRIPT))
+                                   for i in range(3) for model in ("nova-2", "nova-3")))
+            monitor.live = None  # keep the ring open past the monitor
+            await monitor.close()
+        published = ring.records()
+
+        # A reader process polls while this process keeps writing and lapping the ring;
+        # every record it decodes must be whole (latency == cost == sequence number)
+        reader = subprocess.Popen([sys.executable, "-c", f"""
+import json, sys
+sys.path.insert(0, {os.path.dirname(os.path.abspath(__file__))!r})
+from greenfield.live_results import ResultRing
+ring = ResultRing.attach({ring.name!r})
+print("ready", flush=True)
+reads = torn = 0
+while ring.written < 20000:
+    records = [r for r in ring.records() if r.model == "load"]
+    reads += 1
+    torn += any(r.latency != r.cost for r in records)
+    torn += any(b.latency <= a.latency for a, b in zip(records, records[1:]))
+print(json.dumps({{"reads": reads, "torn": torn, "window": len(ring.records(since=60))}}))
+ring.close()
+"""], stdout=subprocess.PIPE, text=True)
+
+        def write():
+            while ring.written < 20000:
+                n = ring.written
+                ring.write("load", float(n), cost=float(n), status=200)
+                if n % 100 == 0:
+                    time.sleep(0.001)
+
+        reader.stdout.readline()
+        writer = threading.Thread(target=write)
+        writer.start()
+        output, _ = reader.communicate(timeout=30)
+        writer.join()
+        stats = json.loads(output)
+        newest = ring.records(last=10)
+        ring.close()
+
+        checks = [
+            (RECORD.size == 48, f"fixed-width {RECORD.size}-byte records"),
+            (len(published) == 6 and {r.model for r in published} == {"nova-2", "nova-3"}
+             and all(r.ok and r.status == 200 and r.wer == 0.0 for r in published), "monitor results published"),
+            (stats["reads"] > 0 and stats["torn"] == 0, f"{stats['reads']} concurrent reads, none torn"),
+            (stats["window"] == 64, "reader sees only the newest capacity records"),
+            ([r.latency for r in newest] == [float(n) for n in range(19990, 20000)], "newest records in order"),
+        ]
+
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing live result ring: {e}")
+        raise
+
+
+async def test_request_phases():
+    """Test per-request latency breakdown from HTTP trace hooks."""
+    print("\nTesting request phase timings...")
+
+    try:
+        from greenfield.deepgram_monitor import DeepgramMonitor
+        from greenfield.http_trace import PHASES, RequestTrace, summarize_phases
+        from test_data.fake_deepgram import FakeDeepgramServer
+
+        async with FakeDeepgramServer(delay=0.2) as server:
+            monitor = DeepgramMonitor(api_key="test", db_path=":memory:", base_url=server.url)
+            results = [await monitor.transcribe_url(f"https://example.com/{i}.wav") for i in range(4)]
+            stored = monitor.conn.execute("SELECT COUNT(*) FROM request_phases").fetchone()[0]
+            report = monitor.generate_report()["models"][0]["phases"]
+            await monitor.close()
+
+        phases = [result["phases"] for result in results]
+        totals = [sum(p[phase] or 0.0 for phase in PHASES) for p in phases]
+
+        # Reuse is only known once a connection was acquired (or a new one attempted)
+        silent, refused = RequestTrace(), RequestTrace()
+        await refused("connection.connect_tcp.started", {})
+        await refused("connection.connect_tcp.failed", {})
+        mixed = summarize_phases([{"latency": 0.1, "connection_reused": silent.connection_reused},
+                                  {"latency": 0.2, "connection_reused": refused.connection_reused}])
+
+        checks = [
+            (not phases[0]["connection_reused"] and phases[0]["connect"] is not None, "new connection timed"),
+            (all(p["connection_reused"] and p["connect"] is None for p in phases[1:]), "reused connections detected"),
+            (all(p["upload"] is not None and p["download"] is not None for p in phases), "upload and body read timed"),
+            (all(p["ttfb"] >= 0.2 for p in phases), "server delay shows up as time to first byte"),
+            (all(abs(total - r["latency"]) < 1e-3 for total, r in zip(totals, results)), "phases add up to latency"),
+            (stored == 4, "phases stored with each request"),
+            (silent.connection_reused is None and refused.connection_reused is False
+             and mixed["requests"] == 1 and mixed["connection_reuse_rate"] == 0.0,
+             "requests without trace events do not count as reused"),
+            (report["connection_reuse_rate"] == 0.75 and report["tail"]["ttfb"] >= 0.2, "phases summarized in report"),
+        ]
+
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing request phases: {e}")
+        raise
+
+
+def test_result_buffer():
+    """Test compact result records and the columnar result buffer."""
+    print("\nTesting result buffer...")
+
+    try:
+        import time
+        import random
+        import tempfile
+        from datetime import datetime
+        import numpy as np
+        import pandas as pd
+        import brownfield.benchmark_nightmare as benchmark
+        from greenfield.result_buffer import ResultBuffer, ResultRecord
+
+        records = [
+            ResultRecord(id=f"r{i}", url=f"https://example.com/{i % 5}.wav", model=("nova-2", "nova-3")[i % 2],
+                         transcript=None if i % 7 == 0 else f"text {i % 5}", latency=i / 10,
+                         wer=None if i % 3 else 0.1, timestamp=1_700_000_000 + i, response_code=200,
+                         success=i % 7 != 0, error="timeout" if i % 7 == 0 else None)
+            for i in range(50)
+        ]
+        buffer = ResultBuffer(chunk_size=7, capacity=4)  # several flushes and regrowths
+        buffer.extend(records)
+        df = buffer.to_frame()
+        expected = pd.DataFrame([r.as_dict() for r in records])
+        expected["timestamp"] = pd.to_datetime(expected["timestamp"], unit="s", utc=True)
+
+        same = all(
+            df[column].astype(object).where(df[column].notna(), None).tolist()
+            == expected[column].astype(object).where(expected[column].notna(), None).tolist()
+            for column in expected.columns
+        )
+        categorical = buffer.to_frame(categorical=True)
+
+        # Legacy path: results buffer up and are folded into RESULTS_FINAL in one step
+        benchmark.RESULTS_FINAL = pd.DataFrame({"url": ["base"], "model": ["nova-2"]})
+        benchmark.RESULT_BUFFER = ResultBuffer(benchmark.LEGACY_RESULT_COLUMNS)
+        benchmark.RESULT_BUFFER.extend(records)
+        benchmark.materialize_results()
+        legacy = benchmark.RESULTS_FINAL
+
+        # The run command writes the dict process_audio_file_sync returns
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest, output = os.path.join(tmp, "manifest.json"), os.path.join(tmp, "results.jsonl")
+            with open(manifest, "w") as f:
+                json.dump([{"id": "run_1", "audio_url": "https://example.com/run.wav",
+                            "transcript": "reference", "duration_seconds": 4.0}], f)
+            random.seed(31)  # first attempt succeeds after a short simulated delay
+            benchmark.main(["run", "--manifest", manifest, "--models", "nova-2", "--output", output])
+            run_records = benchmark.read_results([output])
+        buffered = benchmark.RESULT_BUFFER.to_frame()
+        benchmark.RESULT_BUFFER = None
+
+        count = 200_000
+        started = time.perf_counter()
+        large = ResultBuffer(benchmark.LEGACY_RESULT_COLUMNS)
+        for i in range(count):
+            large.append(ResultRecord(url=records[i % 50].url, model="nova-3", transcript="text",
+                                      latency=0.1, success=True))
+        large_df = large.to_frame()
+        elapsed = time.perf_counter() - started
+
+        checks = [
+            (not hasattr(records[0], "__dict__") and records[0]["latency"] == 0.0, "slotted records with item access"),
+            (len(df) == 50 and same, "frame matches per-result dicts"),
+            (df["timestamp"].dtype == "datetime64[us, UTC]" and df["response_code"].dtype == np.int64, "typed columns"),
+            (np.shares_memory(df["latency"].to_numpy(), buffer.column("latency")), "numeric columns not copied"),
+            (len(categorical["url"].cat.categories) == 5 and categorical["transcript"].isna().sum() == 8,
+             "strings interned once per distinct value"),
+            (len(run_records) == 1 and run_records[0]["success"] and run_records[0]["id"] == "run_1",
+             "run command writes result dicts"),
+            (buffered["timestamp"][0] == datetime.fromisoformat(run_records[0]["timestamp"]),
+             "written and buffered timestamps agree (UTC)"),
+            (len(legacy) == 51 and benchmark.RESULT_BUFFER is None and list(legacy.columns)[:2] == ["url", "model"],
+             "legacy results materialized once"),
+            (len(large_df) == count and large.nbytes < count * 64,
+             f"{count} results in {elapsed:.2f}s, {large.nbytes / count:.0f} bytes each"),
+        ]
+
+        benchmark.RESULTS_FINAL = None
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing result buffer: {e}")
+        raise
+
+
+def test_startup_time():
+    """Test that entry points start without loading heavy dependencies."""
+    print("\nTesting startup time...")
+
+    entry_points = [
+        ("benchmark --help", ["brownfield/benchmark_nightmare.py", "--help"]),
+        ("monitor import", ["-c", "import greenfield.deepgram_monitor"]),
+    ]
+
+    checks = []
+    for name, args in entry_points:
+        modules, seconds = _import_profile(args)
+        heavy = sorted(set(HEAVY_MODULES) & modules)
+        if heavy:
+            checks.append((False, f"{name} imports {', '.join(heavy)}"))
+        elif seconds > STARTUP_BUDGET_SECONDS:
+            checks.append((False, f"{name} imports took {seconds:.3f}s (budget {STARTUP_BUDGET_SECONDS}s)"))
+        else:
+            checks.append((True, f"{name} imports took {seconds:.3f}s"))
+
+    return report_checks(checks)
 
 
 def test_brownfield_code():
@@ -240,6 +935,366 @@ def test_brownfield_code():
         return False
 
 
+def test_benchmark_cli():
+    """Test sharding, resume, merging and the report/compare commands of the benchmark CLI."""
+    print("\nTesting benchmark CLI...")
+
+    try:
+        import random
+        import tempfile
+        import brownfield.benchmark_nightmare as benchmark
+
+        items = [{"id": f"item_{i}", "audio_url": f"https://example.com/{i}.wav"} for i in range(200)]
+        shards = [{item["id"] for item in benchmark.select_shard(items, i, 4)} for i in range(4)]
+        disjoint = all(not shards[i] & shards[j] for i in range(4) for j in range(i + 1, 4))
+        covered = set().union(*shards) == {item["id"] for item in items}
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)  # compare writes its tables to the working directory
+            try:
+                shard_a, shard_b, merged = ("a.jsonl", "b.jsonl", "m.jsonl")
+                benchmark.append_result(shard_a, {"id": "x", "model": "nova-2", "success": True, "latency": 1.0})
+                benchmark.append_result(shard_b, {"id": "x", "model": "nova-2", "success": False})
+                benchmark.append_result(shard_b, {"id": "y", "model": "nova-2", "success": True, "latency": 2.0})
+                benchmark.main(["merge", shard_a, shard_b, "--output", merged])
+                merged_records = benchmark.read_results([merged])
+
+                # --resume only runs the (item, model) pairs without a successful result
+                manifest, output, scored = "manifest.json", "results.jsonl", "scored.jsonl"
+                with open(manifest, "w") as f:
+                    json.dump([{"id": f"run_{i}", "audio_url": f"https://example.com/run_{i}.wav",
+                                "transcript": f"sample transcript for run {i}", "duration_seconds": 4.0}
+                               for i in range(3)], f)
+                for i in range(2):
+                    for model in ("nova-2", "nova-3"):
+                        benchmark.append_result(output, {"id": f"run_{i}", "model": model, "success": True,
+                                                         "url": f"https://example.com/run_{i}.wav",
+                                                         "transcript": f"sample transcript for run {i}",
+                                                         "latency": 0.1})
+                random.seed(28)  # both simulated requests succeed on the first attempt
+                benchmark.main(["run", "--manifest", manifest, "--models", "nova-2,nova-3",
+                                "--output", output, "--resume"])
+                run_records = benchmark.read_results([output])
+
+                benchmark.main(["score", output, "--manifest", manifest, "--cache", "wer_cache.db",
+                                "--output", scored])
+                report_code = benchmark.main(["report", scored])
+                unscored_plot_code = benchmark.main(["report", merged, "--plot", "wer.png"])
+                compare_code = benchmark.main(["compare", scored])
+                unscored_compare_code = benchmark.main(["compare", merged])
+                compared = os.path.exists("comparison.csv")
+            finally:
+                os.chdir(cwd)
+                benchmark.RESULTS_FINAL = benchmark.RESULTS_NOVA2 = benchmark.RESULTS_NOVA3 = None
+
+        ran = [(r["id"], r["model"]) for r in run_records[4:]]
+        checks = [
+            (disjoint and covered, f"4 shards partition 200 items ({', '.join(str(len(s)) for s in shards)})"),
+            (len(merged_records) == 2 and all(r["success"] for r in merged_records),
+             "merge keeps one successful record per item"),
+            (len(run_records) == 6 and sorted(ran) == [("run_2", "nova-2"), ("run_2", "nova-3")],
+             f"resume skips completed items (ran {ran})"),
+            (report_code == 0 and unscored_plot_code == 1, "report exit codes"),
+            (compare_code == 0 and compared and unscored_compare_code == 1, "compare exit codes"),
+        ]
+
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing benchmark CLI: {e}")
+        raise
+
+
+def test_ground_truth_catalog():
+    """Test indexed ground-truth lookups, joins and scoring without self-matches."""
+    print("\nTesting ground truth catalog...")
+
+    try:
+        import tempfile
+        import pandas as pd
+        import brownfield.benchmark_nightmare as benchmark
+        from greenfield.ground_truth import GroundTruthCatalog, hash_audio
+        from greenfield.wer import word_error_rate
+
+        manifest = Path(__file__).parent / "test_data" / "ground_truth.json"
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "catalog.db")
+            catalog = GroundTruthCatalog.from_manifest(manifest, db_path)
+            catalog.add({"id": "clip_1", "audio_url": "file:///clip.wav", "transcript": "hello world",
+                         "audio_hash": hash_audio(b"RIFF clip")})
+            catalog.close()
+            reopened = GroundTruthCatalog(db_path)
+
+            results = pd.DataFrame([
+                {"id": "bueller_001", "url": "x", "model": "nova-2"},
+                {"id": "unknown", "url": "file:///clip.wav", "model": "nova-2"},
+                {"id": "missing", "url": "y", "model": "nova-2"},
+            ])
+            joined = benchmark.join_ground_truth(results, reopened)
+
+            inputs, scored_path = os.path.join(tmp, "r.jsonl"), os.path.join(tmp, "s.jsonl")
+            benchmark.append_result(inputs, {"id": "clip_1", "model": "nova-2", "success": True,
+                                             "transcript": "hello word"})
+            benchmark.append_result(inputs, {"id": "orphan", "model": "nova-2", "success": True,
+                                             "transcript": "scored against itself"})
+            benchmark.main(["score", inputs, "--catalog", db_path, "--output", scored_path,
+                            "--cache", os.path.join(tmp, "wer_cache.db")])
+            scored = {r["id"]: r for r in benchmark.read_results([scored_path])}
+            reopened.close()
+
+        checks = [
+            (len(reopened) == 16, "catalog persisted to SQLite and reloaded"),
+            (reopened.by_url("file:///clip.wav")["id"] == "clip_1", "lookup by audio URL"),
+            (reopened.by_hash(hash_audio(b"RIFF clip"))["id"] == "clip_1", "lookup by content hash"),
+            (reopened.get("bueller_001")["speaker"] == "Ferris Bueller", "extra manifest fields kept"),
+            (joined["ground_truth"].tolist()[:2] == [reopened.get("bueller_001")["transcript"], "hello world"],
+             "vectorized join by id with URL fallback"),
+            (pd.isna(joined["ground_truth"].iloc[2]), "unmatched rows left without ground truth"),
+            (scored["clip_1"]["wer"] == word_error_rate("hello world", "hello word"),
+             "result scored against catalog reference with the real WER"),
+            (scored["orphan"]["wer"] is None, "result without reference is not scored against itself"),
+        ]
+
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing ground truth catalog: {e}")
+        raise
+
+
+def test_incremental_scoring():
+    """Test that memoized WER re-scoring only computes new or changed rows."""
+    print("\nTesting incremental WER scoring...")
+
+    try:
+        import tempfile
+        import pandas as pd
+        import brownfield.benchmark_nightmare as benchmark
+        from greenfield.wer import WerCache, word_error_rate
+
+        rows = [{"id": f"utt_{i}", "ground_truth": f"reference number {i}", "transcript": f"reference {i}"}
+                for i in range(50)]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "wer_cache.db")
+            cache = WerCache(db_path)
+            benchmark.RESULTS_FINAL = pd.DataFrame(rows)
+            benchmark.calculate_all_wer_scores(cache)
+            first = (cache.hits, cache.misses)
+            first_scores = benchmark.RESULTS_FINAL["wer_avg"].tolist()
+            cache.close()
+
+            # Next night: same history, one corrected transcript and five new rows
+            rows[3]["transcript"] = "reference number 3"
+            rows.extend({"id": f"new_{i}", "ground_truth": f"new reference {i}", "transcript": "new"} for i in range(5))
+            cache = WerCache(db_path)
+            benchmark.RESULTS_FINAL = pd.DataFrame(rows)
+            benchmark.calculate_all_wer_scores(cache)
+            second = (cache.hits, cache.misses)
+            second_scores = benchmark.RESULTS_FINAL["wer_avg"].tolist()
+
+            exact = cache.score("hello world", "hello earth")
+            bumped = cache.score_many(["a b"], ["a c"], version="next")
+            cache.close()
+
+        checks = [
+            (first == (0, 150), f"first run computes every row ({first[1]} scores)"),
+            (second == (147, 6 * 3), f"re-run computes only changed rows ({second[1]} scores, {second[0]} reused)"),
+            (second_scores[:3] == first_scores[:3] and second_scores[3] != first_scores[3],
+             "cached scores match, changed row re-scored"),
+            (exact == word_error_rate("hello world", "hello earth") and bumped == [0.5],
+             "scores keyed by normalizer version"),
+        ]
+
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing incremental scoring: {e}")
+        raise
+
+
+def test_word_analytics():
+    """Test word-level calibration, timing and low-confidence span analytics."""
+    print("\nTesting word analytics...")
+
+    try:
+        import tempfile
+        import numpy as np
+        from greenfield import word_analytics
+        from greenfield.word_analytics import (
+            WordColumns, align_correctness, calibration_curve, calibration_drift,
+            low_confidence_spans, summarize, timing_stats,
+        )
+
+        def words(text, confidences, rate=0.5, gap=0.1):
+            return [{"word": w, "start": i * (rate + gap), "end": i * (rate + gap) + rate, "confidence": c}
+                    for i, (w, c) in enumerate(zip(text.split(), confidences))]
+
+        records = [
+            {"id": "a", "model": "nova-2", "timestamp": 0,
+             "transcript": {"words": words("Hello, world how are you", [0.95, 0.9, 0.3, 0.2, 0.9])}},
+            {"id": "b", "model": "nova-3", "timestamp": 90000,
+             "transcript": {"words": words("large-scale data", [0.4, 0.5])}},
+            {"id": "c", "model": "nova-3", "timestamp": "1970-01-02T01:00:00Z", "words": []},
+        ]
+        columns = WordColumns.from_records(records)
+        correct = align_correctness(columns, {"a": "hello world who are you", "b": "large scale date"})
+        curve = calibration_curve(columns.confidence, correct, bins=5)
+        timing = timing_stats(columns)
+        spans = low_confidence_spans(columns, threshold=0.6)
+        drift = calibration_drift(columns, correct)
+        summary = summarize(columns, correct)
+
+        # References whose ids match no result: nothing to calibrate, and the CLI must not crash
+        unmatched = calibration_drift(columns, align_correctness(columns, {"other": "hello world"}))
+        with tempfile.TemporaryDirectory() as tmp:
+            results_path, references_path = os.path.join(tmp, "results.json"), os.path.join(tmp, "refs.json")
+            with open(results_path, "w") as f:
+                json.dump(records, f)
+            with open(references_path, "w") as f:
+                json.dump([{"id": "other", "audio_url": "https://example.com/o.wav", "transcript": "hi"}], f)
+            word_analytics.main([results_path, "--references", references_path])
+
+        dataset = Path(__file__).parent.parent / "elm" / "data" / "large_dataset.json"
+        large = WordColumns.load(dataset) if dataset.exists() else columns
+
+        checks = [
+            (len(columns) == 7 and columns.utterances == 3, "words flattened into columns"),
+            (columns.timestamps[2] == 90000, "ISO timestamps with a Z suffix parsed as UTC"),
+            (correct.tolist() == [1, 1, 0, 1, 1, 1, 0], "alignment marks substituted words incorrect"),
+            (curve["count"].sum() == 7 and 0 <= curve["ece"] <= 1, f"calibration curve (ECE {curve['ece']:.3f})"),
+            (abs(timing["gap_percentiles"]["p50"] - 0.1) < 1e-9, "inter-word gaps within utterances"),
+            (abs(timing["words_per_second"][0] - 5 / 2.9) < 1e-9, "words per second per utterance"),
+            (spans["first_word"].tolist() == [2, 5] and spans["last_word"].tolist() == [3, 6],
+             "low-confidence spans stop at utterance boundaries"),
+            ([row["model"] for row in drift] == ["nova-2", "nova-3"], "calibration per model and window"),
+            (unmatched == [], "no drift rows when no reference matches"),
+            (summary["nova-3"]["accuracy"] == 0.5, "per-model summary"),
+            (len(large) > 0 and not np.isnan(large.confidence).any(), f"{len(large)} words loaded from dataset"),
+        ]
+
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing word analytics: {e}")
+        raise
+
+
+def test_synthetic_audio():
+    """Test that the synthetic corpus is deterministic and matches its manifest."""
+    print("\nTesting synthetic audio generator...")
+
+    try:
+        import tempfile
+        import wave
+        from greenfield.synthetic_audio import KINDS, generate_corpus
+
+        with tempfile.TemporaryDirectory() as tmp:
+            first = generate_corpus(Path(tmp) / "a", 60, seed=7, workers=1)
+            second = generate_corpus(Path(tmp) / "b", 60, seed=7, workers=4)
+
+            identical = all(
+                (Path(tmp) / "a" / a["audio_path"]).read_bytes() == (Path(tmp) / "b" / b["audio_path"]).read_bytes()
+                for a, b in zip(first, second)
+            )
+            durations_match = True
+            for entry in first:
+                with wave.open(str(Path(tmp) / "a" / entry["audio_path"])) as wav:
+                    seconds = wav.getnframes() / wav.getframerate()
+                    durations_match &= abs(seconds - entry["duration_seconds"]) < 1e-3
+                    durations_match &= wav.getframerate() == entry["synthetic"]["sample_rate"]
+
+        checks = [
+            (identical, "same seed gives identical files regardless of worker count"),
+            (durations_match, "WAV durations and sample rates match the manifest"),
+            ({e["synthetic"]["kind"] for e in first} == set(KINDS), "all signal kinds generated"),
+        ]
+
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing synthetic audio: {e}")
+        raise
+
+
+def test_plot_aggregates():
+    """Test that plot aggregates stay bounded and exact for large inputs."""
+    print("\nTesting plot aggregates...")
+
+    try:
+        import numpy as np
+        from brownfield.plotting import PlotAggregates
+
+        values = np.random.default_rng(0).random(1_000_000)
+        aggregates = PlotAggregates(max_points=500)
+        for chunk in np.array_split(values, 10):
+            aggregates.add("nova-2", chunk)
+
+        x, lo, hi, _ = aggregates.series["nova-2"].buckets()
+
+        # One large chunk is reduced in place, without full-length temporaries
+        import tracemalloc
+        from brownfield.plotting import SeriesDecimator
+
+        decimator = SeriesDecimator(max_points=500)
+        tracemalloc.start()
+        decimator.add(values)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        one_x, one_lo, one_hi, one_mean = decimator.buckets()
+
+        # Failed requests have NaN WER; they must not turn the histogram range into NaN
+        import tempfile
+        import pandas as pd
+        import brownfield.plotting as plotting
+        import brownfield.benchmark_nightmare as benchmark
+
+        rendered = []
+        render = plotting.render_in_background
+        plotting.render_in_background = lambda aggregates, *paths: rendered.append(aggregates) or render(aggregates, *paths)
+        benchmark.RESULTS_NOVA2 = pd.DataFrame({"wer": [0.2, np.nan, 0.5]})
+        benchmark.RESULTS_NOVA3 = pd.DataFrame({"wer": [np.nan, np.nan]})
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                paths = benchmark.visualize_results_badly(os.path.join(tmp, "wer.png"),
+                                                          os.path.join(tmp, "wer.html")).result()
+                written = all(os.path.exists(path) for path in paths)
+        finally:
+            plotting.render_in_background = render
+            benchmark.RESULTS_NOVA2 = benchmark.RESULTS_NOVA3 = None
+        edges = rendered[0].edges
+
+        checks = [
+            (aggregates.counts["nova-2"].sum() == len(values), "histogram counts every value"),
+            (len(x) <= 500, f"series decimated to {len(x)} points"),
+            (lo.min() == values.min() and hi.max() == values.max(), "min/max envelope preserved"),
+            (abs(aggregates.mean("nova-2") - values.mean()) < 1e-9, "running mean exact"),
+            (len(one_x) <= 500 and one_lo.min() == values.min() and one_hi.max() == values.max()
+             and abs(np.average(one_mean, weights=np.diff(np.append(one_x, len(values)))) - values.mean()) < 1e-9
+             and peak < values.nbytes / 10, f"single chunk decimated with {peak / 1e6:.1f} MB peak"),
+            (written and edges[-1] == 0.5 and rendered[0].counts["Nova-2"].sum() == 2,
+             "NaN WER ignored when sizing the histogram"),
+        ]
+
+        return report_checks(checks)
+
+    except Exception as e:
+        print(f"❌ Error testing plot aggregates: {e}")
+        raise
+
+
+async def run_test(test):
+    """Run one test for the summary; a failed assertion or error counts as a failure."""
+    try:
+        result = test()
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+    except Exception:
+        return False
+
+
 async def main():
     """Run all tests."""
     print("=" * 60)
@@ -249,15 +1304,33 @@ async def main():
     results = []
 
     # Run tests
-    results.append(("Environment", test_environment()))
-    results.append(("Imports", test_imports()))
-    results.append(("Ground Truth Data", test_ground_truth_data()))
-    results.append(("WER Calculation", test_wer_calculation()))
+    results.append(("Environment", await run_test(test_environment)))
+    results.append(("Imports", await run_test(test_imports)))
+    results.append(("Ground Truth Data", await run_test(test_ground_truth_data)))
+    results.append(("WER Calculation", await run_test(test_wer_calculation)))
+    results.append(("Startup Time", await run_test(test_startup_time)))
 
     # Async tests
-    results.append(("Deepgram API", await test_deepgram_connection()))
-    results.append(("Monitor Class", await test_monitor_class()))
-    results.append(("Brownfield Code", test_brownfield_code()))
+    results.append(("Deepgram API", await run_test(test_deepgram_connection)))
+    results.append(("Monitor Class", await run_test(test_monitor_class)))
+    results.append(("Cost Accounting", await run_test(test_cost_accounting)))
+    results.append(("Streaming Monitor", await run_test(test_streaming_monitor)))
+    results.append(("Multi-Endpoint Monitoring", await run_test(test_multi_endpoint_monitoring)))
+    results.append(("A/B Testing", await run_test(test_ab_testing)))
+    results.append(("Streaming Pipeline", await run_test(test_streaming_pipeline)))
+    results.append(("Traffic Replay", await run_test(test_traffic_replay)))
+    results.append(("Regression Gate", await run_test(test_regression_gate)))
+    results.append(("Live Results", await run_test(test_live_results)))
+    results.append(("Request Phases", await run_test(test_request_phases)))
+    results.append(("Result Buffer", await run_test(test_result_buffer)))
+    results.append(("Autoscaling Advisor", await run_test(test_autoscaling_advisor)))
+    results.append(("Brownfield Code", await run_test(test_brownfield_code)))
+    results.append(("Benchmark CLI", await run_test(test_benchmark_cli)))
+    results.append(("Ground Truth Catalog", await run_test(test_ground_truth_catalog)))
+    results.append(("Incremental Scoring", await run_test(test_incremental_scoring)))
+    results.append(("Word Analytics", await run_test(test_word_analytics)))
+    results.append(("Plot Aggregates", await run_test(test_plot_aggregates)))
+    results.append(("Synthetic Audio", await run_test(test_synthetic_audio)))
 
     # Summary
     print("\n" + "=" * 60)